@@ -1,26 +1,174 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, g, stream_with_context
 import swisseph as swe
+import numpy as np
 import os
+import bisect
+import functools
+import json
+import math
+import mmap
+import resource
+import struct
+import threading
+import time
 from datetime import datetime
+from types import MappingProxyType
 import sys
 
 app = Flask(__name__)
-swe.set_ephe_path('.')
 
-sys.stdout.flush()
+EPHE_PATH = os.environ.get('EPHE_PATH', '.')
+PRELOAD_EPHEMERIS = os.environ.get('PRELOAD_EPHEMERIS', '1') == '1'
+
+swe.set_ephe_path(EPHE_PATH)
+
+
+def find_ephemeris_files(path=EPHE_PATH):
+    return sorted(f for f in os.listdir(path) if f.endswith('.se1'))
+
+
+EPHEMERIS_FILES = find_ephemeris_files()
 
 print("=" * 50)
 print("EPHEMERIS CHECK AT STARTUP")
 print("=" * 50)
-print("Current directory:", os.getcwd())
-print("Files in current dir:", os.listdir('.'))
-ephe_files = [f for f in os.listdir('.') if f.endswith('.se1')]
-print("Ephemeris files found:", ephe_files)
-if not ephe_files:
+print("Ephemeris path:", os.path.abspath(EPHE_PATH))
+print("Ephemeris files found:", EPHEMERIS_FILES)
+if not EPHEMERIS_FILES:
     print("WARNING: No .se1 files found - will fall back to Moshier!")
 else:
     print("SUCCESS: Using Swiss Ephemeris with JPL data")
 print("=" * 50)
+sys.stdout.flush()
+
+
+# ============================================
+# EPHEMERIS PREFETCH (page cache)
+# swisseph reads the .se1 files through its own C file handles, which
+# cannot be shared with forked workers. What can be shared is the OS page
+# cache: the master reads every file once so each worker's first fopen
+# and fread hit memory instead of disk. Each worker then opens its own
+# handles in init_worker.
+# ============================================
+EPHEMERIS_PREFETCHED = {}
+
+WORKER_STATE = {
+    'pid': None,
+    'booted_at': None,
+    'requests': 0,
+    'first_request_ms': None,
+}
+
+# Probe endpoints must not count as a worker's first real request
+UNTRACKED_ENDPOINTS = {'worker_stats', 'healthz', 'readyz'}
+
+READINESS = {
+    'ephemeris_loaded': False,
+    'ephemeris_backend': None,
+    'warmup_ok': False,
+    'warmup_error': None,
+    'warmup_ms': None,
+    'warmup_steps': {},
+}
+
+PROC_MEMORY_FIELDS = {
+    'status': {
+        'VmRSS': 'rss_kb',
+        'RssAnon': 'rss_anon_kb',
+        'RssFile': 'rss_file_kb',
+        'RssShmem': 'rss_shmem_kb',
+    },
+    'smaps_rollup': {
+        'Pss': 'pss_kb',
+        'Shared_Clean': 'shared_clean_kb',
+        'Private_Dirty': 'private_dirty_kb',
+    },
+}
+
+
+def prefetch_ephemeris(path=EPHE_PATH, chunk_size=1 << 20):
+    # Equivalent to `cat *.se1 > /dev/null`; returns {file: bytes read}
+    for fname in EPHEMERIS_FILES:
+        if fname in EPHEMERIS_PREFETCHED:
+            continue
+        size = 0
+        with open(os.path.join(path, fname), 'rb') as f:
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+            for chunk in iter(functools.partial(f.read, chunk_size), b''):
+                size += len(chunk)
+        EPHEMERIS_PREFETCHED[fname] = size
+    return EPHEMERIS_PREFETCHED
+
+
+def probe_ephemeris():
+    # The worker can compute positions, from .se1 files or from Moshier;
+    # returns the backend that answered, or None
+    try:
+        result = swe.calc_ut(2451545.0, swe.SUN, swe.FLG_SWIEPH | swe.FLG_SPEED)
+    except Exception as e:
+        print(f"EPHEMERIS PROBE ERROR: {e}")
+        return None
+    return 'moshier' if result[1] & swe.FLG_MOSEPH else 'swiss'
+
+
+def init_worker():
+    if WORKER_STATE['pid'] == os.getpid():
+        return
+    # A forked worker must not share the master's open ephemeris FILE handles
+    # (the file offsets are shared between processes), so it reopens its own;
+    # the prefetched pages are still in the page cache.
+    swe.close()
+    swe.set_ephe_path(EPHE_PATH)
+    SIDEREAL_STATE['mode'] = None
+    WORKER_STATE.update({
+        'pid': os.getpid(),
+        'booted_at': time.time(),
+        'requests': 0,
+        'first_request_ms': None,
+    })
+    READINESS['ephemeris_backend'] = probe_ephemeris()
+    READINESS['ephemeris_loaded'] = READINESS['ephemeris_backend'] is not None
+    start_warmup()
+
+
+def read_process_memory(pid='self'):
+    memory = {}
+    for proc_file, fields in PROC_MEMORY_FIELDS.items():
+        try:
+            with open(f'/proc/{pid}/{proc_file}') as f:
+                for line in f:
+                    key, _, value = line.partition(':')
+                    if key in fields:
+                        memory[fields[key]] = int(value.split()[0])
+        except OSError:
+            continue
+    if not memory and pid == 'self':
+        memory['max_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return memory
+
+
+if PRELOAD_EPHEMERIS:
+    prefetch_ephemeris()
+    print(f"PRELOAD: prefetched {len(EPHEMERIS_PREFETCHED)} ephemeris file(s) into the page cache")
+
+
+@app.before_request
+def track_request_start():
+    init_worker()
+    if request.endpoint not in UNTRACKED_ENDPOINTS:
+        g.request_started = time.perf_counter()
+
+
+@app.after_request
+def track_request_end(response):
+    started = g.get('request_started')
+    if started is not None:
+        WORKER_STATE['requests'] += 1
+        if WORKER_STATE['first_request_ms'] is None:
+            WORKER_STATE['first_request_ms'] = round((time.perf_counter() - started) * 1000, 3)
+    return response
+
 
 PLANETS = {
     'Sun': swe.SUN,
@@ -181,6 +329,37 @@ ARABIC_PARTS = {
     'Part of Hidden Enemies': {'formula': 'ASC + 12th cusp - ruler of 12th'}
 }
 
+DECAN_RULERS = [
+    ['Mars', 'Sun', 'Venus'],
+    ['Mercury', 'Moon', 'Saturn'],
+    ['Jupiter', 'Mars', 'Sun'],
+    ['Venus', 'Mercury', 'Moon'],
+    ['Saturn', 'Jupiter', 'Mars'],
+    ['Sun', 'Venus', 'Mercury'],
+    ['Moon', 'Saturn', 'Jupiter'],
+    ['Mars', 'Sun', 'Venus'],
+    ['Mercury', 'Moon', 'Saturn'],
+    ['Jupiter', 'Mars', 'Sun'],
+    ['Venus', 'Mercury', 'Moon'],
+    ['Saturn', 'Jupiter', 'Mars']
+]
+
+# Egyptian terms (bounds) per sign: (start, end, ruler)
+TERMS = [
+    [(0, 6, 'Jupiter'), (6, 12, 'Venus'), (12, 20, 'Mercury'), (20, 25, 'Mars'), (25, 30, 'Saturn')],
+    [(0, 8, 'Venus'), (8, 14, 'Mercury'), (14, 22, 'Jupiter'), (22, 27, 'Saturn'), (27, 30, 'Mars')],
+    [(0, 6, 'Mercury'), (6, 12, 'Jupiter'), (12, 17, 'Venus'), (17, 24, 'Mars'), (24, 30, 'Saturn')],
+    [(0, 7, 'Mars'), (7, 13, 'Venus'), (13, 19, 'Mercury'), (19, 26, 'Jupiter'), (26, 30, 'Saturn')],
+    [(0, 6, 'Jupiter'), (6, 11, 'Venus'), (11, 18, 'Saturn'), (18, 24, 'Mercury'), (24, 30, 'Mars')],
+    [(0, 7, 'Mercury'), (7, 17, 'Venus'), (17, 21, 'Jupiter'), (21, 28, 'Mars'), (28, 30, 'Saturn')],
+    [(0, 6, 'Saturn'), (6, 14, 'Mercury'), (14, 21, 'Jupiter'), (21, 28, 'Venus'), (28, 30, 'Mars')],
+    [(0, 7, 'Mars'), (7, 11, 'Venus'), (11, 19, 'Mercury'), (19, 24, 'Jupiter'), (24, 30, 'Saturn')],
+    [(0, 12, 'Jupiter'), (12, 17, 'Venus'), (17, 21, 'Mercury'), (21, 26, 'Saturn'), (26, 30, 'Mars')],
+    [(0, 7, 'Mercury'), (7, 14, 'Jupiter'), (14, 22, 'Venus'), (22, 26, 'Saturn'), (26, 30, 'Mars')],
+    [(0, 7, 'Mercury'), (7, 13, 'Venus'), (13, 20, 'Jupiter'), (20, 25, 'Mars'), (25, 30, 'Saturn')],
+    [(0, 12, 'Venus'), (12, 16, 'Jupiter'), (16, 19, 'Mercury'), (19, 28, 'Mars'), (28, 30, 'Saturn')]
+]
+
 # ============================================
 # AYANAMSA MODES (for Vedic/Sidereal)
 # ============================================
@@ -195,6 +374,470 @@ AYANAMSA_MODES = {
     'true_revati': swe.SIDM_TRUE_REVATI,
 }
 
+# Ayanamsas returned with every chart for reference
+REFERENCE_AYANAMSAS = ['lahiri', 'raman', 'krishnamurti', 'fagan_bradley']
+
+
+# ============================================
+# POSITION CACHE
+# Body positions depend only on the instant, so charts for the same moment
+# at different places share them and only pay for houses_ex. Keys are the
+# exact Julian Day, so cached results are identical to uncached ones. The
+# approximate paths (/now, bulk transits) quantize their instant with
+# round_jd to POSITION_CACHE_RESOLUTION_SECONDS (0 = off) before computing
+# and report the quantized Julian Day.
+# ============================================
+DEFAULT_CALC_FLAGS = swe.FLG_SWIEPH | swe.FLG_SPEED
+POSITION_CACHE_RESOLUTION_SECONDS = float(os.environ.get('POSITION_CACHE_RESOLUTION_SECONDS', 1))
+POSITION_CACHE_SIZE = int(os.environ.get('POSITION_CACHE_SIZE', 65536))
+
+
+def round_jd(jd):
+    if POSITION_CACHE_RESOLUTION_SECONDS <= 0:
+        return jd
+    step = POSITION_CACHE_RESOLUTION_SECONDS / 86400.0
+    return round(jd / step) * step
+
+
+# ============================================
+# SIDEREAL MODE
+# swe.set_sid_mode is process-global, so the worker remembers the mode it
+# last set and only calls into swisseph when a request needs a different
+# one. The lock keeps "set mode + compute" atomic for threaded servers.
+# ============================================
+SIDEREAL_FLAGS = DEFAULT_CALC_FLAGS | swe.FLG_SIDEREAL
+SIDEREAL_STATE = {'mode': None}
+SIDEREAL_LOCK = threading.RLock()
+
+
+def set_sidereal_mode(sid_mode):
+    if SIDEREAL_STATE['mode'] != sid_mode:
+        swe.set_sid_mode(sid_mode)
+        SIDEREAL_STATE['mode'] = sid_mode
+
+
+@functools.lru_cache(maxsize=POSITION_CACHE_SIZE)
+def _cached_calc_ut(jd, body, flags, sid_mode):
+    if flags & swe.FLG_SIDEREAL:
+        with SIDEREAL_LOCK:
+            set_sidereal_mode(sid_mode)
+            return swe.calc_ut(jd, body, flags)
+    return swe.calc_ut(jd, body, flags)
+
+
+@functools.lru_cache(maxsize=POSITION_CACHE_SIZE // 16 or 1)
+def _cached_ayanamsa(jd, sid_mode):
+    with SIDEREAL_LOCK:
+        set_sidereal_mode(sid_mode)
+        return swe.get_ayanamsa_ut(jd)
+
+
+def calc_position(jd, body, flags=DEFAULT_CALC_FLAGS, sid_mode=None):
+    if not flags & swe.FLG_SIDEREAL:
+        sid_mode = None
+    return _cached_calc_ut(jd, body, flags, sid_mode)
+
+
+def calc_position_exact(jd, body, flags=DEFAULT_CALC_FLAGS, sid_mode=None):
+    # Bypasses the cache for root finding, whose many one-off instants
+    # would only evict reusable entries
+    return _cached_calc_ut.__wrapped__(jd, body, flags, sid_mode)
+
+
+def get_ayanamsa(jd, mode='lahiri'):
+    return _cached_ayanamsa(jd, AYANAMSA_MODES[mode])
+
+
+def get_reference_ayanamsas(jd):
+    return {mode: get_ayanamsa(jd, mode) for mode in REFERENCE_AYANAMSAS}
+
+
+def calculate_sidereal_houses(jd, latitude, longitude, house_system, sid_mode):
+    with SIDEREAL_LOCK:
+        set_sidereal_mode(sid_mode)
+        return swe.houses_ex(jd, latitude, longitude, house_system.encode(), swe.FLG_SIDEREAL)
+
+
+def position_cache_info():
+    info = _cached_calc_ut.cache_info()
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'size': info.currsize,
+        'maxsize': info.maxsize,
+        'resolution_seconds': POSITION_CACHE_RESOLUTION_SECONDS
+    }
+
+
+# ============================================
+# EQUATORIAL COORDINATES
+# Right ascension and declination are derived from the ecliptic position
+# and the true obliquity of the date (one ECL_NUT call per instant,
+# cached like positions) instead of a second calc_ut call per body with
+# FLG_EQUATORIAL. A body is out of bounds when its declination exceeds
+# the obliquity, i.e. it lies beyond the Sun's extreme declination.
+# ============================================
+@functools.lru_cache(maxsize=POSITION_CACHE_SIZE // 16 or 1)
+def _cached_nutation(jd):
+    # (true obliquity, mean obliquity, nutation in longitude, in obliquity)
+    return swe.calc_ut(jd, swe.ECL_NUT, 0)[0][:4]
+
+
+def true_obliquity(jd):
+    return _cached_nutation(jd)[0]
+
+
+def ecliptic_to_equatorial(longitudes, latitudes, obliquity):
+    # Vectorized; returns right ascension and declination in degrees
+    lon = np.radians(longitudes)
+    lat = np.radians(latitudes)
+    eps = math.radians(obliquity)
+    sin_dec = np.sin(lat) * math.cos(eps) + np.cos(lat) * math.sin(eps) * np.sin(lon)
+    ra = np.arctan2(np.sin(lon) * math.cos(eps) - np.tan(lat) * math.sin(eps), np.cos(lon))
+    return np.degrees(ra) % 360.0, np.degrees(np.arcsin(np.clip(sin_dec, -1.0, 1.0)))
+
+
+def assign_equatorial_coordinates(bodies, jd, ayanamsa=None):
+    # Fills right_ascension/declination/out_of_bounds on every body in one
+    # vectorized pass. Sidereal longitudes (measured from the mean equinox)
+    # are shifted back to the true equinox by the ayanamsa plus nutation.
+    # Returns the obliquity used.
+    obliquity, _, nutation_longitude, _ = _cached_nutation(jd)
+    if not bodies:
+        return obliquity
+    offset = 0.0 if ayanamsa is None else ayanamsa + nutation_longitude
+    ra, dec = ecliptic_to_equatorial([body.full_degree + offset for body in bodies],
+                                     [body.latitude for body in bodies], obliquity)
+    for body, body_ra, body_dec in zip(bodies, ra.tolist(), dec.tolist()):
+        body.right_ascension = body_ra
+        body.declination = body_dec
+        body.out_of_bounds = abs(body_dec) > obliquity
+    return obliquity
+
+
+# ============================================
+# CHEBYSHEV FAST EPHEMERIS
+# Piecewise Chebyshev fits of longitude, latitude and distance per body,
+# built lazily per segment from CHEBYSHEV_DEGREE + 1 exact positions at
+# the Chebyshev nodes and evaluated for many Julian Days at once. Speed
+# is the derivative of the longitude fit. Measured against swe.calc_ut
+# over 2000-2010 (chebyshev_max_error) the longitude error stays below
+# CHEBYSHEV_MAX_ERROR (0.0015 degrees, 5.4") for every body in PLANETS:
+# under 1e-7 degrees for the Sun and Moon, up to 1.2e-3 for Neptune under
+# the Moshier fallback and 2e-4 for the osculating (True) Lilith;
+# bench_tiers.py fails when a sample exceeds it. Fitted segments are kept
+# in an LRU cache of CHEBYSHEV_SEGMENT_CACHE_SIZE entries shared by all
+# bodies. Requests pass exact=true to bypass it.
+# ============================================
+FAST_EPHEMERIS = os.environ.get('FAST_EPHEMERIS', '1') == '1'
+CHEBYSHEV_MAX_ERROR = 0.0015
+CHEBYSHEV_SEGMENT_CACHE_SIZE = int(os.environ.get('CHEBYSHEV_SEGMENT_CACHE_SIZE', 16384))
+CHEBYSHEV_DEGREE = 12
+CHEBYSHEV_FAST_SEGMENT_DAYS = 8
+CHEBYSHEV_SLOW_SEGMENT_DAYS = 32
+CHEBYSHEV_FAST_BODIES = {swe.SUN, swe.MOON, swe.MERCURY, swe.VENUS, swe.MARS,
+                         swe.TRUE_NODE, swe.OSCU_APOG}
+CHEBYSHEV_EPOCH_JD = 2451545.0
+
+
+@functools.lru_cache(maxsize=CHEBYSHEV_SEGMENT_CACHE_SIZE)
+def _cached_chebyshev_segment(body, segment_days, degree, k):
+    # Segment k covers [epoch + k * segment_days, epoch + (k + 1) * segment_days)
+    # and holds coefficient rows for longitude, latitude, distance and the
+    # longitude derivative (deg per unit of x)
+    nodes = np.cos(np.pi * (np.arange(degree + 1) + 0.5) / (degree + 1))
+    start = CHEBYSHEV_EPOCH_JD + k * segment_days
+    jds = start + (nodes + 1) / 2 * segment_days
+    values = np.array([calc_position_exact(jd, body)[0][:3] for jd in jds])
+    values[:, 0] = np.degrees(np.unwrap(np.radians(values[:, 0])))
+    coeffs = np.polynomial.chebyshev.chebfit(nodes, values, degree).T
+    derivative = np.polynomial.chebyshev.chebder(coeffs[0])
+    return np.vstack([coeffs, np.append(derivative, 0.0)])
+
+
+class ChebyshevEphemeris:
+    __slots__ = ('body', 'segment_days', 'degree')
+
+    def __init__(self, body, segment_days, degree=CHEBYSHEV_DEGREE):
+        self.body = body
+        self.segment_days = segment_days
+        self.degree = degree
+
+    def segment(self, k):
+        return _cached_chebyshev_segment(self.body, self.segment_days, self.degree, k)
+
+    def evaluate(self, jds):
+        # Returns an (n, 4) array of longitude, latitude, distance, speed
+        jds = np.asarray(jds, dtype=float)
+        offsets = (jds - CHEBYSHEV_EPOCH_JD) / self.segment_days
+        ks = np.floor(offsets)
+        unique_ks, inverse = np.unique(ks, return_inverse=True)
+        coeffs = np.stack([self.segment(int(k)) for k in unique_ks])[inverse]
+        x = (2 * (offsets - ks) - 1)[:, None]
+
+        # Clenshaw recurrence over all points and all four series at once
+        b1 = np.zeros(coeffs.shape[:2])
+        b2 = np.zeros(coeffs.shape[:2])
+        for j in range(self.degree, 0, -1):
+            b1, b2 = 2 * x * b1 - b2 + coeffs[:, :, j], b1
+        values = x * b1 - b2 + coeffs[:, :, 0]
+
+        values[:, 0] %= 360.0
+        values[:, 3] *= 2.0 / self.segment_days
+        return values
+
+    def evaluate_one(self, jd):
+        # Scalar path: numpy's per-call overhead dominates a single point
+        offset = (jd - CHEBYSHEV_EPOCH_JD) / self.segment_days
+        k = math.floor(offset)
+        x = 2 * (offset - k) - 1
+        values = []
+        for row in self.segment(k).tolist():
+            b1 = b2 = 0.0
+            for j in range(self.degree, 0, -1):
+                b1, b2 = 2 * x * b1 - b2 + row[j], b1
+            values.append(x * b1 - b2 + row[0])
+        return values[0] % 360.0, values[1], values[2], values[3] * 2.0 / self.segment_days
+
+
+CHEBYSHEV_EPHEMERIDES = {}
+
+
+def get_chebyshev_ephemeris(body):
+    ephemeris = CHEBYSHEV_EPHEMERIDES.get(body)
+    if ephemeris is None:
+        segment_days = CHEBYSHEV_FAST_SEGMENT_DAYS if body in CHEBYSHEV_FAST_BODIES else CHEBYSHEV_SLOW_SEGMENT_DAYS
+        ephemeris = CHEBYSHEV_EPHEMERIDES.setdefault(body, ChebyshevEphemeris(body, segment_days))
+    return ephemeris
+
+
+def fast_positions(jds, body):
+    return get_chebyshev_ephemeris(body).evaluate(jds)
+
+
+def fast_position(jd, body):
+    return get_chebyshev_ephemeris(body).evaluate_one(jd)
+
+
+def chebyshev_max_error(body, start_jd, end_jd, samples=2000):
+    jds = np.linspace(start_jd, end_jd, samples)
+    fitted = fast_positions(jds, body)
+    exact = np.array([calc_position_exact(jd, body)[0][:4] for jd in jds])
+    errors = np.abs(fitted - exact)
+    errors[:, 0] = np.abs((fitted[:, 0] - exact[:, 0] + 180.0) % 360.0 - 180.0)
+    return {'longitude': errors[:, 0].max(), 'latitude': errors[:, 1].max(),
+            'distance': errors[:, 2].max(), 'speed': errors[:, 3].max()}
+
+
+# ============================================
+# DAILY EPHEMERIS STORE
+# build_ephemeris_store.py writes one position per body per day (0h UT)
+# for DAILY_STORE_FROM_YEAR..DAILY_STORE_TO_YEAR into DAILY_STORE_PATH:
+# a small header, the body ids, then float32 columns laid out as
+# [body][longitude, latitude, distance, speed][day]. Workers mmap it and
+# answer a lookup with index arithmetic: cubic Hermite interpolation of
+# longitude from the two bracketing days (using their speeds) and 4-point
+# Lagrange interpolation of the rest. Errors stay well inside an
+# arcminute (about 2e-4 degrees in longitude for the Moon); requests
+# needing full precision fall back to live calc_ut.
+# ============================================
+DAILY_STORE_PATH = os.environ.get(
+    'DAILY_STORE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ephemeris_daily.bin')
+)
+DAILY_STORE_FROM_YEAR = int(os.environ.get('DAILY_STORE_FROM_YEAR', 1800))
+DAILY_STORE_TO_YEAR = int(os.environ.get('DAILY_STORE_TO_YEAR', 2200))
+DAILY_STORE_MAGIC = b'SWEDAILY'
+DAILY_STORE_VERSION = 1
+# magic, version, body count, day count, field count, first Julian Day
+DAILY_STORE_HEADER = struct.Struct('<8sIIIId')
+DAILY_STORE_FIELDS = 4
+DAILY_STORE_DATA_ALIGN = 64
+
+
+def build_daily_store(path=DAILY_STORE_PATH, from_year=DAILY_STORE_FROM_YEAR, to_year=DAILY_STORE_TO_YEAR,
+                      bodies=None):
+    body_ids = sorted(set(PLANETS.values()) if bodies is None else set(bodies))
+    # One extra day before and two after the span for the interpolation stencil
+    start_jd = swe.julday(from_year, 1, 1, 0.0) - 1
+    n_days = int(swe.julday(to_year + 1, 1, 1, 0.0) - start_jd) + 2
+
+    data = np.full((len(body_ids), DAILY_STORE_FIELDS, n_days), np.nan, dtype=np.float32)
+    for b, body in enumerate(body_ids):
+        for day in range(n_days):
+            try:
+                data[b, :, day] = swe.calc_ut(start_jd + day, body, DEFAULT_CALC_FLAGS)[0][:4]
+            except swe.Error:
+                pass
+
+    header = DAILY_STORE_HEADER.pack(DAILY_STORE_MAGIC, DAILY_STORE_VERSION, len(body_ids), n_days,
+                                     DAILY_STORE_FIELDS, start_jd)
+    header += struct.pack(f'<{len(body_ids)}i', *body_ids)
+    header += b'\0' * (-len(header) % DAILY_STORE_DATA_ALIGN)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(data.tobytes())
+    os.replace(tmp_path, path)
+    return {'path': path, 'bodies': len(body_ids), 'days': n_days, 'bytes': len(header) + data.nbytes}
+
+
+def hermite_longitude(lon0, speed0, lon1, speed1, t, span=1.0):
+    # Cubic Hermite between two longitudes with known speeds (deg/day);
+    # t in [0, 1] across `span` days. Works on scalars and numpy arrays.
+    delta = (lon1 - lon0 + 180.0) % 360.0 - 180.0
+    t2 = t * t
+    t3 = t2 * t
+    return (lon0 + (3 * t2 - 2 * t3) * delta
+            + span * ((t3 - 2 * t2 + t) * speed0 + (t3 - t2) * speed1)) % 360.0
+
+
+class DailyEphemerisStore:
+    __slots__ = ('path', 'mapped', 'start_jd', 'n_days', 'rows', 'data')
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n_bodies, n_days, n_fields, start_jd = DAILY_STORE_HEADER.unpack_from(self.mapped, 0)
+        if magic != DAILY_STORE_MAGIC or version != DAILY_STORE_VERSION or n_fields != DAILY_STORE_FIELDS:
+            raise ValueError(f"{path} is not a version {DAILY_STORE_VERSION} daily ephemeris store")
+        body_ids = struct.unpack_from(f'<{n_bodies}i', self.mapped, DAILY_STORE_HEADER.size)
+        offset = DAILY_STORE_HEADER.size + 4 * n_bodies
+        offset += -offset % DAILY_STORE_DATA_ALIGN
+        self.start_jd = start_jd
+        self.n_days = n_days
+        self.rows = {body: row for row, body in enumerate(body_ids)}
+        self.data = np.frombuffer(self.mapped, dtype=np.float32, count=n_bodies * n_fields * n_days,
+                                  offset=offset).reshape(n_bodies, n_fields, n_days)
+
+    def covers(self, jd, body):
+        return body in self.rows and self.start_jd + 1 <= jd < self.start_jd + self.n_days - 2
+
+    def positions(self, jds, body):
+        # Returns an (n, 4) array of longitude, latitude, distance, speed;
+        # every jd must be covered
+        columns = self.data[self.rows[body]]
+        offsets = np.asarray(jds, dtype=float) - self.start_jd
+        days = np.floor(offsets).astype(np.intp)
+        t = offsets - days
+        previous, before, after, following = (columns[:, days + k].astype(float) for k in (-1, 0, 1, 2))
+        longitude = hermite_longitude(before[0], before[3], after[0], after[3], t)
+
+        values = (-t * (t - 1) * (t - 2) / 6 * previous
+                  + (t + 1) * (t - 1) * (t - 2) / 2 * before
+                  - (t + 1) * t * (t - 2) / 2 * after
+                  + (t + 1) * t * (t - 1) / 6 * following)
+        values[0] = longitude
+        return values.T
+
+    def position(self, jd, body):
+        # Scalar version of positions() for single lookups
+        offset = jd - self.start_jd
+        day = math.floor(offset)
+        t = offset - day
+        previous, before, after, following = zip(*self.data[self.rows[body], :, day - 1:day + 3].tolist())
+        longitude = hermite_longitude(before[0], before[3], after[0], after[3], t)
+
+        weights = (-t * (t - 1) * (t - 2) / 6, (t + 1) * (t - 1) * (t - 2) / 2,
+                   -(t + 1) * t * (t - 2) / 2, (t + 1) * t * (t - 1) / 6)
+        values = [sum(w * v for w, v in zip(weights, column))
+                  for column in zip(previous, before, after, following)]
+        return longitude, values[1], values[2], values[3]
+
+
+DAILY_STORE = {'store': None, 'checked': False}
+DAILY_STORE_LOCK = threading.Lock()
+
+
+def get_daily_store():
+    if not DAILY_STORE['checked']:
+        with DAILY_STORE_LOCK:
+            if not DAILY_STORE['checked']:
+                if DAILY_STORE_PATH and os.path.exists(DAILY_STORE_PATH):
+                    try:
+                        DAILY_STORE['store'] = DailyEphemerisStore(DAILY_STORE_PATH)
+                    except (OSError, ValueError) as e:
+                        print(f"DAILY STORE: could not open {DAILY_STORE_PATH}: {e}")
+                DAILY_STORE['checked'] = True
+    return DAILY_STORE['store']
+
+
+# ============================================
+# EPHEMERIS TIERS
+# The backend is chosen per deployment (EPHEMERIS_TIER) or per request
+# ('ephemeris'), and responses report the tier that actually served each
+# position: 'swiss' silently becomes 'moshier' for bodies whose files are
+# missing, and the interpolated tiers fall back to live calc_ut outside
+# their coverage or for sidereal positions. bench_tiers.py measures the
+# latency and error of each tier.
+# ============================================
+EPHEMERIS_TIERS = {
+    'swiss': 'Swiss Ephemeris files (FLG_SWIEPH); Moshier for bodies without files',
+    'moshier': 'Built-in Moshier analytical ephemeris (FLG_MOSEPH), no files needed',
+    'chebyshev': 'Chebyshev fits of the live ephemeris, < 0.0015 deg longitude error',
+    'daily': 'Interpolated daily ephemeris store, arcminute accuracy (1800-2200 by default)'
+}
+DEFAULT_EPHEMERIS_TIER = os.environ.get('EPHEMERIS_TIER', 'swiss')
+if DEFAULT_EPHEMERIS_TIER not in EPHEMERIS_TIERS:
+    DEFAULT_EPHEMERIS_TIER = 'swiss'
+EXACT_EPHEMERIS_TIER = DEFAULT_EPHEMERIS_TIER if DEFAULT_EPHEMERIS_TIER in ('swiss', 'moshier') else 'swiss'
+
+
+def resolve_ephemeris_tier(requested=None, exact=False, batch=False):
+    # Explicit tier first, then exact=true, then the fast path for batches
+    if requested in EPHEMERIS_TIERS:
+        return requested
+    if exact:
+        return EXACT_EPHEMERIS_TIER
+    if batch and FAST_EPHEMERIS:
+        return 'chebyshev'
+    return DEFAULT_EPHEMERIS_TIER
+
+
+def tier_flags(tier, flags):
+    if tier == 'moshier':
+        return (flags & ~swe.FLG_SWIEPH) | swe.FLG_MOSEPH
+    return flags
+
+
+def tier_position(jd, body, tier=None, flags=DEFAULT_CALC_FLAGS, sid_mode=None):
+    # Returns ((lon, lat, dist, speed), tier used)
+    tier = tier or DEFAULT_EPHEMERIS_TIER
+    if not flags & swe.FLG_SIDEREAL:
+        if tier == 'daily':
+            store = get_daily_store()
+            if store is not None and store.covers(jd, body):
+                position = store.position(jd, body)
+                if not math.isnan(position[0]):
+                    return position, 'daily'
+        elif tier == 'chebyshev':
+            return fast_position(jd, body), 'chebyshev'
+    try:
+        result = calc_position(jd, body, tier_flags(tier, flags), sid_mode)
+    except swe.Error:
+        if not flags & swe.FLG_SIDEREAL:
+            raise
+        return sidereal_from_tropical(jd, body, tier, flags, sid_mode)
+    return result[0][:4], 'moshier' if result[1] & swe.FLG_MOSEPH else 'swiss'
+
+
+def sidereal_from_tropical(jd, body, tier, flags, sid_mode):
+    # With the star-based ayanamsas (true_citra, true_revati) swisseph
+    # fails FLG_SIDEREAL for the true node and osculating apogee; derive
+    # the same value from the tropical position instead. Sidereal
+    # longitudes are counted from the mean equinox, hence the nutation.
+    result = calc_position(jd, body, tier_flags(tier, flags & ~swe.FLG_SIDEREAL))
+    longitude, latitude, distance, speed = result[0][:4]
+    nutation_longitude = _cached_nutation(jd)[2]
+    longitude = (longitude - nutation_longitude - _cached_ayanamsa(jd, sid_mode)) % 360.0
+    return (longitude, latitude, distance, speed), 'moshier' if result[1] & swe.FLG_MOSEPH else 'swiss'
+
+
+def tier_report(requested, used):
+    return {'requested': requested, 'used': sorted(used)}
+
 
 def normalize_degree(deg):
     deg = deg % 360.0
@@ -203,27 +846,117 @@ def normalize_degree(deg):
     return deg
 
 
+def parse_julian_day(date_str, time_str='00:00'):
+    year, month, day = map(int, date_str.split('-'))
+    hour, minute = map(int, time_str.split(':')[:2])
+    return swe.julday(year, month, day, hour + minute / 60.0)
+
+
+def jd_to_iso(jd):
+    year, month, day, hours = swe.revjul(jd)
+    seconds = int(round(hours * 3600))
+    if seconds >= 86400:
+        year, month, day, _ = swe.revjul(jd + 0.5 / 86400)
+        seconds = 0
+    return f"{year:04d}-{month:02d}-{day:02d}T{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}Z"
+
+
 def get_zodiac_sign(degree):
     index = int(normalize_degree(degree) / 30)
     return SIGNS[index]
 
 
 def get_sign_data(sign):
-    return {
-        'element': ELEMENTS.get(sign),
-        'modality': MODALITIES.get(sign),
-        'polarity': POLARITIES.get(sign)
-    }
+    sign_data = SIGN_DATA.get(sign)
+    if sign_data is None:
+        return {'element': None, 'modality': None, 'polarity': None}
+    return dict(sign_data)
 
 
-def is_light(planet_name):
-    return planet_name in ['Sun', 'Moon']
+# ============================================
+# BODY RECORD
+# Compact per-body record used inside the chart pipeline. The analysis
+# helpers read attributes directly; to_dict() produces the response shape
+# and is only called when the chart is serialized.
+# ============================================
+class Body:
+    __slots__ = ('name', 'full_degree', 'sign', 'sign_data', 'latitude', 'distance', 'speed',
+                 'is_retro', 'node_type', 'vedic_name', 'is_day_chart',
+                 'dignity', 'triplicity', 'decan', 'term', 'combustion', 'sect',
+                 'right_ascension', 'declination', 'out_of_bounds')
 
+    # Optional fields (slot, JSON key), omitted from the response while unset
+    OPTIONAL_FIELDS = (
+        ('vedic_name', 'vedicName'),
+        ('node_type', 'nodeType'),
+        ('is_day_chart', 'is_day_chart'),
+        ('dignity', 'dignity'),
+        ('triplicity', 'triplicity'),
+        ('decan', 'decan'),
+        ('term', 'term'),
+        ('combustion', 'combustion'),
+        ('sect', 'sect'),
+        ('right_ascension', 'rightAscension'),
+        ('declination', 'declination'),
+        ('out_of_bounds', 'outOfBounds'),
+    )
 
-def get_dignity(planet_name, sign):
-    if planet_name not in DIGNITIES:
-        return None
-    
+    def __init__(self, name, full_degree, latitude=0, distance=0, speed=0, is_retro=None,
+                 with_sign_data=True, node_type=None, vedic_name=None, is_day_chart=None):
+        self.name = name
+        self.full_degree = full_degree
+        self.sign = get_zodiac_sign(full_degree)
+        self.sign_data = SIGN_DATA.get(self.sign) if with_sign_data else None
+        self.latitude = latitude
+        self.distance = distance
+        self.speed = speed
+        self.is_retro = speed < 0 if is_retro is None else is_retro
+        self.node_type = node_type
+        self.vedic_name = vedic_name
+        self.is_day_chart = is_day_chart
+        self.dignity = None
+        self.triplicity = None
+        self.decan = None
+        self.term = None
+        self.combustion = None
+        self.sect = None
+        self.right_ascension = None
+        self.declination = None
+        self.out_of_bounds = None
+
+    def to_dict(self):
+        data = {
+            'name': self.name,
+            'fullDegree': self.full_degree,
+            'degreeInSign': self.full_degree % 30.0,
+            'sign': self.sign,
+            'latitude': self.latitude,
+            'distance': self.distance,
+            'speed': self.speed,
+            'isRetro': self.is_retro,
+            'true_longitude': self.full_degree
+        }
+        if self.sign_data is not None:
+            data['signData'] = dict(self.sign_data)
+        for slot, key in Body.OPTIONAL_FIELDS:
+            value = getattr(self, slot)
+            if value is not None:
+                # Classification entries are shared read-only table rows
+                data[key] = dict(value) if isinstance(value, MappingProxyType) else value
+        return data
+
+    def to_compact_dict(self):
+        return {
+            'name': self.name,
+            'fullDegree': self.full_degree,
+            'degreeInSign': self.full_degree % 30.0,
+            'sign': self.sign,
+            'speed': self.speed,
+            'isRetro': self.is_retro
+        }
+
+
+def _classify_dignity(planet_name, sign):
     dignities = DIGNITIES[planet_name]
     
     if sign in dignities.get('domicile', []):
@@ -238,8 +971,7 @@ def get_dignity(planet_name, sign):
         return {'type': 'peregrine', 'strength': 0, 'description': 'Planet has no essential dignity'}
 
 
-def get_triplicity(degree, is_day_chart):
-    sign = get_zodiac_sign(degree)
+def _build_triplicity(sign, is_day_chart):
     element = ELEMENTS.get(sign)
     
     if not element or element not in TRIPLICITY_RULERS:
@@ -257,53 +989,16 @@ def get_triplicity(degree, is_day_chart):
     }
 
 
-def get_decan(degree):
-    degree_in_sign = degree % 30
-    decan_num = int(degree_in_sign / 10) + 1
-    sign_index = int(degree / 30)
-    
-    decan_rulers = [
-        ['Mars', 'Sun', 'Venus'],
-        ['Mercury', 'Moon', 'Saturn'],
-        ['Jupiter', 'Mars', 'Sun'],
-        ['Venus', 'Mercury', 'Moon'],
-        ['Saturn', 'Jupiter', 'Mars'],
-        ['Sun', 'Venus', 'Mercury'],
-        ['Moon', 'Saturn', 'Jupiter'],
-        ['Mars', 'Sun', 'Venus'],
-        ['Mercury', 'Moon', 'Saturn'],
-        ['Jupiter', 'Mars', 'Sun'],
-        ['Venus', 'Mercury', 'Moon'],
-        ['Saturn', 'Jupiter', 'Mars']
-    ]
-    
+def _build_decan(sign_index, decan_num):
     return {
         'decan': decan_num,
-        'ruler': decan_rulers[sign_index][decan_num - 1],
+        'ruler': DECAN_RULERS[sign_index][decan_num - 1],
         'degree_range': f"{(decan_num-1)*10}°-{decan_num*10}°"
     }
 
 
-def get_term(degree):
-    degree_in_sign = degree % 30
-    sign_index = int(degree / 30)
-    
-    terms = [
-        [(0, 6, 'Jupiter'), (6, 12, 'Venus'), (12, 20, 'Mercury'), (20, 25, 'Mars'), (25, 30, 'Saturn')],
-        [(0, 8, 'Venus'), (8, 14, 'Mercury'), (14, 22, 'Jupiter'), (22, 27, 'Saturn'), (27, 30, 'Mars')],
-        [(0, 6, 'Mercury'), (6, 12, 'Jupiter'), (12, 17, 'Venus'), (17, 24, 'Mars'), (24, 30, 'Saturn')],
-        [(0, 7, 'Mars'), (7, 13, 'Venus'), (13, 19, 'Mercury'), (19, 26, 'Jupiter'), (26, 30, 'Saturn')],
-        [(0, 6, 'Jupiter'), (6, 11, 'Venus'), (11, 18, 'Saturn'), (18, 24, 'Mercury'), (24, 30, 'Mars')],
-        [(0, 7, 'Mercury'), (7, 17, 'Venus'), (17, 21, 'Jupiter'), (21, 28, 'Mars'), (28, 30, 'Saturn')],
-        [(0, 6, 'Saturn'), (6, 14, 'Mercury'), (14, 21, 'Jupiter'), (21, 28, 'Venus'), (28, 30, 'Mars')],
-        [(0, 7, 'Mars'), (7, 11, 'Venus'), (11, 19, 'Mercury'), (19, 24, 'Jupiter'), (24, 30, 'Saturn')],
-        [(0, 12, 'Jupiter'), (12, 17, 'Venus'), (17, 21, 'Mercury'), (21, 26, 'Saturn'), (26, 30, 'Mars')],
-        [(0, 7, 'Mercury'), (7, 14, 'Jupiter'), (14, 22, 'Venus'), (22, 26, 'Saturn'), (26, 30, 'Mars')],
-        [(0, 7, 'Mercury'), (7, 13, 'Venus'), (13, 20, 'Jupiter'), (20, 25, 'Mars'), (25, 30, 'Saturn')],
-        [(0, 12, 'Venus'), (12, 16, 'Jupiter'), (16, 19, 'Mercury'), (19, 28, 'Mars'), (28, 30, 'Saturn')]
-    ]
-    
-    for start, end, ruler in terms[sign_index]:
+def _build_term(sign_index, degree_in_sign):
+    for start, end, ruler in TERMS[sign_index]:
         if start <= degree_in_sign < end:
             return {
                 'ruler': ruler,
@@ -313,6 +1008,141 @@ def get_term(degree):
     return None
 
 
+# ============================================
+# PRECOMPUTED CLASSIFICATION TABLES
+# Built once at import: sign data per sign, dignity per planet x sign,
+# triplicity per sign (day/night), and decan/term per whole degree (all
+# decan and term boundaries fall on whole degrees). Rows are read-only
+# (MappingProxyType) because every chart in the worker shares them;
+# Body.to_dict() copies them into the response.
+# ============================================
+def _frozen(entry):
+    return MappingProxyType(entry) if entry is not None else None
+
+
+SIGN_INDEX = {sign: i for i, sign in enumerate(SIGNS)}
+
+SIGN_DATA = {
+    sign: _frozen({
+        'element': ELEMENTS.get(sign),
+        'modality': MODALITIES.get(sign),
+        'polarity': POLARITIES.get(sign)
+    })
+    for sign in SIGNS
+}
+
+DIGNITY_MATRIX = {
+    planet: tuple(_frozen(_classify_dignity(planet, sign)) for sign in SIGNS)
+    for planet in DIGNITIES
+}
+
+TRIPLICITY_TABLE = {
+    is_day_chart: tuple(_frozen(_build_triplicity(sign, is_day_chart)) for sign in SIGNS)
+    for is_day_chart in (False, True)
+}
+
+_DECANS = [[_frozen(_build_decan(sign_index, decan_num)) for decan_num in (1, 2, 3)] for sign_index in range(12)]
+DECAN_TABLE = tuple(_DECANS[deg // 30][(deg % 30) // 10] for deg in range(360))
+
+TERM_TABLE = tuple(_frozen(_build_term(deg // 30, deg % 30)) for deg in range(360))
+
+RULED_SIGNS = {planet: [s for s, r in SIGN_RULERS.items() if r == planet] for planet in set(SIGN_RULERS.values())}
+
+
+def classify_longitudes(longitudes, is_day_chart=False, planet_names=None):
+    # Bulk sign/decan/term/triplicity (and dignity when names are given)
+    # classification for many longitudes at once
+    triplicities = TRIPLICITY_TABLE[bool(is_day_chart)]
+    results = []
+    for i, lon in enumerate(longitudes):
+        deg = int(normalize_degree(lon))
+        sign_index = deg // 30
+        sign = SIGNS[sign_index]
+        entry = {
+            'sign': sign,
+            'signData': SIGN_DATA[sign],
+            'decan': DECAN_TABLE[deg],
+            'term': TERM_TABLE[deg],
+            'triplicity': triplicities[sign_index]
+        }
+        if planet_names is not None:
+            by_sign = DIGNITY_MATRIX.get(planet_names[i])
+            entry['dignity'] = by_sign[sign_index] if by_sign else None
+        results.append(entry)
+    return results
+
+
+# ============================================
+# DIVISIONAL CHARTS (VARGAS)
+# Parashari vargas. Each sign is split into N equal parts and part p of
+# sign s maps to the sign given by the rule below (sign indices, Aries = 0,
+# so even indices are the odd/masculine signs). The D30 trimsamsa uses
+# unequal parts instead. Everything is tabulated at import.
+# ============================================
+VARGA_RULES = {
+    'D1': (1, lambda s, p: s),
+    'D2': (2, lambda s, p: 4 - p if s % 2 == 0 else 3 + p),
+    'D3': (3, lambda s, p: s + 4 * p),
+    'D4': (4, lambda s, p: s + 3 * p),
+    'D7': (7, lambda s, p: (s if s % 2 == 0 else s + 6) + p),
+    'D9': (9, lambda s, p: s * 9 + p),
+    'D10': (10, lambda s, p: (s if s % 2 == 0 else s + 8) + p),
+    'D12': (12, lambda s, p: s + p),
+    'D16': (16, lambda s, p: (0, 4, 8)[s % 3] + p),
+    'D20': (20, lambda s, p: (0, 8, 4)[s % 3] + p),
+    'D24': (24, lambda s, p: (4 if s % 2 == 0 else 3) + p),
+    'D27': (27, lambda s, p: (0, 3, 6, 9)[s % 4] + p),
+    'D40': (40, lambda s, p: (0 if s % 2 == 0 else 6) + p),
+    'D45': (45, lambda s, p: (0, 4, 8)[s % 3] + p),
+    'D60': (60, lambda s, p: s + p),
+}
+
+# Trimsamsa: (end degree, sign index) for odd and even signs
+TRIMSAMSA_PARTS = {
+    0: [(5, 0), (10, 10), (18, 8), (25, 2), (30, 6)],
+    1: [(5, 1), (12, 5), (20, 11), (25, 9), (30, 7)],
+}
+
+VARGA_TABLES = {
+    name: (divisions, [[rule(s, p) % 12 for p in range(divisions)] for s in range(12)])
+    for name, (divisions, rule) in VARGA_RULES.items()
+}
+
+TRIMSAMSA_TABLE = [
+    [next(sign for end, sign in TRIMSAMSA_PARTS[s % 2] if deg < end) for deg in range(30)]
+    for s in range(12)
+]
+
+VARGAS = list(VARGA_TABLES) + ['D30']
+
+# Grahas (plus Rahu/Ketu and the Ascendant) placed in the divisional charts
+VARGA_BODIES = ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn']
+
+
+def calculate_vargas(points, vargas):
+    # points: [(name, longitude)], computed for every requested varga at once
+    placements = [(name, int(normalize_degree(lon) / 30), normalize_degree(lon) % 30.0) for name, lon in points]
+    result = {}
+    for varga in vargas:
+        chart = {}
+        if varga == 'D30':
+            for name, sign_index, deg_in_sign in placements:
+                chart[name] = {'sign': SIGNS[TRIMSAMSA_TABLE[sign_index][int(deg_in_sign)]]}
+        elif varga in VARGA_TABLES:
+            divisions, table = VARGA_TABLES[varga]
+            for name, sign_index, deg_in_sign in placements:
+                scaled = deg_in_sign * divisions
+                part = min(int(scaled / 30), divisions - 1)
+                chart[name] = {
+                    'sign': SIGNS[table[sign_index][part]],
+                    'degreeInSign': scaled % 30.0
+                }
+        else:
+            continue
+        result[varga] = chart
+    return result
+
+
 def check_combustion(planet_name, planet_degree, sun_degree):
     if planet_name == 'Sun':
         return None
@@ -365,6 +1195,7 @@ def calculate_sect(is_day_chart):
     }
 
 
+@functools.lru_cache(maxsize=None)
 def get_planet_sect_status(planet_name, is_day_chart):
     day_sect_planets = ['Sun', 'Jupiter', 'Saturn']
     night_sect_planets = ['Moon', 'Venus', 'Mars']
@@ -388,15 +1219,15 @@ def find_mutual_receptions(planets):
     
     planet_signs = {}
     for p in planets:
-        if p['name'] in SIGN_RULERS.values():
-            planet_signs[p['name']] = p['sign']
+        if p.name in SIGN_RULERS.values():
+            planet_signs[p.name] = p.sign
     
     checked = set()
     for p1_name, p1_sign in planet_signs.items():
         for p2_name, p2_sign in planet_signs.items():
             if p1_name != p2_name and (p2_name, p1_name) not in checked:
-                p1_rules = [s for s, r in SIGN_RULERS.items() if r == p1_name]
-                p2_rules = [s for s, r in SIGN_RULERS.items() if r == p2_name]
+                p1_rules = RULED_SIGNS[p1_name]
+                p2_rules = RULED_SIGNS[p2_name]
                 
                 if p1_sign in p2_rules and p2_sign in p1_rules:
                     receptions.append({
@@ -415,8 +1246,8 @@ def find_mutual_receptions(planets):
 def calculate_dispositor_chain(planets):
     planet_signs = {}
     for p in planets:
-        if p['name'] in ['Sun', 'Moon', 'Mercury', 'Venus', 'Mars', 'Jupiter', 'Saturn']:
-            planet_signs[p['name']] = p['sign']
+        if p.name in ['Sun', 'Moon', 'Mercury', 'Venus', 'Mars', 'Jupiter', 'Saturn']:
+            planet_signs[p.name] = p.sign
     
     chain = {}
     for planet, sign in planet_signs.items():
@@ -460,9 +1291,9 @@ def calculate_dispositor_chain(planets):
 
 
 def calculate_void_of_course_moon(moon_data, planets, aspects):
-    moon_deg = moon_data['fullDegree']
-    moon_sign = moon_data['sign']
-    moon_speed = moon_data.get('speed', 12)
+    moon_deg = moon_data.full_degree
+    moon_sign = moon_data.sign
+    moon_speed = moon_data.speed
     
     sign_index = SIGNS.index(moon_sign)
     sign_end = (sign_index + 1) * 30
@@ -494,116 +1325,497 @@ def calculate_void_of_course_moon(moon_data, planets, aspects):
     }
 
 
-def check_fixed_star_conjunctions(planets, orb=1.5):
+MOON_PHASES = [
+    'New Moon', 'Waxing Crescent', 'First Quarter', 'Waxing Gibbous',
+    'Full Moon', 'Waning Gibbous', 'Last Quarter', 'Waning Crescent'
+]
+
+
+def calculate_moon_phase(sun_deg, moon_deg):
+    elongation = normalize_degree(moon_deg - sun_deg)
+    phase_index = int(normalize_degree(elongation + 22.5) / 45) % 8
+    illumination = (1 - math.cos(math.radians(elongation))) / 2
+
+    return {
+        'phase': MOON_PHASES[phase_index],
+        'elongation': round(elongation, 2),
+        'illumination': round(illumination * 100, 1),
+        'is_waxing': elongation < 180
+    }
+
+
+# ============================================
+# FIXED STAR INDEX
+# Uses the full Swiss Ephemeris star catalog (sefstars.txt in EPHE_PATH)
+# when present, otherwise the FIXED_STARS longitudes (J2000) precessed to
+# the chart epoch. Positions are computed once per epoch and kept sorted by
+# longitude, so each lookup is a binary search rather than a full scan.
+# ============================================
+FIXED_STAR_CATALOG = os.environ.get('FIXED_STAR_CATALOG', 'sefstars.txt')
+FIXED_STAR_MAX_MAGNITUDE = float(os.environ.get('FIXED_STAR_MAX_MAGNITUDE', 99))
+FIXED_STAR_EPOCH_YEARS = float(os.environ.get('FIXED_STAR_EPOCH_YEARS', 1))
+J2000_JD = 2451545.0
+
+
+def precess_longitude(lon_j2000, jd):
+    # General precession in longitude (IAU 1976), good to well under an
+    # arcsecond per century around J2000
+    t = (jd - J2000_JD) / 36525.0
+    return normalize_degree(lon_j2000 + (5029.0966 * t + 1.11113 * t * t) / 3600.0)
+
+
+def load_fixed_star_catalog(path=None):
+    path = path or os.path.join(EPHE_PATH, FIXED_STAR_CATALOG)
+    stars = []
+    seen = set()
+    try:
+        with open(path, encoding='latin-1') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                fields = [field.strip() for field in line.split(',')]
+                if len(fields) < 14 or not fields[1] or fields[1] in seen:
+                    continue
+                try:
+                    magnitude = float(fields[13])
+                except ValueError:
+                    magnitude = None
+                if magnitude is not None and magnitude > FIXED_STAR_MAX_MAGNITUDE:
+                    continue
+                seen.add(fields[1])
+                stars.append({
+                    'name': fields[0] or fields[1],
+                    'nomenclature': fields[1],
+                    'magnitude': magnitude
+                })
+    except OSError:
+        return []
+    return stars
+
+
+@functools.lru_cache(maxsize=1)
+def get_fixed_star_catalog():
+    catalog = load_fixed_star_catalog()
+    print(f"FIXED STARS: {len(catalog) or len(FIXED_STARS)} stars "
+          f"({'catalog ' + FIXED_STAR_CATALOG if catalog else 'built-in list, precessed'})")
+    return catalog
+
+
+class FixedStarIndex:
+    __slots__ = ('longitudes', 'stars')
+
+    def __init__(self, entries):
+        entries = sorted(entries, key=lambda entry: entry[0])
+        self.longitudes = [lon for lon, _ in entries]
+        self.stars = [star for _, star in entries]
+
+    def __len__(self):
+        return len(self.longitudes)
+
+    def within(self, lon, orb):
+        low = lon - orb
+        high = lon + orb
+        if low < 0:
+            ranges = ((0.0, high), (low + 360.0, 360.0))
+        elif high >= 360:
+            ranges = ((low, 360.0), (0.0, high - 360.0))
+        else:
+            ranges = ((low, high),)
+        for start, end in ranges:
+            first = bisect.bisect_left(self.longitudes, start)
+            last = bisect.bisect_right(self.longitudes, end)
+            for k in range(first, last):
+                yield self.longitudes[k], self.stars[k]
+
+
+def _star_metadata(name, magnitude=None):
+    known = FIXED_STARS.get(name, {})
+    return {
+        'name': name,
+        'nature': known.get('nature'),
+        'meaning': known.get('meaning'),
+        'magnitude': magnitude
+    }
+
+
+@functools.lru_cache(maxsize=16)
+def _fixed_star_index_for_epoch(epoch_jd):
+    entries = []
+    catalog = get_fixed_star_catalog()
+    if catalog:
+        for star in catalog:
+            try:
+                xx = swe.fixstar2_ut(',' + star['nomenclature'], epoch_jd)[0]
+            except swe.Error:
+                continue
+            entries.append((normalize_degree(xx[0]), _star_metadata(star['name'], star['magnitude'])))
+    else:
+        for name, star_data in FIXED_STARS.items():
+            entries.append((precess_longitude(star_data['longitude'], epoch_jd), _star_metadata(name)))
+    return FixedStarIndex(entries)
+
+
+def get_fixed_star_index(jd=None):
+    if jd is None:
+        return _fixed_star_index_for_epoch(J2000_JD)
+    step = FIXED_STAR_EPOCH_YEARS * 365.25
+    return _fixed_star_index_for_epoch(J2000_JD + round((jd - J2000_JD) / step) * step)
+
+
+def check_fixed_star_conjunctions(planets, orb=1.5, jd=None):
     conjunctions = []
+    index = get_fixed_star_index(jd)
     
     for planet in planets:
-        if planet['name'] in ASPECT_PLANETS:
-            planet_lon = planet['fullDegree']
+        if planet.name in ASPECT_PLANETS:
+            planet_lon = planet.full_degree
             
-            for star_name, star_data in FIXED_STARS.items():
-                star_lon = star_data['longitude']
+            for star_lon, star in index.within(planet_lon, orb):
                 diff = abs(planet_lon - star_lon)
                 if diff > 180:
                     diff = 360 - diff
                 
-                if diff <= orb:
-                    conjunctions.append({
-                        'planet': planet['name'],
-                        'star': star_name,
-                        'orb': round(diff, 2),
-                        'nature': star_data['nature'],
-                        'meaning': star_data['meaning']
-                    })
+                conjunctions.append({
+                    'planet': planet.name,
+                    'star': star['name'],
+                    'star_longitude': round(star_lon, 4),
+                    'orb': round(diff, 2),
+                    'magnitude': star['magnitude'],
+                    'nature': star['nature'],
+                    'meaning': star['meaning']
+                })
     
     return conjunctions
 
 
-def calculate_aspect(planet1, planet2):
-    deg1 = planet1['fullDegree']
-    deg2 = planet2['fullDegree']
-    speed1 = planet1.get('speed', 0)
-    speed2 = planet2.get('speed', 0)
-    
-    diff = abs(deg1 - deg2)
-    if diff > 180:
-        diff = 360 - diff
-    
-    use_light_orb = is_light(planet1['name']) or is_light(planet2['name'])
-    
-    for aspect_name, aspect_data in ASPECTS.items():
-        if aspect_data['type'] == 'declination':
-            continue
-            
-        target_angle = aspect_data['angle']
-        orb = aspect_data['orb_lights'] if use_light_orb else aspect_data['orb_planets']
-        
-        actual_orb = abs(diff - target_angle)
-        
-        if actual_orb <= orb:
-            raw_diff = deg1 - deg2
-            if raw_diff < -180:
-                raw_diff += 360
-            elif raw_diff > 180:
-                raw_diff -= 360
-            
-            relative_speed = speed1 - speed2
-            
-            if target_angle == 0:
-                is_applying = (raw_diff > 0 and relative_speed < 0) or (raw_diff < 0 and relative_speed > 0)
-            elif target_angle == 180:
-                if abs(raw_diff) > 180:
-                    is_applying = relative_speed > 0 if raw_diff > 0 else relative_speed < 0
-                else:
-                    is_applying = relative_speed < 0 if raw_diff > 0 else relative_speed > 0
+# ============================================
+# ORB PROFILES
+# Named aspect sets and orb schemes, selectable per request. Each entry in
+# 'aspects' inherits angle/orbs/symbol/type from ASPECTS and may override
+# them, restrict the aspect to certain bodies, or set per-body orbs. Extra
+# profiles can be supplied as JSON through ORB_PROFILES_PATH.
+# ============================================
+LIGHTS = ('Sun', 'Moon')
+
+ORB_PROFILES = {
+    'default': {
+        'description': 'All major and minor aspects with the standard orbs',
+        'aspects': {name: {} for name, data in ASPECTS.items() if data['type'] != 'declination'}
+    },
+    'majors': {
+        'description': 'Ptolemaic aspects only',
+        'aspects': {name: {} for name, data in ASPECTS.items() if data['type'] == 'major'}
+    },
+    'tight': {
+        'description': 'Major aspects with narrow orbs',
+        'aspects': {
+            'conjunction': {'orb_lights': 6, 'orb_planets': 4},
+            'opposition': {'orb_lights': 6, 'orb_planets': 4},
+            'trine': {'orb_lights': 5, 'orb_planets': 3},
+            'square': {'orb_lights': 5, 'orb_planets': 3},
+            'sextile': {'orb_lights': 3, 'orb_planets': 2}
+        }
+    },
+    'uranian': {
+        'description': 'Hard aspects of the 16th harmonic series (Uranian/cosmobiology)',
+        'aspects': {
+            'conjunction': {'orb_lights': 1.5, 'orb_planets': 1},
+            'opposition': {'orb_lights': 1.5, 'orb_planets': 1},
+            'square': {'orb_lights': 1.5, 'orb_planets': 1},
+            'semi_square': {'orb_lights': 1.5, 'orb_planets': 1},
+            'sesquiquadrate': {'orb_lights': 1.5, 'orb_planets': 1},
+            'sixteenth': {'angle': 22.5, 'orb_lights': 1, 'orb_planets': 1, 'symbol': '1/16', 'type': 'uranian'},
+            'three_sixteenths': {'angle': 67.5, 'orb_lights': 1, 'orb_planets': 1, 'symbol': '3/16', 'type': 'uranian'},
+            'five_sixteenths': {'angle': 112.5, 'orb_lights': 1, 'orb_planets': 1, 'symbol': '5/16', 'type': 'uranian'},
+            'seven_sixteenths': {'angle': 157.5, 'orb_lights': 1, 'orb_planets': 1, 'symbol': '7/16', 'type': 'uranian'}
+        }
+    },
+    'vedic_drishti': {
+        # Graha drishti is counted forward from the aspecting graha
+        # ('forward': angle = (aspected - aspecting) % 360): every graha
+        # aspects the 7th (mutual); Mars also the 4th/8th, Jupiter the
+        # 5th/9th, Saturn the 3rd/10th
+        'description': 'Vedic planetary aspects (graha drishti), counted forward from the aspecting graha',
+        'aspects': {
+            'opposition': {'symbol': '7th', 'type': 'drishti'},
+            'drishti_4th': {'angle': 90, 'orb_lights': 8, 'orb_planets': 6, 'symbol': '4th',
+                            'type': 'drishti', 'forward': True, 'bodies': ['Mars']},
+            'drishti_8th': {'angle': 210, 'orb_lights': 8, 'orb_planets': 6, 'symbol': '8th',
+                            'type': 'drishti', 'forward': True, 'bodies': ['Mars']},
+            'drishti_5th': {'angle': 120, 'orb_lights': 8, 'orb_planets': 6, 'symbol': '5th',
+                            'type': 'drishti', 'forward': True, 'bodies': ['Jupiter']},
+            'drishti_9th': {'angle': 240, 'orb_lights': 8, 'orb_planets': 6, 'symbol': '9th',
+                            'type': 'drishti', 'forward': True, 'bodies': ['Jupiter']},
+            'drishti_3rd': {'angle': 60, 'orb_lights': 8, 'orb_planets': 6, 'symbol': '3rd',
+                            'type': 'drishti', 'forward': True, 'bodies': ['Saturn']},
+            'drishti_10th': {'angle': 270, 'orb_lights': 8, 'orb_planets': 6, 'symbol': '10th',
+                             'type': 'drishti', 'forward': True, 'bodies': ['Saturn']}
+        }
+    },
+    'progressions': {
+        'description': 'Ptolemaic aspects with the 1 degree orb used for progressions and directions',
+        'aspects': {name: {'orb_lights': 1, 'orb_planets': 1}
+                    for name, data in ASPECTS.items() if data['type'] == 'major'}
+    }
+}
+
+ORB_PROFILE_REQUIRED_FIELDS = {'angle': (int, float), 'orb_lights': (int, float), 'orb_planets': (int, float),
+                               'symbol': str, 'type': str}
+
+
+def validate_orb_profiles(profiles, source):
+    # Raises ValueError naming the profile/aspect/field instead of failing
+    # later with a KeyError while the profiles are compiled
+    if not isinstance(profiles, dict):
+        raise ValueError(f"{source}: expected an object of named profiles")
+    for name, spec in profiles.items():
+        if not isinstance(spec, dict) or not isinstance(spec.get('aspects'), dict) or not spec['aspects']:
+            raise ValueError(f"{source}: profile '{name}' needs a non-empty 'aspects' object")
+        for aspect_name, overrides in spec['aspects'].items():
+            if not isinstance(overrides, dict):
+                raise ValueError(f"{source}: profile '{name}' aspect '{aspect_name}' must be an object")
+            data = dict(ASPECTS.get(aspect_name, {}))
+            data.update(overrides)
+            for field, kind in ORB_PROFILE_REQUIRED_FIELDS.items():
+                if not isinstance(data.get(field), kind) or isinstance(data.get(field), bool):
+                    raise ValueError(f"{source}: profile '{name}' aspect '{aspect_name}' "
+                                     f"is missing or has an invalid '{field}'")
+            if not isinstance(data.get('body_orbs', {}), dict) or not isinstance(data.get('bodies', []), list):
+                raise ValueError(f"{source}: profile '{name}' aspect '{aspect_name}' "
+                                 f"has an invalid 'body_orbs' or 'bodies'")
+    return profiles
+
+
+ORB_PROFILES_PATH = os.environ.get('ORB_PROFILES_PATH')
+if ORB_PROFILES_PATH:
+    try:
+        with open(ORB_PROFILES_PATH) as f:
+            custom_profiles = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"ORB_PROFILES_PATH {ORB_PROFILES_PATH}: could not read profiles: {e}") from e
+    ORB_PROFILES.update(validate_orb_profiles(custom_profiles, f"ORB_PROFILES_PATH {ORB_PROFILES_PATH}"))
+
+
+class AspectProfile:
+    # Compiled profile: aspect windows sorted by their lower bound so a
+    # separation only tests the few windows that can contain it. Aspects
+    # marked 'forward' are directional (cast by the first body onto the
+    # second, measured forward along the zodiac) and are kept apart.
+    __slots__ = ('name', 'description', 'aspects', 'lows', 'max_width', 'directional')
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.description = spec.get('description', '')
+        entries = []
+        self.directional = []
+        for priority, (aspect_name, overrides) in enumerate(spec['aspects'].items()):
+            data = dict(ASPECTS.get(aspect_name, {}))
+            data.update(overrides)
+            bodies = data.pop('bodies', None)
+            body_orbs = {body: data['orb_lights'] for body in LIGHTS}
+            body_orbs.update(data.pop('body_orbs', {}))
+            max_orb = max([data['orb_planets']] + list(body_orbs.values()))
+            entry = (
+                data['angle'] - max_orb,
+                data['angle'] + max_orb,
+                priority,
+                aspect_name,
+                data,
+                body_orbs,
+                frozenset(bodies) if bodies else None
+            )
+            (self.directional if data.get('forward') else entries).append(entry)
+        entries.sort(key=lambda entry: entry[0])
+        self.aspects = entries
+        self.lows = [entry[0] for entry in entries]
+        self.max_width = max((entry[1] - entry[0] for entry in entries), default=0)
+
+    def match(self, diff, name1, name2, forward=None, directional_only=False):
+        # forward: (lon2 - lon1) % 360, needed for directional aspects,
+        # which only ever match with name1 as the aspecting body
+        best = None
+        last = 0 if directional_only else bisect.bisect_right(self.lows, diff)
+        first = bisect.bisect_left(self.lows, diff - self.max_width)
+        for low, high, priority, aspect_name, data, body_orbs, bodies in self.aspects[first:last]:
+            if diff > high or (best is not None and priority > best[0]):
+                continue
+            if bodies is not None and name1 not in bodies and name2 not in bodies:
+                continue
+            orb = max(body_orbs.get(name1, data['orb_planets']), body_orbs.get(name2, data['orb_planets']))
+            actual_orb = abs(diff - data['angle'])
+            if actual_orb <= orb:
+                best = (priority, aspect_name, data, orb, actual_orb)
+        if forward is not None:
+            for low, high, priority, aspect_name, data, body_orbs, bodies in self.directional:
+                if best is not None and priority > best[0]:
+                    continue
+                if bodies is not None and name1 not in bodies:
+                    continue
+                orb = max(body_orbs.get(name1, data['orb_planets']), body_orbs.get(name2, data['orb_planets']))
+                actual_orb = abs((forward - data['angle'] + 180.0) % 360.0 - 180.0)
+                if actual_orb <= orb:
+                    best = (priority, aspect_name, data, orb, actual_orb)
+        return best[1:] if best else None
+
+    def orb_matrices(self, names1, names2):
+        # For vectorized matching: (aspect name, data, orbs, allowed) in
+        # priority order, where orbs/allowed are (len(names1), len(names2))
+        # arrays applying the same per-body orb and body rules as match().
+        # Directional entries (data['forward']) allow names1 as the aspecting body.
+        matrices = []
+        for low, high, priority, aspect_name, data, body_orbs, bodies in sorted(self.aspects + self.directional,
+                                                                                 key=lambda e: e[2]):
+            orbs1 = np.array([body_orbs.get(name, data['orb_planets']) for name in names1], dtype=float)
+            orbs2 = np.array([body_orbs.get(name, data['orb_planets']) for name in names2], dtype=float)
+            orbs = np.maximum(orbs1[:, None], orbs2[None, :])
+            if bodies is None:
+                allowed = np.ones(orbs.shape, dtype=bool)
+            elif data.get('forward'):
+                allowed = np.array([name in bodies for name in names1])[:, None] & np.ones(orbs.shape, dtype=bool)
             else:
-                is_applying = actual_orb > 0 and (
-                    (raw_diff > 0 and relative_speed < 0) or 
-                    (raw_diff < 0 and relative_speed > 0)
-                )
-            
-            sign1 = get_zodiac_sign(deg1)
-            sign2 = get_zodiac_sign(deg2)
-            expected_sign_diff = target_angle / 30
-            actual_sign_diff = abs(SIGNS.index(sign1) - SIGNS.index(sign2))
-            if actual_sign_diff > 6:
-                actual_sign_diff = 12 - actual_sign_diff
-            is_dissociate = abs(actual_sign_diff - expected_sign_diff) > 0.5
-            
-            return {
-                'aspect': aspect_name,
-                'angle': target_angle,
-                'symbol': aspect_data['symbol'],
-                'type': aspect_data['type'],
-                'orb': round(actual_orb, 2),
-                'orb_allowed': orb,
-                'is_applying': is_applying,
-                'is_separating': not is_applying,
-                'is_exact': actual_orb < 0.5,
-                'is_dissociate': is_dissociate
-            }
+                allowed = (np.array([name in bodies for name in names1])[:, None]
+                           | np.array([name in bodies for name in names2])[None, :])
+            matrices.append((aspect_name, data, orbs, allowed))
+        return matrices
+
+    def match_array(self, separation, names1, names2, forward=None):
+        # separation: (..., len(names1), len(names2)) angular distances in
+        # [0, 180]; forward: the same shape of (lon2 - lon1) % 360, needed
+        # for directional aspects (skipped without it). Returns an aspect
+        # index array (-1 for none), the signed orb-to-exact array and the
+        # aspect names by index.
+        matrices = self.orb_matrices(names1, names2)
+        index = np.full(separation.shape, -1, dtype=np.int16)
+        orb = np.full(separation.shape, np.nan)
+        for i, (aspect_name, data, orbs, allowed) in enumerate(matrices):
+            if data.get('forward'):
+                if forward is None:
+                    continue
+                delta = (forward - data['angle'] + 180.0) % 360.0 - 180.0
+            else:
+                delta = separation - data['angle']
+            hit = (np.abs(delta) <= orbs) & allowed & (index < 0)
+            index[hit] = i
+            orb[hit] = delta[hit]
+        return index, orb, [aspect_name for aspect_name, _, _, _ in matrices]
+
+
+def angular_separation(a, b):
+    # Vectorized shortest distance between longitudes, in [0, 180]
+    return 180.0 - np.abs(180.0 - np.abs(a - b) % 360.0)
+
+
+ASPECT_PROFILES = {name: AspectProfile(name, spec) for name, spec in ORB_PROFILES.items()}
+DEFAULT_ASPECT_PROFILE = ASPECT_PROFILES['default']
+
+
+def get_aspect_profile(name):
+    return ASPECT_PROFILES.get(name or 'default', DEFAULT_ASPECT_PROFILE)
+
+
+def calculate_aspect(planet1, planet2, profile=DEFAULT_ASPECT_PROFILE, directional_only=False):
+    deg1 = planet1.full_degree
+    deg2 = planet2.full_degree
+    speed1 = planet1.speed
+    speed2 = planet2.speed
     
-    return None
+    diff = abs(deg1 - deg2)
+    if diff > 180:
+        diff = 360 - diff
+    
+    forward = (deg2 - deg1) % 360.0 if profile.directional else None
+    matched = profile.match(diff, planet1.name, planet2.name, forward, directional_only)
+    
+    if not matched:
+        return None
+    
+    aspect_name, aspect_data, orb, actual_orb = matched
+    target_angle = aspect_data['angle']
+    # Directional aspects are measured over the full circle (e.g. 210 for
+    # the 8th); the separation-based checks below use the folded angle
+    folded_angle = min(target_angle, 360 - target_angle)
+    
+    raw_diff = deg1 - deg2
+    if raw_diff < -180:
+        raw_diff += 360
+    elif raw_diff > 180:
+        raw_diff -= 360
+    
+    relative_speed = speed1 - speed2
+    
+    if folded_angle == 0:
+        is_applying = (raw_diff > 0 and relative_speed < 0) or (raw_diff < 0 and relative_speed > 0)
+    elif folded_angle == 180:
+        if abs(raw_diff) > 180:
+            is_applying = relative_speed > 0 if raw_diff > 0 else relative_speed < 0
+        else:
+            is_applying = relative_speed < 0 if raw_diff > 0 else relative_speed > 0
+    else:
+        is_applying = actual_orb > 0 and (
+            (raw_diff > 0 and relative_speed < 0) or 
+            (raw_diff < 0 and relative_speed > 0)
+        )
+    
+    sign1 = get_zodiac_sign(deg1)
+    sign2 = get_zodiac_sign(deg2)
+    expected_sign_diff = folded_angle / 30
+    actual_sign_diff = abs(SIGN_INDEX[sign1] - SIGN_INDEX[sign2])
+    if actual_sign_diff > 6:
+        actual_sign_diff = 12 - actual_sign_diff
+    is_dissociate = abs(actual_sign_diff - expected_sign_diff) > 0.5
+    
+    aspect = {
+        'aspect': aspect_name,
+        'angle': target_angle,
+        'symbol': aspect_data['symbol'],
+        'type': aspect_data['type'],
+        'orb': round(actual_orb, 2),
+        'orb_allowed': orb,
+        'is_applying': is_applying,
+        'is_separating': not is_applying,
+        'is_exact': actual_orb < 0.5,
+        'is_dissociate': is_dissociate
+    }
+    if aspect_data.get('forward'):
+        aspect['aspecting'] = planet1.name
+        aspect['aspected'] = planet2.name
+    return aspect
+
+
+def pair_aspects(planet1, planet2, profile=DEFAULT_ASPECT_PROFILE):
+    # A pair has one symmetric aspect at most, but with directional
+    # aspects each body may also cast its own onto the other
+    aspects = []
+    aspect = calculate_aspect(planet1, planet2, profile)
+    if aspect:
+        aspects.append({'planet1': planet1.name, 'planet2': planet2.name, **aspect})
+    if profile.directional:
+        reverse = calculate_aspect(planet2, planet1, profile, directional_only=True)
+        if reverse:
+            aspects.append({'planet1': planet2.name, 'planet2': planet1.name, **reverse})
+    return aspects
 
 
 def calculate_declination_aspects(planets):
+    # Bodies need equatorial coordinates (assign_equatorial_coordinates)
     aspects = []
-    aspect_bodies = [p for p in planets if p['name'] in ASPECT_PLANETS and 'latitude' in p]
+    aspect_bodies = [p for p in planets if p.name in ASPECT_PLANETS and p.declination is not None]
     
     for i in range(len(aspect_bodies)):
         for j in range(i + 1, len(aspect_bodies)):
             p1 = aspect_bodies[i]
             p2 = aspect_bodies[j]
             
-            dec1 = p1.get('latitude', 0)
-            dec2 = p2.get('latitude', 0)
+            dec1 = p1.declination
+            dec2 = p2.declination
             
             diff = abs(dec1 - dec2)
             
             if diff < 1.0:
                 aspects.append({
-                    'planet1': p1['name'],
-                    'planet2': p2['name'],
+                    'planet1': p1.name,
+                    'planet2': p2.name,
                     'aspect': 'parallel',
                     'symbol': '∥',
                     'type': 'declination',
@@ -615,8 +1827,8 @@ def calculate_declination_aspects(planets):
             sum_dec = abs(dec1 + dec2)
             if sum_dec < 1.0 and (dec1 * dec2 < 0):
                 aspects.append({
-                    'planet1': p1['name'],
-                    'planet2': p2['name'],
+                    'planet1': p1.name,
+                    'planet2': p2.name,
                     'aspect': 'contraparallel',
                     'symbol': '#',
                     'type': 'declination',
@@ -628,28 +1840,19 @@ def calculate_declination_aspects(planets):
     return aspects
 
 
-def calculate_all_aspects(planets, include_angles=False, asc_deg=None, mc_deg=None):
+def calculate_all_aspects(planets, include_angles=False, asc_deg=None, mc_deg=None,
+                          profile=DEFAULT_ASPECT_PROFILE):
     aspects = []
     
-    aspect_bodies = [p for p in planets if p['name'] in ASPECT_PLANETS]
+    aspect_bodies = [p for p in planets if p.name in ASPECT_PLANETS]
     
     if include_angles and asc_deg is not None and mc_deg is not None:
-        aspect_bodies.append({'name': 'Ascendant', 'fullDegree': asc_deg, 'speed': 0})
-        aspect_bodies.append({'name': 'Midheaven', 'fullDegree': mc_deg, 'speed': 0})
+        aspect_bodies.append(Body('Ascendant', asc_deg, with_sign_data=False))
+        aspect_bodies.append(Body('Midheaven', mc_deg, with_sign_data=False))
     
     for i in range(len(aspect_bodies)):
         for j in range(i + 1, len(aspect_bodies)):
-            planet1 = aspect_bodies[i]
-            planet2 = aspect_bodies[j]
-            
-            aspect = calculate_aspect(planet1, planet2)
-            
-            if aspect:
-                aspects.append({
-                    'planet1': planet1['name'],
-                    'planet2': planet2['name'],
-                    **aspect
-                })
+            aspects.extend(pair_aspects(aspect_bodies[i], aspect_bodies[j], profile))
     
     aspects.sort(key=lambda x: x['orb'])
     
@@ -672,7 +1875,7 @@ def detect_aspect_patterns(aspects, planets):
     def has_aspect(p1, p2, aspect_list):
         return (p1, p2) in aspect_list or (p2, p1) in aspect_list
     
-    planet_positions = {p['name']: p['fullDegree'] for p in planets if p['name'] in ASPECT_PLANETS}
+    planet_positions = {p.name: p.full_degree for p in planets if p.name in ASPECT_PLANETS}
     
     # STELLIUM
     for p1 in planet_positions:
@@ -902,7 +2105,7 @@ def detect_aspect_patterns(aspects, planets):
 
 
 def calculate_chart_shape(planets):
-    positions = sorted([p['fullDegree'] for p in planets if p['name'] in ASPECT_PLANETS[:10]])
+    positions = sorted([p.full_degree for p in planets if p.name in ASPECT_PLANETS[:10]])
     
     if len(positions) < 7:
         return None
@@ -954,10 +2157,10 @@ def calculate_element_balance(planets):
                'Jupiter': 1, 'Saturn': 1, 'Ascendant': 2, 'Midheaven': 1}
     
     for planet in planets:
-        if planet['name'] in weights:
-            element = ELEMENTS.get(planet['sign'])
+        if planet.name in weights:
+            element = ELEMENTS.get(planet.sign)
             if element:
-                counts[element] += weights[planet['name']]
+                counts[element] += weights[planet.name]
     
     total = sum(counts.values())
     percentages = {k: round(v/total*100, 1) if total > 0 else 0 for k, v in counts.items()}
@@ -979,10 +2182,10 @@ def calculate_modality_balance(planets):
                'Jupiter': 1, 'Saturn': 1, 'Ascendant': 2, 'Midheaven': 1}
     
     for planet in planets:
-        if planet['name'] in weights:
-            modality = MODALITIES.get(planet['sign'])
+        if planet.name in weights:
+            modality = MODALITIES.get(planet.sign)
             if modality:
-                counts[modality] += weights[planet['name']]
+                counts[modality] += weights[planet.name]
     
     total = sum(counts.values())
     percentages = {k: round(v/total*100, 1) if total > 0 else 0 for k, v in counts.items()}
@@ -1002,10 +2205,10 @@ def calculate_polarity_balance(planets):
                'Jupiter': 1, 'Saturn': 1, 'Ascendant': 2, 'Midheaven': 1}
     
     for planet in planets:
-        if planet['name'] in weights:
-            polarity = POLARITIES.get(planet['sign'])
+        if planet.name in weights:
+            polarity = POLARITIES.get(planet.sign)
             if polarity:
-                counts[polarity] += weights[planet['name']]
+                counts[polarity] += weights[planet.name]
     
     total = sum(counts.values())
     percentages = {k: round(v/total*100, 1) if total > 0 else 0 for k, v in counts.items()}
@@ -1026,8 +2229,8 @@ def calculate_hemisphere_emphasis(planets, asc_deg, mc_deg):
     }
     
     for planet in planets:
-        if planet['name'] in ASPECT_PLANETS[:10]:
-            lon = planet['fullDegree']
+        if planet.name in ASPECT_PLANETS[:10]:
+            lon = planet.full_degree
             
             rel_to_asc = normalize_degree(lon - asc_deg)
             if rel_to_asc < 180:
@@ -1058,484 +2261,605 @@ def calculate_hemisphere_emphasis(planets, asc_deg, mc_deg):
     }
 
 
+# Computed once at startup - '/' is polled by the load balancer
+HOME_METADATA = {
+    "status": "Swiss Ephemeris API is running",
+    "version": "4.2 Ultimate + True Lahiri",
+    "endpoints": {
+        "/calculate": "POST - Calculate complete natal chart with all features",
+        "/now": "GET - Current sky (positions, retrogrades, Moon phase, VoC), cached per interval",
+        "/dasha": "POST - Vimshottari dasha tree from the sidereal Moon (levels, fromDate/toDate window)",
+        "/progressions": "POST - Secondary progressions and solar arc directions over a range of ages",
+        "/returns": "POST - Solar and lunar return instants and charts over a range of years",
+        "/lunations": "GET - New/full moons and quarters between from/to (precomputed event table)",
+        "/eclipses": "GET - Solar and lunar eclipses between from/to (precomputed event table)",
+        "/rise-set": "GET - Rise/set/transit times and planetary hours for date, latitude, longitude",
+        "/positions": "GET - Positions for date/time from the daily ephemeris store (precision=full for live)",
+        "/astrocartography": "POST - ASC/MC/DSC/IC lines for every body as [lon, lat] polylines",
+        "/rectification": "POST - Birth-time sweep (fromTime/toTime/stepMinutes) streamed as NDJSON",
+        "/transits/bulk": "POST - One transit sky against every natal chart in a local file, hits streamed as NDJSON",
+        "/transits/heatmap": "POST - Orb-to-exact arrays per (transit, natal, aspect) over a date range",
+        "/election": "POST - Time windows matching retrograde/sign/aspect/void-of-course constraints",
+        "/midpoints": "POST - Midpoints on a 90/45/22.5 degree dial, planetary pictures and harmonic charts",
+        "/worker-stats": "GET - Per-worker memory and first-request latency",
+        "/healthz": "GET - Liveness probe",
+        "/readyz": "GET - Readiness probe (ephemeris loaded and warm-up chart succeeded)",
+        "/": "GET - This status page"
+    },
+    "features": [
+        "All planets and points",
+        "Multiple house systems",
+        "All major and minor aspects",
+        "True declinations, out-of-bounds planets and declination aspects (parallel/contraparallel)",
+        "Aspect patterns (Grand Trine, T-Square, Yod, Golden Yod, Kite, etc.)",
+        "Essential dignities (domicile/exaltation/detriment/fall)",
+        "Triplicity rulers (day/night/participating)",
+        "Decans and Terms",
+        "Fixed star conjunctions",
+        "Chart shape analysis",
+        "Element/Modality/Polarity balance",
+        "Hemisphere emphasis",
+        "Sect analysis (day/night chart)",
+        "Combustion/Cazimi detection",
+        "Mutual receptions",
+        "Dispositor chain",
+        "Void of course Moon",
+        "True/Mean Node support (Western & Vedic)",
+        "TRUE LAHIRI AYANAMSA (for Vedic accuracy on all dates)"
+    ],
+    "parameters": {
+        "nodeType": {
+            "description": "Select node calculation type for Western or Vedic astrology",
+            "options": {
+                "true": "True/Oscillating Node (default) - actual lunar node position",
+                "mean": "Mean Node - averaged position (traditional Vedic)",
+                "both": "Include both True and Mean nodes in calculation"
+            },
+            "default": "true"
+        },
+        "zodiac": {
+            "description": "Zodiac for all longitudes, signs, houses and dignities",
+            "options": {
+                "tropical": "Tropical zodiac (default)",
+                "sidereal": "Sidereal zodiac using the selected ayanamsa (swe.FLG_SIDEREAL)"
+            },
+            "default": "tropical"
+        },
+        "ayanamsa": {
+            "description": "Ayanamsa used when zodiac is sidereal",
+            "options": list(AYANAMSA_MODES.keys()),
+            "default": "lahiri"
+        },
+        "vargas": {
+            "description": "Divisional charts to compute for the grahas, Rahu/Ketu and the Ascendant",
+            "options": VARGAS,
+            "default": []
+        },
+        "orbProfile": {
+            "description": "Named aspect set and orb scheme used for longitude aspects",
+            "options": {name: profile.description for name, profile in ASPECT_PROFILES.items()},
+            "default": "default"
+        },
+        "ephemeris": {
+            "description": "Ephemeris backend tier; responses report the tier actually used",
+            "options": EPHEMERIS_TIERS,
+            "default": DEFAULT_EPHEMERIS_TIER
+        }
+    },
+    "ayanamsa_modes": list(AYANAMSA_MODES.keys()),
+    "house_systems": HOUSE_SYSTEMS,
+    "aspects": list(ASPECTS.keys()),
+    "fixed_stars": list(FIXED_STARS.keys()),
+    "fixed_star_catalog": FIXED_STAR_CATALOG if os.path.exists(os.path.join(EPHE_PATH, FIXED_STAR_CATALOG)) else None,
+    "ephemeris_files": EPHEMERIS_FILES
+}
+
+
 @app.route('/', methods=['GET'])
 def home():
+    return jsonify(HOME_METADATA)
+
+
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    return jsonify({'status': 'ok'})
+
+
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    ready = READINESS['ephemeris_loaded'] and READINESS['warmup_ok']
     return jsonify({
-        "status": "Swiss Ephemeris API is running",
-        "version": "4.2 Ultimate + True Lahiri",
-        "endpoints": {
-            "/calculate": "POST - Calculate complete natal chart with all features",
-            "/": "GET - This status page"
-        },
-        "features": [
-            "All planets and points",
-            "Multiple house systems",
-            "All major and minor aspects",
-            "Declination aspects (parallel/contraparallel)",
-            "Aspect patterns (Grand Trine, T-Square, Yod, Golden Yod, Kite, etc.)",
-            "Essential dignities (domicile/exaltation/detriment/fall)",
-            "Triplicity rulers (day/night/participating)",
-            "Decans and Terms",
-            "Fixed star conjunctions",
-            "Chart shape analysis",
-            "Element/Modality/Polarity balance",
-            "Hemisphere emphasis",
-            "Sect analysis (day/night chart)",
-            "Combustion/Cazimi detection",
-            "Mutual receptions",
-            "Dispositor chain",
-            "Void of course Moon",
-            "True/Mean Node support (Western & Vedic)",
-            "TRUE LAHIRI AYANAMSA (for Vedic accuracy on all dates)"
-        ],
-        "parameters": {
-            "nodeType": {
-                "description": "Select node calculation type for Western or Vedic astrology",
-                "options": {
-                    "true": "True/Oscillating Node (default) - actual lunar node position",
-                    "mean": "Mean Node - averaged position (traditional Vedic)",
-                    "both": "Include both True and Mean nodes in calculation"
-                },
-                "default": "true"
-            }
-        },
-        "ayanamsa_modes": list(AYANAMSA_MODES.keys()),
-        "house_systems": HOUSE_SYSTEMS,
-        "aspects": list(ASPECTS.keys()),
-        "fixed_stars": list(FIXED_STARS.keys()),
-        "ephemeris_files": [f for f in os.listdir('.') if f.endswith('.se1')]
+        'ready': ready,
+        'pid': os.getpid(),
+        'ephemerisLoaded': READINESS['ephemeris_loaded'],
+        'ephemerisBackend': READINESS['ephemeris_backend'],
+        'ephemerisFiles': EPHEMERIS_FILES,
+        'warmup': {
+            'ok': READINESS['warmup_ok'],
+            'enabled': WARMUP_ENABLED,
+            'error': READINESS['warmup_error'],
+            'duration_ms': READINESS['warmup_ms'],
+            'steps': READINESS['warmup_steps']
+        }
+    }), 200 if ready else 503
+
+
+@app.route('/worker-stats', methods=['GET'])
+def worker_stats():
+    booted_at = WORKER_STATE['booted_at']
+    return jsonify({
+        'pid': WORKER_STATE['pid'],
+        'preloaded': PRELOAD_EPHEMERIS,
+        'prefetchedFiles': EPHEMERIS_PREFETCHED,
+        'positionCache': position_cache_info(),
+        'chebyshevSegments': _cached_chebyshev_segment.cache_info()._asdict(),
+        'memory': read_process_memory(),
+        'requests': WORKER_STATE['requests'],
+        'first_request_ms': WORKER_STATE['first_request_ms'],
+        'uptime_seconds': round(time.time() - booted_at, 3) if booted_at else None
     })
 
 
-@app.route('/calculate', methods=['POST'])
-def calculate():
-    try:
-        data = request.json
-        birth_date = data['birthDate']
-        birth_time = data['time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        house_system = data.get('houseSystem', 'P')
-        include_aspects = data.get('includeAspects', True)
-        include_patterns = data.get('includePatterns', True)
-        include_angle_aspects = data.get('includeAngleAspects', True)
-        include_fixed_stars = data.get('includeFixedStars', True)
-        include_dignities = data.get('includeDignities', True)
-        include_analysis = data.get('includeAnalysis', True)
-        node_type = data.get('nodeType', 'true')
+def calculate_planet_positions(jd, node_type='true', flags=DEFAULT_CALC_FLAGS, sid_mode=None,
+                               tier=None, tiers_used=None):
+    planets = []
+    for name, planet_id in PLANETS.items():
+        if node_type == 'true' and name == 'Mean North Node':
+            continue
+        if node_type == 'mean' and name == 'True North Node':
+            continue
         
-        if house_system not in HOUSE_SYSTEMS:
-            house_system = 'P'
+        try:
+            position, used = tier_position(jd, planet_id, tier, flags, sid_mode)
+            longitude_deg, latitude_deg, distance, speed = position
+            if tiers_used is not None:
+                tiers_used.add(used)
+            
+            display_name = name
+            if name == 'True North Node' and node_type == 'true':
+                display_name = 'North Node'
+            elif name == 'Mean North Node' and node_type == 'mean':
+                display_name = 'North Node'
+            
+            body = Body(display_name, normalize_degree(longitude_deg), latitude_deg, distance, speed)
+            
+            if name in ['True North Node', 'Mean North Node']:
+                body.node_type = 'true' if name == 'True North Node' else 'mean'
+                body.vedic_name = 'Rahu'
+            
+            planets.append(body)
+        except Exception as e:
+            print(f"Could not calculate {name}: {e}")
 
-        print(f"INPUT: {birth_date} {birth_time} at ({latitude}, {longitude}) house_system={house_system} ({HOUSE_SYSTEMS[house_system]}) nodeType={node_type}")
+    return planets
 
-        year, month, day = map(int, birth_date.split('-'))
-        hour, minute = map(int, birth_time.split(':'))
-        time_decimal = hour + minute / 60.0
 
-        jd = swe.julday(year, month, day, time_decimal)
-        print(f"Julian Day: {jd}")
+def calculate_positions_batch(jds, bodies, flags=DEFAULT_CALC_FLAGS, sid_mode=None, tier=None,
+                              tiers_used=None):
+    # Body-major order keeps each body's ephemeris segment hot across the
+    # whole batch of instants; returns {name: [(lon, lat, dist, speed), ...]}.
+    # The interpolated tiers evaluate the whole batch in one vectorized call.
+    tier = tier or resolve_ephemeris_tier(batch=True)
+    tiers_used = set() if tiers_used is None else tiers_used
+    sidereal = flags & swe.FLG_SIDEREAL
+    store = get_daily_store() if tier == 'daily' else None
+    positions = {}
+    for name, body_id in bodies:
+        if not sidereal and tier == 'chebyshev':
+            positions[name] = [tuple(row) for row in fast_positions(jds, body_id).tolist()]
+            tiers_used.add('chebyshev')
+            continue
+        if (store is not None and not sidereal and all(store.covers(jd, body_id) for jd in jds)):
+            values = store.positions(jds, body_id)
+            if not np.isnan(values[:, 0]).any():
+                positions[name] = [tuple(row) for row in values.tolist()]
+                tiers_used.add('daily')
+                continue
+        positions[name] = []
+        for jd in jds:
+            position, used = tier_position(jd, body_id, 'moshier' if tier == 'moshier' else 'swiss',
+                                           flags, sid_mode)
+            positions[name].append(position)
+            tiers_used.add(used)
+    return positions
 
-        # ============================================
-        # CALCULATE TRUE LAHIRI AYANAMSA
-        # This is the astronomically accurate Lahiri value
-        # for any date (including historical dates)
-        # Note: pyswisseph requires set_sid_mode() first, then get_ayanamsa_ut(jd)
-        # ============================================
-        swe.set_sid_mode(swe.SIDM_LAHIRI)
-        lahiri_ayanamsa = swe.get_ayanamsa_ut(jd)
-        print(f"True Lahiri Ayanamsa: {lahiri_ayanamsa:.6f}°")
-        
-        # Also calculate other common ayanamsas for reference
-        swe.set_sid_mode(swe.SIDM_RAMAN)
-        raman_ayanamsa = swe.get_ayanamsa_ut(jd)
-        
-        swe.set_sid_mode(swe.SIDM_KRISHNAMURTI)
-        kp_ayanamsa = swe.get_ayanamsa_ut(jd)
-        
-        swe.set_sid_mode(swe.SIDM_FAGAN_BRADLEY)
-        fagan_ayanamsa = swe.get_ayanamsa_ut(jd)
-        
-        ayanamsa_values = {
-            'lahiri': lahiri_ayanamsa,
-            'raman': raman_ayanamsa,
-            'krishnamurti': kp_ayanamsa,
-            'fagan_bradley': fagan_ayanamsa,
-        }
 
-        planets = []
-        for name, planet_id in PLANETS.items():
-            if node_type == 'true' and name == 'Mean North Node':
-                continue
-            if node_type == 'mean' and name == 'True North Node':
-                continue
-            
-            try:
-                result = swe.calc_ut(jd, planet_id)
-                longitude_deg = result[0][0]
-                latitude_deg = result[0][1]
-                distance = result[0][2]
-                speed = result[0][3]
-                
-                sign = get_zodiac_sign(longitude_deg)
-                full_degree = normalize_degree(longitude_deg)
-                
-                display_name = name
-                if name == 'True North Node' and node_type == 'true':
-                    display_name = 'North Node'
-                elif name == 'Mean North Node' and node_type == 'mean':
-                    display_name = 'North Node'
-                
-                planet_data = {
-                    'name': display_name,
-                    'fullDegree': full_degree,
-                    'degreeInSign': full_degree % 30.0,
-                    'sign': sign,
-                    'signData': get_sign_data(sign),
-                    'latitude': latitude_deg,
-                    'distance': distance,
-                    'speed': speed,
-                    'isRetro': speed < 0,
-                    # Include tropical longitude explicitly
-                    'true_longitude': full_degree
-                }
-                
-                if name in ['True North Node', 'Mean North Node']:
-                    planet_data['nodeType'] = 'true' if name == 'True North Node' else 'mean'
-                    planet_data['vedicName'] = 'Rahu'
-                
-                planets.append(planet_data)
-            except Exception as e:
-                print(f"Could not calculate {name}: {e}")
+def calculate_lots(asc_deg, sun_lon, moon_lon, is_day_chart):
+    # Part of Fortune and Part of Spirit, reversed by night
+    if is_day_chart:
+        return normalize_degree(asc_deg + moon_lon - sun_lon), normalize_degree(asc_deg + sun_lon - moon_lon)
+    return normalize_degree(asc_deg + sun_lon - moon_lon), normalize_degree(asc_deg + moon_lon - sun_lon)
 
-        sun_data = next((p for p in planets if p['name'] == 'Sun'), None)
-        moon_data = next((p for p in planets if p['name'] == 'Moon'), None)
-        
+
+def compute_chart(birth_date, birth_time, latitude, longitude, house_system='P',
+                  include_aspects=True, include_patterns=True, include_angle_aspects=True,
+                  include_fixed_stars=True, include_dignities=True, include_analysis=True,
+                  node_type='true', orb_profile='default', zodiac='tropical', ayanamsa='lahiri',
+                  vargas=None, ephemeris=None):
+    if house_system not in HOUSE_SYSTEMS:
+        house_system = 'P'
+    aspect_profile = get_aspect_profile(orb_profile)
+    is_sidereal = zodiac == 'sidereal'
+    if ayanamsa not in AYANAMSA_MODES:
+        ayanamsa = 'lahiri'
+    sid_mode = AYANAMSA_MODES[ayanamsa] if is_sidereal else None
+    calc_flags = SIDEREAL_FLAGS if is_sidereal else DEFAULT_CALC_FLAGS
+    ephemeris_tier = resolve_ephemeris_tier(ephemeris)
+    tiers_used = set()
+
+    print(f"INPUT: {birth_date} {birth_time} at ({latitude}, {longitude}) house_system={house_system} ({HOUSE_SYSTEMS[house_system]}) nodeType={node_type}")
+
+    jd = parse_julian_day(birth_date, birth_time)
+    print(f"Julian Day: {jd}")
+
+    # ============================================
+    # CALCULATE TRUE LAHIRI AYANAMSA
+    # This is the astronomically accurate Lahiri value
+    # for any date (including historical dates), alongside
+    # other common ayanamsas for reference (cached per instant)
+    # ============================================
+    ayanamsa_values = get_reference_ayanamsas(jd)
+    lahiri_ayanamsa = ayanamsa_values['lahiri']
+    print(f"True Lahiri Ayanamsa: {lahiri_ayanamsa:.6f}°")
+
+    planets = calculate_planet_positions(jd, node_type, calc_flags, sid_mode, ephemeris_tier, tiers_used)
+    bodies = {body.name: body for body in planets}
+
+    def add_body(body):
+        planets.append(body)
+        bodies[body.name] = body
+
+    sun_data = bodies.get('Sun')
+    moon_data = bodies.get('Moon')
+    
+    if is_sidereal:
+        houses_result = calculate_sidereal_houses(jd, latitude, longitude, house_system, sid_mode)
+    else:
         houses_result = swe.houses_ex(jd, latitude, longitude, house_system.encode())
-        cusps = houses_result[0]
-        ascmc = houses_result[1]
+    cusps = houses_result[0]
+    ascmc = houses_result[1]
 
-        asc_deg = normalize_degree(ascmc[0])
-        mc_deg = normalize_degree(ascmc[1])
-        armc = ascmc[2]
-        vertex_deg = normalize_degree(ascmc[3])
+    asc_deg = normalize_degree(ascmc[0])
+    mc_deg = normalize_degree(ascmc[1])
+    armc = ascmc[2]
+    vertex_deg = normalize_degree(ascmc[3])
 
-        desc_deg = normalize_degree(asc_deg + 180)
-        ic_deg = normalize_degree(mc_deg + 180)
+    desc_deg = normalize_degree(asc_deg + 180)
+    ic_deg = normalize_degree(mc_deg + 180)
 
-        is_day_chart = False
-        if sun_data:
-            sun_lon = sun_data['fullDegree']
-            sun_from_asc = normalize_degree(sun_lon - asc_deg)
-            is_day_chart = sun_from_asc >= 180
+    is_day_chart = False
+    if sun_data:
+        sun_lon = sun_data.full_degree
+        sun_from_asc = normalize_degree(sun_lon - asc_deg)
+        is_day_chart = sun_from_asc >= 180
 
-        print(f"HOUSES ({HOUSE_SYSTEMS[house_system]}): ASC={asc_deg:.4f}, MC={mc_deg:.4f}, isDayChart={is_day_chart}")
+    print(f"HOUSES ({HOUSE_SYSTEMS[house_system]}): ASC={asc_deg:.4f}, MC={mc_deg:.4f}, isDayChart={is_day_chart}")
 
-        for planet_data in planets:
-            name = planet_data['name']
-            sign = planet_data['sign']
-            full_degree = planet_data['fullDegree']
+    if include_dignities:
+        dignified = [body for body in planets if body.name in DIGNITIES]
+        classified = classify_longitudes([body.full_degree for body in dignified], is_day_chart,
+                                         [body.name for body in dignified])
+        for body, entry in zip(dignified, classified):
+            body.dignity = entry['dignity']
+            body.triplicity = entry['triplicity']
+            body.decan = entry['decan']
+            body.term = entry['term']
             
-            if include_dignities and name in DIGNITIES:
-                planet_data['dignity'] = get_dignity(name, sign)
-                planet_data['triplicity'] = get_triplicity(full_degree, is_day_chart)
-                planet_data['decan'] = get_decan(full_degree)
-                planet_data['term'] = get_term(full_degree)
-                
-                if sun_data and name != 'Sun':
-                    combustion = check_combustion(name, full_degree, sun_data['fullDegree'])
-                    if combustion:
-                        planet_data['combustion'] = combustion
-                
-                sect_status = get_planet_sect_status(name, is_day_chart)
-                if sect_status:
-                    planet_data['sect'] = sect_status
-
-        for north_node_name in ['North Node', 'True North Node', 'Mean North Node']:
-            north_node = next((p for p in planets if p['name'] == north_node_name), None)
-            if north_node:
-                south_node_deg = normalize_degree(north_node['fullDegree'] + 180.0)
-                south_sign = get_zodiac_sign(south_node_deg)
-                
-                if north_node_name == 'North Node':
-                    south_name = 'South Node'
-                elif north_node_name == 'True North Node':
-                    south_name = 'True South Node'
-                else:
-                    south_name = 'Mean South Node'
-                
-                south_node_data = {
-                    'name': south_name,
-                    'fullDegree': south_node_deg,
-                    'degreeInSign': south_node_deg % 30.0,
-                    'sign': south_sign,
-                    'signData': get_sign_data(south_sign),
-                    'latitude': -north_node['latitude'],
-                    'distance': north_node['distance'],
-                    'speed': north_node['speed'],
-                    'isRetro': True,
-                    'vedicName': 'Ketu',
-                    'true_longitude': south_node_deg
-                }
-                
-                if north_node_name in ['True North Node', 'Mean North Node']:
-                    south_node_data['nodeType'] = north_node.get('nodeType')
-                
-                planets.append(south_node_data)
-
-        mean_lilith = next((p for p in planets if p['name'] == 'Mean Lilith'), None)
-        if mean_lilith:
-            planets.append({
-                'name': 'Black Moon Lilith',
-                'fullDegree': mean_lilith['fullDegree'],
-                'degreeInSign': mean_lilith['degreeInSign'],
-                'sign': mean_lilith['sign'],
-                'signData': mean_lilith['signData'],
-                'latitude': mean_lilith['latitude'],
-                'distance': mean_lilith['distance'],
-                'speed': mean_lilith['speed'],
-                'isRetro': mean_lilith['isRetro'],
-                'true_longitude': mean_lilith['fullDegree']
-            })
+            if sun_data and body.name != 'Sun':
+                body.combustion = check_combustion(body.name, body.full_degree, sun_data.full_degree)
             
-            selena_deg = normalize_degree(mean_lilith['fullDegree'] + 180.0)
-            selena_sign = get_zodiac_sign(selena_deg)
-            planets.append({
-                'name': 'White Moon Selena',
-                'fullDegree': selena_deg,
-                'degreeInSign': selena_deg % 30.0,
-                'sign': selena_sign,
-                'signData': get_sign_data(selena_sign),
-                'latitude': -mean_lilith['latitude'],
-                'distance': mean_lilith['distance'],
-                'speed': mean_lilith['speed'],
-                'isRetro': False,
-                'true_longitude': selena_deg
-            })
+            body.sect = get_planet_sect_status(body.name, is_day_chart)
 
-            mean_priapus_deg = normalize_degree(mean_lilith['fullDegree'] + 180.0)
-            planets.append({
-                'name': 'Mean Priapus',
-                'fullDegree': mean_priapus_deg,
-                'degreeInSign': mean_priapus_deg % 30.0,
-                'sign': get_zodiac_sign(mean_priapus_deg),
-                'latitude': -mean_lilith['latitude'],
-                'distance': mean_lilith['distance'],
-                'speed': mean_lilith['speed'],
-                'isRetro': False,
-                'true_longitude': mean_priapus_deg
-            })
+    for north_node_name in ['North Node', 'True North Node', 'Mean North Node']:
+        north_node = bodies.get(north_node_name)
+        if north_node:
+            if north_node_name == 'North Node':
+                south_name = 'South Node'
+            elif north_node_name == 'True North Node':
+                south_name = 'True South Node'
+            else:
+                south_name = 'Mean South Node'
+            
+            add_body(Body(
+                south_name,
+                normalize_degree(north_node.full_degree + 180.0),
+                -north_node.latitude,
+                north_node.distance,
+                north_node.speed,
+                is_retro=True,
+                vedic_name='Ketu',
+                node_type=north_node.node_type if north_node_name != 'North Node' else None
+            ))
 
-        true_lilith = next((p for p in planets if p['name'] == 'True Lilith'), None)
-        if true_lilith:
-            true_priapus_deg = normalize_degree(true_lilith['fullDegree'] + 180.0)
-            planets.append({
-                'name': 'True Priapus',
-                'fullDegree': true_priapus_deg,
-                'degreeInSign': true_priapus_deg % 30.0,
-                'sign': get_zodiac_sign(true_priapus_deg),
-                'latitude': -true_lilith['latitude'],
-                'distance': true_lilith['distance'],
-                'speed': true_lilith['speed'],
-                'isRetro': False,
-                'true_longitude': true_priapus_deg
-            })
+    mean_lilith = bodies.get('Mean Lilith')
+    if mean_lilith:
+        add_body(Body('Black Moon Lilith', mean_lilith.full_degree, mean_lilith.latitude,
+                      mean_lilith.distance, mean_lilith.speed, is_retro=mean_lilith.is_retro))
+        
+        selena_deg = normalize_degree(mean_lilith.full_degree + 180.0)
+        add_body(Body('White Moon Selena', selena_deg, -mean_lilith.latitude,
+                      mean_lilith.distance, mean_lilith.speed, is_retro=False))
+        add_body(Body('Mean Priapus', selena_deg, -mean_lilith.latitude,
+                      mean_lilith.distance, mean_lilith.speed, is_retro=False, with_sign_data=False))
 
-        try:
-            selena_h56_result = swe.calc_ut(jd, 56)
-            selena_h56_lon = selena_h56_result[0][0]
-            planets.append({
-                'name': 'Selena h56',
-                'fullDegree': normalize_degree(selena_h56_lon),
-                'degreeInSign': normalize_degree(selena_h56_lon) % 30.0,
-                'sign': get_zodiac_sign(selena_h56_lon),
-                'latitude': selena_h56_result[0][1],
-                'distance': selena_h56_result[0][2],
-                'speed': selena_h56_result[0][3],
-                'isRetro': selena_h56_result[0][3] < 0,
-                'true_longitude': normalize_degree(selena_h56_lon)
-            })
-        except Exception as e:
-            print(f"Could not calculate Selena h56: {e}")
+    true_lilith = bodies.get('True Lilith')
+    if true_lilith:
+        add_body(Body('True Priapus', normalize_degree(true_lilith.full_degree + 180.0), -true_lilith.latitude,
+                      true_lilith.distance, true_lilith.speed, is_retro=False, with_sign_data=False))
 
-        asc_sign = get_zodiac_sign(asc_deg)
-        mc_sign = get_zodiac_sign(mc_deg)
-        
-        planets.append({
-            'name': 'Vertex',
-            'fullDegree': vertex_deg,
+    try:
+        selena_h56_lon, selena_h56_lat, selena_h56_dist, selena_h56_speed = calc_position(
+            jd, 56, tier_flags(ephemeris_tier, calc_flags), sid_mode)[0][:4]
+        add_body(Body('Selena h56', normalize_degree(selena_h56_lon), selena_h56_lat,
+                      selena_h56_dist, selena_h56_speed, with_sign_data=False))
+    except Exception as e:
+        print(f"Could not calculate Selena h56: {e}")
+
+    asc_sign = get_zodiac_sign(asc_deg)
+    mc_sign = get_zodiac_sign(mc_deg)
+    
+    add_body(Body('Vertex', vertex_deg, with_sign_data=False))
+
+    if sun_data and moon_data:
+        pof_deg, pos_deg = calculate_lots(asc_deg, sun_data.full_degree, moon_data.full_degree, is_day_chart)
+        add_body(Body('Part of Fortune', pof_deg, with_sign_data=False, is_day_chart=is_day_chart))
+        add_body(Body('Part of Spirit', pos_deg, with_sign_data=False))
+
+    obliquity = assign_equatorial_coordinates(planets, jd, get_ayanamsa(jd, ayanamsa) if is_sidereal else None)
+
+    houses = {
+        'system': house_system,
+        'system_name': HOUSE_SYSTEMS.get(house_system, 'Unknown'),
+        'ascendant': {
+            'degree': asc_deg,
+            'degreeInSign': asc_deg % 30.0,
+            'sign': asc_sign,
+            'signData': get_sign_data(asc_sign)
+        },
+        'midheaven': {
+            'degree': mc_deg,
+            'degreeInSign': mc_deg % 30.0,
+            'sign': mc_sign,
+            'signData': get_sign_data(mc_sign)
+        },
+        'descendant': {
+            'degree': desc_deg,
+            'degreeInSign': desc_deg % 30.0,
+            'sign': get_zodiac_sign(desc_deg)
+        },
+        'ic': {
+            'degree': ic_deg,
+            'degreeInSign': ic_deg % 30.0,
+            'sign': get_zodiac_sign(ic_deg)
+        },
+        'vertex': {
+            'degree': vertex_deg,
             'degreeInSign': vertex_deg % 30.0,
-            'sign': get_zodiac_sign(vertex_deg),
-            'latitude': 0,
-            'distance': 0,
-            'speed': 0,
-            'isRetro': False,
-            'true_longitude': vertex_deg
+            'sign': get_zodiac_sign(vertex_deg)
+        },
+        'armc': armc,
+        'cusps': []
+    }
+
+    for i in range(12):
+        cusp_deg = normalize_degree(cusps[i])
+        cusp_sign = get_zodiac_sign(cusp_deg)
+        houses['cusps'].append({
+            'house': i + 1,
+            'degree': cusp_deg,
+            'degreeInSign': cusp_deg % 30.0,
+            'sign': cusp_sign,
+            'signData': get_sign_data(cusp_sign)
         })
 
-        if sun_data and moon_data:
-            sun_lon = sun_data['fullDegree']
-            moon_lon = moon_data['fullDegree']
+    aspects = []
+    declination_aspects = []
+    patterns = []
+    
+    if include_aspects:
+        aspects = calculate_all_aspects(planets, include_angle_aspects, asc_deg, mc_deg, aspect_profile)
+        declination_aspects = calculate_declination_aspects(planets)
+        print(f"ASPECTS: Found {len(aspects)} longitude aspects, {len(declination_aspects)} declination aspects")
+        
+        if include_patterns:
+            patterns = detect_aspect_patterns(aspects, planets)
+            print(f"PATTERNS: Found {len(patterns)} patterns")
 
-            if is_day_chart:
-                pof_deg = normalize_degree(asc_deg + moon_lon - sun_lon)
-            else:
-                pof_deg = normalize_degree(asc_deg + sun_lon - moon_lon)
-
-            planets.append({
-                'name': 'Part of Fortune',
-                'fullDegree': pof_deg,
-                'degreeInSign': pof_deg % 30.0,
-                'sign': get_zodiac_sign(pof_deg),
-                'latitude': 0,
-                'distance': 0,
-                'speed': 0,
-                'isRetro': False,
-                'is_day_chart': is_day_chart,
-                'true_longitude': pof_deg
-            })
-            
-            if is_day_chart:
-                pos_deg = normalize_degree(asc_deg + sun_lon - moon_lon)
-            else:
-                pos_deg = normalize_degree(asc_deg + moon_lon - sun_lon)
-            
-            planets.append({
-                'name': 'Part of Spirit',
-                'fullDegree': pos_deg,
-                'degreeInSign': pos_deg % 30.0,
-                'sign': get_zodiac_sign(pos_deg),
-                'latitude': 0,
-                'distance': 0,
-                'speed': 0,
-                'isRetro': False,
-                'true_longitude': pos_deg
-            })
+    fixed_star_conjunctions = []
+    if include_fixed_stars:
+        fixed_star_conjunctions = check_fixed_star_conjunctions(planets, jd=jd)
+        print(f"FIXED STARS: Found {len(fixed_star_conjunctions)} conjunctions")
 
-        houses = {
-            'system': house_system,
-            'system_name': HOUSE_SYSTEMS.get(house_system, 'Unknown'),
-            'ascendant': {
-                'degree': asc_deg,
-                'degreeInSign': asc_deg % 30.0,
-                'sign': asc_sign,
-                'signData': get_sign_data(asc_sign)
-            },
-            'midheaven': {
-                'degree': mc_deg,
-                'degreeInSign': mc_deg % 30.0,
-                'sign': mc_sign,
-                'signData': get_sign_data(mc_sign)
-            },
-            'descendant': {
-                'degree': desc_deg,
-                'degreeInSign': desc_deg % 30.0,
-                'sign': get_zodiac_sign(desc_deg)
-            },
-            'ic': {
-                'degree': ic_deg,
-                'degreeInSign': ic_deg % 30.0,
-                'sign': get_zodiac_sign(ic_deg)
-            },
-            'vertex': {
-                'degree': vertex_deg,
-                'degreeInSign': vertex_deg % 30.0,
-                'sign': get_zodiac_sign(vertex_deg)
-            },
-            'armc': armc,
-            'cusps': []
+    sect_analysis = calculate_sect(is_day_chart)
+    
+    mutual_receptions = find_mutual_receptions(planets)
+    print(f"MUTUAL RECEPTIONS: Found {len(mutual_receptions)}")
+    
+    dispositor_chain = calculate_dispositor_chain(planets)
+    print(f"DISPOSITOR: Final = {dispositor_chain['final_dispositor']}")
+    
+    void_of_course = None
+    if moon_data and aspects:
+        void_of_course = calculate_void_of_course_moon(moon_data, planets, aspects)
+        print(f"VOC MOON: {void_of_course['is_void_of_course']}")
+
+    analysis = {}
+    if include_analysis:
+        planets_for_analysis = planets + [Body('Ascendant', asc_deg, with_sign_data=False)]
+        planets_for_analysis.append(Body('Midheaven', mc_deg, with_sign_data=False))
+        
+        analysis = {
+            'chart_shape': calculate_chart_shape(planets),
+            'element_balance': calculate_element_balance(planets_for_analysis),
+            'modality_balance': calculate_modality_balance(planets_for_analysis),
+            'polarity_balance': calculate_polarity_balance(planets_for_analysis),
+            'hemisphere_emphasis': calculate_hemisphere_emphasis(planets, asc_deg, mc_deg)
         }
 
-        for i in range(12):
-            cusp_deg = normalize_degree(cusps[i])
-            cusp_sign = get_zodiac_sign(cusp_deg)
-            houses['cusps'].append({
-                'house': i + 1,
-                'degree': cusp_deg,
-                'degreeInSign': cusp_deg % 30.0,
-                'sign': cusp_sign,
-                'signData': get_sign_data(cusp_sign)
-            })
+    varga_charts = None
+    if isinstance(vargas, str):
+        vargas = [v.strip() for v in vargas.split(',')]
+    if vargas:
+        varga_points = [(body.name, body.full_degree) for body in planets
+                        if body.name in VARGA_BODIES or body.vedic_name]
+        varga_points.append(('Ascendant', asc_deg))
+        varga_charts = calculate_vargas(varga_points, [v for v in vargas if v in VARGAS])
 
-        aspects = []
-        declination_aspects = []
-        patterns = []
-        
-        if include_aspects:
-            aspects = calculate_all_aspects(planets, include_angle_aspects, asc_deg, mc_deg)
-            declination_aspects = calculate_declination_aspects(planets)
-            print(f"ASPECTS: Found {len(aspects)} longitude aspects, {len(declination_aspects)} declination aspects")
-            
-            if include_patterns:
-                patterns = detect_aspect_patterns(aspects, planets)
-                print(f"PATTERNS: Found {len(patterns)} patterns")
+    chart = {
+        'birthDate': birth_date,
+        'birthTime': birth_time,
+        'latitude': latitude,
+        'longitude': longitude,
+        'julianDay': jd,
+        'julian_day': jd,  # Alias for compatibility
+        'houseSystem': house_system,
+        'houseSystemName': HOUSE_SYSTEMS.get(house_system, 'Unknown'),
+        'nodeType': node_type,
+        'orbProfile': aspect_profile.name,
+        'is_day_chart': is_day_chart,
+        'isDayChart': is_day_chart,  # Alias for compatibility
+        'sect': sect_analysis,
+        'planets': [body.to_dict() for body in planets],
+        'houses': houses,
+        'aspects': aspects,
+        'declinationAspects': declination_aspects,
+        'aspectPatterns': patterns,
+        'fixedStarConjunctions': fixed_star_conjunctions,
+        'mutualReceptions': mutual_receptions,
+        'dispositorChain': dispositor_chain,
+        'voidOfCourseMoon': void_of_course,
+        'analysis': analysis,
+        # ============================================
+        # TRUE LAHIRI AYANAMSA - For Vedic calculations
+        # ============================================
+        'lahiri_ayanamsa': lahiri_ayanamsa,
+        'ayanamsa': {
+            'lahiri': lahiri_ayanamsa,
+            'raman': ayanamsa_values['raman'],
+            'krishnamurti': ayanamsa_values['krishnamurti'],
+            'fagan_bradley': ayanamsa_values['fagan_bradley'],
+        },
+        'zodiac': 'sidereal' if is_sidereal else 'tropical',
+        'obliquity': obliquity,
+        'outOfBounds': [body.name for body in planets if body.out_of_bounds],
+        'ephemeris': tier_report(ephemeris_tier, tiers_used)
+    }
+    
+    if is_sidereal:
+        # All longitudes, signs, houses and dignities above are sidereal
+        chart['siderealAyanamsa'] = {
+            'mode': ayanamsa,
+            'value': get_ayanamsa(jd, ayanamsa)
+        }
+    if varga_charts is not None:
+        chart['vargas'] = varga_charts
+    
+    return chart
 
-        fixed_star_conjunctions = []
-        if include_fixed_stars:
-            fixed_star_conjunctions = check_fixed_star_conjunctions(planets)
-            print(f"FIXED STARS: Found {len(fixed_star_conjunctions)} conjunctions")
 
-        sect_analysis = calculate_sect(is_day_chart)
-        
-        mutual_receptions = find_mutual_receptions(planets)
-        print(f"MUTUAL RECEPTIONS: Found {len(mutual_receptions)}")
-        
-        dispositor_chain = calculate_dispositor_chain(planets)
-        print(f"DISPOSITOR: Final = {dispositor_chain['final_dispositor']}")
-        
-        void_of_course = None
-        if moon_data and aspects:
-            void_of_course = calculate_void_of_course_moon(moon_data, planets, aspects)
-            print(f"VOC MOON: {void_of_course['is_void_of_course']}")
-
-        analysis = {}
-        if include_analysis:
-            planets_for_analysis = planets + [{'name': 'Ascendant', 'sign': asc_sign, 'fullDegree': asc_deg}]
-            planets_for_analysis.append({'name': 'Midheaven', 'sign': mc_sign, 'fullDegree': mc_deg})
-            
-            analysis = {
-                'chart_shape': calculate_chart_shape(planets),
-                'element_balance': calculate_element_balance(planets_for_analysis),
-                'modality_balance': calculate_modality_balance(planets_for_analysis),
-                'polarity_balance': calculate_polarity_balance(planets_for_analysis),
-                'hemisphere_emphasis': calculate_hemisphere_emphasis(planets, asc_deg, mc_deg)
-            }
+# ============================================
+# WARM-UP (run once per worker before it is reported ready)
+# Computes a chart for every house system (which touches every body in
+# PLANETS) and every ayanamsa mode so swisseph has opened its files and
+# filled its caches before the worker takes traffic.
+# ============================================
+def _env_list(name, default):
+    value = os.environ.get(name)
+    if not value:
+        return list(default)
+    return [item.strip() for item in value.split(',') if item.strip()]
 
-        return jsonify({
-            'birthDate': birth_date,
-            'birthTime': birth_time,
-            'latitude': latitude,
-            'longitude': longitude,
-            'julianDay': jd,
-            'julian_day': jd,  # Alias for compatibility
-            'houseSystem': house_system,
-            'houseSystemName': HOUSE_SYSTEMS.get(house_system, 'Unknown'),
-            'nodeType': node_type,
-            'is_day_chart': is_day_chart,
-            'isDayChart': is_day_chart,  # Alias for compatibility
-            'sect': sect_analysis,
-            'planets': planets,
-            'houses': houses,
-            'aspects': aspects,
-            'declinationAspects': declination_aspects,
-            'aspectPatterns': patterns,
-            'fixedStarConjunctions': fixed_star_conjunctions,
-            'mutualReceptions': mutual_receptions,
-            'dispositorChain': dispositor_chain,
-            'voidOfCourseMoon': void_of_course,
-            'analysis': analysis,
-            # ============================================
-            # TRUE LAHIRI AYANAMSA - For Vedic calculations
-            # ============================================
-            'lahiri_ayanamsa': lahiri_ayanamsa,
-            'ayanamsa': {
-                'lahiri': lahiri_ayanamsa,
-                'raman': ayanamsa_values['raman'],
-                'krishnamurti': ayanamsa_values['krishnamurti'],
-                'fagan_bradley': ayanamsa_values['fagan_bradley'],
-            },
-            'calculatedAt': datetime.utcnow().isoformat() + 'Z'
-        })
+
+WARMUP_ENABLED = os.environ.get('WARMUP_ENABLED', '1') == '1'
+WARMUP_BACKGROUND = os.environ.get('WARMUP_BACKGROUND', '0') == '1'
+WARMUP_DATES = _env_list('WARMUP_DATES', ['2000-01-01'])
+WARMUP_HOUSE_SYSTEMS = [h for h in _env_list('WARMUP_HOUSE_SYSTEMS', HOUSE_SYSTEMS) if h in HOUSE_SYSTEMS]
+WARMUP_AYANAMSAS = [m for m in _env_list('WARMUP_AYANAMSAS', AYANAMSA_MODES) if m in AYANAMSA_MODES]
+
+WARMUP_CHART = {
+    'birth_time': '12:00',
+    'latitude': 51.4769,
+    'longitude': 0.0
+}
+
+
+def _warmup_ayanamsa(jd, mode):
+    get_ayanamsa(jd, mode)
+    return calculate_planet_positions(jd, 'both', SIDEREAL_FLAGS, AYANAMSA_MODES[mode])
+
+
+def _warmup_steps():
+    for birth_date in WARMUP_DATES:
+        year, month, day = map(int, birth_date.split('-'))
+        jd = swe.julday(year, month, day, 12.0)
+        for house_system in WARMUP_HOUSE_SYSTEMS:
+            yield f'chart:{birth_date}:{house_system}', functools.partial(
+                compute_chart, birth_date, WARMUP_CHART['birth_time'],
+                WARMUP_CHART['latitude'], WARMUP_CHART['longitude'],
+                house_system=house_system, node_type='both')
+        for mode in WARMUP_AYANAMSAS:
+            yield f'ayanamsa:{birth_date}:{mode}', functools.partial(_warmup_ayanamsa, jd, mode)
+    # Load only: the master builds the table before forking (gunicorn
+    # when_ready), so a missing file must not make every worker build it
+    yield 'event_table', functools.partial(get_event_table, build=False)
+    yield 'daily_store', get_daily_store
+
+
+def run_warmup():
+    READINESS.update({'warmup_ok': False, 'warmup_error': None, 'warmup_ms': None, 'warmup_steps': {}})
+    if not WARMUP_ENABLED:
+        READINESS['warmup_ok'] = True
+        READINESS['warmup_error'] = 'skipped (WARMUP_ENABLED=0)'
+        return
+
+    started = time.perf_counter()
+    try:
+        for step_name, step in _warmup_steps():
+            step_started = time.perf_counter()
+            step()
+            READINESS['warmup_steps'][step_name] = round((time.perf_counter() - step_started) * 1000, 3)
+        READINESS['warmup_ok'] = True
+    except Exception as e:
+        print(f"WARMUP ERROR: {e}")
+        READINESS['warmup_error'] = str(e)
+    READINESS['warmup_ms'] = round((time.perf_counter() - started) * 1000, 3)
+    print(f"WARMUP: ok={READINESS['warmup_ok']} steps={len(READINESS['warmup_steps'])} "
+          f"in {READINESS['warmup_ms']} ms")
+
+
+def start_warmup():
+    if WARMUP_BACKGROUND:
+        # /healthz answers immediately; /readyz stays 503 until this finishes
+        threading.Thread(target=run_warmup, name='warmup', daemon=True).start()
+    else:
+        run_warmup()
+
+
+@app.route('/calculate', methods=['POST'])
+def calculate():
+    try:
+        data = request.json
+        chart = compute_chart(
+            data['birthDate'],
+            data['time'],
+            float(data['latitude']),
+            float(data['longitude']),
+            house_system=data.get('houseSystem', 'P'),
+            include_aspects=data.get('includeAspects', True),
+            include_patterns=data.get('includePatterns', True),
+            include_angle_aspects=data.get('includeAngleAspects', True),
+            include_fixed_stars=data.get('includeFixedStars', True),
+            include_dignities=data.get('includeDignities', True),
+            include_analysis=data.get('includeAnalysis', True),
+            node_type=data.get('nodeType', 'true'),
+            orb_profile=data.get('orbProfile', 'default'),
+            zodiac=data.get('zodiac', 'tropical'),
+            ayanamsa=data.get('ayanamsa', 'lahiri'),
+            vargas=data.get('vargas'),
+            ephemeris=data.get('ephemeris')
+        )
+        chart['calculatedAt'] = datetime.utcnow().isoformat() + 'Z'
+        return jsonify(chart)
 
     except Exception as e:
         import traceback
@@ -1548,7 +2872,1863 @@ def calculate():
         }), 500
 
 
-if __name__ == '__main__':
-    port = int(os.environ.get('PORT', 8080))
-    app.run(host='0.0.0.0', port=port, debug=True)
+# ============================================
+# CURRENT SKY (shared per refresh interval)
+# Every visitor within the same NOW_CACHE_SECONDS bucket gets the same
+# computation; nothing here depends on location.
+# ============================================
+NOW_CACHE_SECONDS = max(int(os.environ.get('NOW_CACHE_SECONDS', 60)), 1)
+UNIX_EPOCH_JD = 2440587.5
+
+NOW_CACHE = {'bucket': None, 'sky': None}
+NOW_CACHE_LOCK = threading.Lock()
+
 
+def compute_current_sky(timestamp):
+    jd = round_jd(UNIX_EPOCH_JD + timestamp / 86400.0)
+    tiers_used = set()
+    planets = calculate_planet_positions(jd, 'true', tiers_used=tiers_used)
+    obliquity = assign_equatorial_coordinates(planets, jd)
+
+    bodies = {body.name: body for body in planets}
+    sun_data = bodies.get('Sun')
+    moon_data = bodies.get('Moon')
+
+    moon_phase = None
+    void_of_course = None
+    if sun_data and moon_data:
+        moon_phase = calculate_moon_phase(sun_data.full_degree, moon_data.full_degree)
+        aspects = calculate_all_aspects(planets)
+        void_of_course = calculate_void_of_course_moon(moon_data, planets, aspects)
+
+    return {
+        'computedFor': datetime.utcfromtimestamp(timestamp).isoformat() + 'Z',
+        'expiresAt': datetime.utcfromtimestamp(timestamp + NOW_CACHE_SECONDS).isoformat() + 'Z',
+        'refreshSeconds': NOW_CACHE_SECONDS,
+        'julianDay': jd,
+        'planets': [body.to_dict() for body in planets],
+        'retrogrades': [body.name for body in planets if body.is_retro],
+        'obliquity': obliquity,
+        'outOfBounds': [body.name for body in planets if body.out_of_bounds],
+        'moonPhase': moon_phase,
+        'voidOfCourseMoon': void_of_course,
+        'ephemeris': tier_report(DEFAULT_EPHEMERIS_TIER, tiers_used)
+    }
+
+
+def get_current_sky(now=None):
+    now = time.time() if now is None else now
+    bucket = int(now // NOW_CACHE_SECONDS) * NOW_CACHE_SECONDS
+    if NOW_CACHE['bucket'] != bucket:
+        with NOW_CACHE_LOCK:
+            if NOW_CACHE['bucket'] != bucket:
+                NOW_CACHE['sky'] = compute_current_sky(bucket)
+                NOW_CACHE['bucket'] = bucket
+    return NOW_CACHE['sky'], bucket + NOW_CACHE_SECONDS - now
+
+
+@app.route('/now', methods=['GET'])
+def now_sky():
+    try:
+        sky, remaining = get_current_sky()
+        response = jsonify(sky)
+        response.headers['Cache-Control'] = f'public, max-age={max(int(remaining), 0)}'
+        return response
+
+    except Exception as e:
+        import traceback
+        print(f"NOW ERROR: {e}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': str(e),
+            'message': 'Current sky calculation failed',
+            'traceback': traceback.format_exc()
+        }), 500
+
+
+# ============================================
+# VIMSHOTTARI DASHA
+# The nakshatra boundaries and every lord's sub-period proportions are
+# tabulated once; the period tree is expanded lazily, so sub-levels are
+# only built for periods that overlap the requested window.
+# ============================================
+DASHA_SEQUENCE = ['Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury']
+DASHA_YEARS = {
+    'Ketu': 7, 'Venus': 20, 'Sun': 6, 'Moon': 10, 'Mars': 7,
+    'Rahu': 18, 'Jupiter': 16, 'Saturn': 19, 'Mercury': 17
+}
+DASHA_TOTAL_YEARS = 120
+DASHA_LEVELS = ['mahadasha', 'antardasha', 'pratyantardasha', 'sookshma', 'prana']
+DASHA_DEFAULT_YEAR_DAYS = 365.25
+DASHA_MAX_UNWINDOWED_LEVELS = 3
+
+NAKSHATRAS = [
+    'Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra', 'Punarvasu',
+    'Pushya', 'Ashlesha', 'Magha', 'Purva Phalguni', 'Uttara Phalguni', 'Hasta',
+    'Chitra', 'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha', 'Mula', 'Purva Ashadha',
+    'Uttara Ashadha', 'Shravana', 'Dhanishta', 'Shatabhisha', 'Purva Bhadrapada',
+    'Uttara Bhadrapada', 'Revati'
+]
+NAKSHATRA_SPAN = 360.0 / 27
+
+# (start, end, name, lord) per nakshatra
+NAKSHATRA_TABLE = [
+    (i * NAKSHATRA_SPAN, (i + 1) * NAKSHATRA_SPAN, name, DASHA_SEQUENCE[i % 9])
+    for i, name in enumerate(NAKSHATRAS)
+]
+NAKSHATRA_STARTS = [start for start, _, _, _ in NAKSHATRA_TABLE]
+
+
+def get_nakshatra(sidereal_lon):
+    lon = normalize_degree(sidereal_lon)
+    index = min(bisect.bisect_right(NAKSHATRA_STARTS, lon) - 1, 26)
+    start, end, name, lord = NAKSHATRA_TABLE[index]
+    return {
+        'index': index + 1,
+        'name': name,
+        'lord': lord,
+        'pada': min(int((lon - start) / (NAKSHATRA_SPAN / 4)) + 1, 4),
+        'start': start,
+        'end': end,
+        'fraction_elapsed': (lon - start) / NAKSHATRA_SPAN
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def dasha_sub_periods(lord):
+    # (sub-lord, start fraction, end fraction) of a period ruled by `lord`
+    start = DASHA_SEQUENCE.index(lord)
+    fractions = []
+    elapsed = 0.0
+    for k in range(9):
+        sub_lord = DASHA_SEQUENCE[(start + k) % 9]
+        share = DASHA_YEARS[sub_lord] / DASHA_TOTAL_YEARS
+        fractions.append((sub_lord, elapsed, elapsed + share))
+        elapsed += share
+    return tuple(fractions)
+
+
+def expand_dasha_period(lord, start_jd, end_jd, level, max_level, window_start, window_end):
+    period = {
+        'lord': lord,
+        'level': DASHA_LEVELS[level - 1],
+        'start': jd_to_iso(start_jd),
+        'end': jd_to_iso(end_jd),
+        'startJulianDay': start_jd,
+        'endJulianDay': end_jd
+    }
+    if level < max_level and start_jd < window_end and end_jd > window_start:
+        duration = end_jd - start_jd
+        period['subPeriods'] = [
+            expand_dasha_period(sub_lord, start_jd + f0 * duration, start_jd + f1 * duration,
+                                level + 1, max_level, window_start, window_end)
+            for sub_lord, f0, f1 in dasha_sub_periods(lord)
+        ]
+    return period
+
+
+def calculate_vimshottari_dasha(jd, ayanamsa='lahiri', levels=3, window_start=None, window_end=None,
+                                year_days=DASHA_DEFAULT_YEAR_DAYS):
+    moon_lon = calc_position(jd, swe.MOON, SIDEREAL_FLAGS, AYANAMSA_MODES[ayanamsa])[0][0]
+    nakshatra = get_nakshatra(moon_lon)
+    first_lord = nakshatra['lord']
+
+    # The birth dasha started before birth by the elapsed share of the nakshatra
+    cycle_start = jd - nakshatra['fraction_elapsed'] * DASHA_YEARS[first_lord] * year_days
+    window_start = cycle_start if window_start is None else window_start
+    window_end = cycle_start + DASHA_TOTAL_YEARS * year_days if window_end is None else window_end
+
+    periods = []
+    period_start = cycle_start
+    first = DASHA_SEQUENCE.index(first_lord)
+    for k in range(9):
+        lord = DASHA_SEQUENCE[(first + k) % 9]
+        period_end = period_start + DASHA_YEARS[lord] * year_days
+        periods.append(expand_dasha_period(lord, period_start, period_end, 1, levels,
+                                           window_start, window_end))
+        period_start = period_end
+
+    return {
+        'moon': {
+            'siderealLongitude': normalize_degree(moon_lon),
+            'nakshatra': nakshatra['name'],
+            'nakshatraIndex': nakshatra['index'],
+            'pada': nakshatra['pada'],
+            'lord': first_lord
+        },
+        'balance': {
+            'lord': first_lord,
+            'years_remaining': (1 - nakshatra['fraction_elapsed']) * DASHA_YEARS[first_lord]
+        },
+        'ayanamsa': {'mode': ayanamsa, 'value': get_ayanamsa(jd, ayanamsa)},
+        'yearDays': year_days,
+        'levels': DASHA_LEVELS[:levels],
+        'window': {'start': jd_to_iso(window_start), 'end': jd_to_iso(window_end)},
+        'periods': periods
+    }
+
+
+@app.route('/dasha', methods=['POST'])
+def dasha():
+    try:
+        data = request.json
+        jd = parse_julian_day(data['birthDate'], data['time'])
+        ayanamsa = data.get('ayanamsa', 'lahiri')
+        if ayanamsa not in AYANAMSA_MODES:
+            ayanamsa = 'lahiri'
+        levels = max(1, min(int(data.get('levels', 3)), len(DASHA_LEVELS)))
+        window_start = parse_julian_day(data['fromDate']) if data.get('fromDate') else None
+        window_end = parse_julian_day(data['toDate']) if data.get('toDate') else None
+
+        if levels > DASHA_MAX_UNWINDOWED_LEVELS and (window_start is None or window_end is None):
+            return jsonify({
+                'error': f'levels > {DASHA_MAX_UNWINDOWED_LEVELS} requires fromDate and toDate',
+                'message': 'Dasha window required'
+            }), 400
+
+        result = calculate_vimshottari_dasha(
+            jd, ayanamsa, levels, window_start, window_end,
+            float(data.get('yearDays', DASHA_DEFAULT_YEAR_DAYS))
+        )
+        result['birthDate'] = data['birthDate']
+        result['birthTime'] = data['time']
+        result['julianDay'] = jd
+        result['calculatedAt'] = datetime.utcnow().isoformat() + 'Z'
+        return jsonify(result)
+
+    except Exception as e:
+        import traceback
+        print(f"DASHA ERROR: {e}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': str(e),
+            'message': 'Dasha calculation failed',
+            'traceback': traceback.format_exc()
+        }), 500
+
+
+# ============================================
+# PROGRESSIONS & SOLAR ARC DIRECTIONS
+# Secondary progressions (one day after birth per year of life) for a
+# whole range of ages in one pass: the natal chart is computed once and
+# the progressed instants are fed to calculate_positions_batch together.
+# ============================================
+PROGRESSION_BODIES = ['Sun', 'Moon', 'Mercury', 'Venus', 'Mars', 'Jupiter', 'Saturn',
+                      'Uranus', 'Neptune', 'Pluto', 'Chiron']
+PROGRESSION_YEAR_DAYS = 365.2422
+PROGRESSION_MAX_STEPS = int(os.environ.get('PROGRESSION_MAX_STEPS', 500))
+
+
+def progression_body_ids(node_type='true'):
+    bodies = [(name, PLANETS[name]) for name in PROGRESSION_BODIES]
+    node_name = 'Mean North Node' if node_type == 'mean' else 'True North Node'
+    bodies.append(('North Node', PLANETS[node_name]))
+    return bodies
+
+
+def progression_ages(from_age, to_age, step):
+    if step <= 0 or to_age < from_age:
+        raise ValueError("step must be positive and toAge must not precede fromAge")
+    count = int(math.floor((to_age - from_age) / step + 1e-9)) + 1
+    if count > PROGRESSION_MAX_STEPS:
+        raise ValueError(f"Too many progression steps ({count}), maximum is {PROGRESSION_MAX_STEPS}")
+    return [from_age + i * step for i in range(count)]
+
+
+def aspects_to_natal(moving, natal, profile):
+    aspects = []
+    for body in moving:
+        for natal_body in natal:
+            aspects.extend(pair_aspects(body, natal_body, profile))
+    aspects.sort(key=lambda x: x['orb'])
+    return aspects
+
+
+def calculate_progressions(jd, latitude, longitude, ages, house_system='P', node_type='true',
+                           profile=DEFAULT_ASPECT_PROFILE, include_aspects=True, tier=None):
+    bodies = progression_body_ids(node_type)
+
+    # Natal chart, once; natal points are fixed, so they carry no speed
+    tier = tier or resolve_ephemeris_tier(batch=True)
+    tiers_used = set()
+    natal_tier = tier if tier in ('swiss', 'moshier') else resolve_ephemeris_tier(exact=True)
+    natal_positions = calculate_positions_batch([jd], bodies, tier=natal_tier, tiers_used=tiers_used)
+    ascmc = swe.houses_ex(jd, latitude, longitude, house_system.encode())[1]
+    natal = [Body(name, normalize_degree(positions[0][0]), positions[0][1], with_sign_data=False,
+                  is_retro=positions[0][3] < 0)
+             for name, positions in natal_positions.items()]
+    natal.append(Body('Ascendant', normalize_degree(ascmc[0]), with_sign_data=False))
+    natal.append(Body('Midheaven', normalize_degree(ascmc[1]), with_sign_data=False))
+    natal_sun = natal[0].full_degree
+
+    progressed_jds = [jd + age for age in ages]
+    progressed_positions = calculate_positions_batch(progressed_jds, bodies, tier=tier, tiers_used=tiers_used)
+
+    steps = []
+    for i, age in enumerate(ages):
+        progressed = [Body(name, normalize_degree(positions[i][0]), positions[i][1],
+                           positions[i][2], positions[i][3], with_sign_data=False)
+                      for name, positions in progressed_positions.items()]
+        sun_speed = progressed[0].speed
+        solar_arc = normalize_degree(progressed[0].full_degree - natal_sun)
+        directed = [Body(body.name, normalize_degree(body.full_degree + solar_arc),
+                         speed=sun_speed, is_retro=False, with_sign_data=False)
+                    for body in natal]
+
+        step = {
+            'age': age,
+            'date': jd_to_iso(jd + age * PROGRESSION_YEAR_DAYS),
+            'progressedDate': jd_to_iso(progressed_jds[i]),
+            'progressedJulianDay': progressed_jds[i],
+            'solarArc': solar_arc,
+            'progressed': [body.to_compact_dict() for body in progressed],
+            'solarArcDirected': [body.to_compact_dict() for body in directed]
+        }
+        if include_aspects:
+            step['progressedToNatal'] = aspects_to_natal(progressed, natal, profile)
+            step['directedToNatal'] = aspects_to_natal(directed, natal, profile)
+        steps.append(step)
+
+    return {
+        'natal': [body.to_compact_dict() for body in natal],
+        'progressions': steps,
+        'ephemeris': tier_report(tier, tiers_used)
+    }
+
+
+@app.route('/progressions', methods=['POST'])
+def progressions():
+    try:
+        data = request.json
+        jd = parse_julian_day(data['birthDate'], data['time'])
+        latitude = float(data['latitude'])
+        longitude = float(data['longitude'])
+        house_system = data.get('houseSystem', 'P')
+        if house_system not in HOUSE_SYSTEMS:
+            house_system = 'P'
+        node_type = data.get('nodeType', 'true')
+        orb_profile = data.get('orbProfile', 'progressions')
+        profile = get_aspect_profile(orb_profile)
+
+        ages = progression_ages(float(data.get('fromAge', 0)), float(data.get('toAge', 90)),
+                                float(data.get('step', 1)))
+
+        tier = resolve_ephemeris_tier(data.get('ephemeris'), bool(data.get('exact', False)), batch=True)
+        result = calculate_progressions(jd, latitude, longitude, ages, house_system, node_type,
+                                        profile, data.get('includeAspects', True), tier)
+        result['birthDate'] = data['birthDate']
+        result['birthTime'] = data['time']
+        result['julianDay'] = jd
+        result['houseSystem'] = house_system
+        result['orbProfile'] = profile.name
+        result['calculatedAt'] = datetime.utcnow().isoformat() + 'Z'
+        return jsonify(result)
+
+    except Exception as e:
+        import traceback
+        print(f"PROGRESSIONS ERROR: {e}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': str(e),
+            'message': 'Progressions calculation failed',
+            'traceback': traceback.format_exc()
+        }), 500
+
+
+# ============================================
+# SOLAR & LUNAR RETURNS
+# Return instants are found with Newton steps on the body's longitude,
+# seeded from its mean motion (one tropical year / sidereal month after
+# birth), then every return chart is computed in one batch.
+# ============================================
+RETURN_PERIODS = {
+    'solar': (swe.SUN, 365.2422),
+    'lunar': (swe.MOON, 27.321661)
+}
+RETURN_TOLERANCE_DAYS = 0.1 / 86400
+RETURN_MAX_ITERATIONS = 20
+RETURNS_MAX_YEARS = int(os.environ.get('RETURNS_MAX_YEARS', 100))
+
+
+@functools.lru_cache(maxsize=4096)
+def find_return(body, target_lon, seed_jd, flags=DEFAULT_CALC_FLAGS, sid_mode=None):
+    jd = seed_jd
+    for _ in range(RETURN_MAX_ITERATIONS):
+        lon, _, _, speed = calc_position_exact(jd, body, flags, sid_mode)[0][:4]
+        correction = ((lon - target_lon + 180) % 360 - 180) / speed
+        jd -= correction
+        if abs(correction) < RETURN_TOLERANCE_DAYS:
+            break
+    return jd
+
+
+def find_returns(jd, return_type, start_jd, end_jd, flags=DEFAULT_CALC_FLAGS, sid_mode=None):
+    body, period = RETURN_PERIODS[return_type]
+    target_lon = calc_position(jd, body, flags, sid_mode)[0][0]
+    first = max(1, math.floor((start_jd - jd) / period))
+    instants = []
+    n = first
+    while True:
+        seed = jd + n * period
+        if seed > end_jd + period:
+            break
+        instant = find_return(body, target_lon, seed, flags, sid_mode)
+        if start_jd <= instant < end_jd:
+            instants.append(instant)
+        n += 1
+    return target_lon, instants
+
+
+def house_of(longitude, cusps):
+    for i in range(12):
+        span = normalize_degree(cusps[(i + 1) % 12] - cusps[i])
+        if normalize_degree(longitude - cusps[i]) < span:
+            return i + 1
+    return 12
+
+
+def calculate_return_charts(instants, latitude, longitude, house_system='P', node_type='true',
+                            flags=DEFAULT_CALC_FLAGS, sid_mode=None, tier=None, tiers_used=None):
+    bodies = progression_body_ids(node_type)
+    positions = calculate_positions_batch(instants, bodies, flags, sid_mode, tier, tiers_used)
+    charts = []
+    for i, instant in enumerate(instants):
+        if sid_mode is not None:
+            cusps, ascmc = calculate_sidereal_houses(instant, latitude, longitude, house_system, sid_mode)[:2]
+        else:
+            cusps, ascmc = swe.houses_ex(instant, latitude, longitude, house_system.encode())[:2]
+        cusps = [normalize_degree(cusp) for cusp in cusps[:12]]
+        planets = []
+        for name, body_positions in positions.items():
+            lon, lat, dist, speed = body_positions[i]
+            body = Body(name, normalize_degree(lon), lat, dist, speed, with_sign_data=False)
+            planet = body.to_compact_dict()
+            planet['house'] = house_of(body.full_degree, cusps)
+            planets.append(planet)
+        asc_deg = normalize_degree(ascmc[0])
+        mc_deg = normalize_degree(ascmc[1])
+        charts.append({
+            'julianDay': instant,
+            'date': jd_to_iso(instant),
+            'planets': planets,
+            'houses': {
+                'ascendant': {'degree': asc_deg, 'sign': get_zodiac_sign(asc_deg)},
+                'midheaven': {'degree': mc_deg, 'sign': get_zodiac_sign(mc_deg)},
+                'cusps': cusps
+            }
+        })
+    return charts
+
+
+@app.route('/returns', methods=['POST'])
+def returns():
+    try:
+        data = request.json
+        jd = parse_julian_day(data['birthDate'], data['time'])
+        birth_year = int(data['birthDate'].split('-')[0])
+        latitude = float(data.get('returnLatitude', data['latitude']))
+        longitude = float(data.get('returnLongitude', data['longitude']))
+        house_system = data.get('houseSystem', 'P')
+        if house_system not in HOUSE_SYSTEMS:
+            house_system = 'P'
+        node_type = data.get('nodeType', 'true')
+        ayanamsa = data.get('ayanamsa', 'lahiri')
+        if ayanamsa not in AYANAMSA_MODES:
+            ayanamsa = 'lahiri'
+        is_sidereal = data.get('zodiac', 'tropical') == 'sidereal'
+        sid_mode = AYANAMSA_MODES[ayanamsa] if is_sidereal else None
+        flags = SIDEREAL_FLAGS if is_sidereal else DEFAULT_CALC_FLAGS
+
+        from_year = int(data.get('fromYear', datetime.utcnow().year))
+        to_year = int(data.get('toYear', from_year))
+        from_year = max(from_year, birth_year)
+        if to_year < from_year or to_year - from_year + 1 > RETURNS_MAX_YEARS:
+            raise ValueError(f"Year range must cover 1 to {RETURNS_MAX_YEARS} years from the birth year")
+        types = [t for t in data.get('types', ['solar']) if t in RETURN_PERIODS] or ['solar']
+        include_charts = data.get('includeCharts', True)
+        tier = resolve_ephemeris_tier(data.get('ephemeris'), bool(data.get('exact', False)), batch=True)
+        tiers_used = set()
+
+        start_jd = swe.julday(from_year, 1, 1, 0.0)
+        end_jd = swe.julday(to_year + 1, 1, 1, 0.0)
+
+        result = {}
+        for return_type in types:
+            target_lon, instants = find_returns(jd, return_type, start_jd, end_jd, flags, sid_mode)
+            entry = {
+                'natalLongitude': normalize_degree(target_lon),
+                'returns': [{'julianDay': instant, 'date': jd_to_iso(instant)} for instant in instants]
+            }
+            if include_charts:
+                entry['returns'] = calculate_return_charts(instants, latitude, longitude, house_system,
+                                                           node_type, flags, sid_mode, tier, tiers_used)
+            result[return_type] = entry
+
+        result['birthDate'] = data['birthDate']
+        result['birthTime'] = data['time']
+        result['julianDay'] = jd
+        result['fromYear'] = from_year
+        result['toYear'] = to_year
+        result['houseSystem'] = house_system
+        result['zodiac'] = 'sidereal' if is_sidereal else 'tropical'
+        if include_charts:
+            result['ephemeris'] = tier_report(tier, tiers_used)
+        result['calculatedAt'] = datetime.utcnow().isoformat() + 'Z'
+        return jsonify(result)
+
+    except Exception as e:
+        import traceback
+        print(f"RETURNS ERROR: {e}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': str(e),
+            'message': 'Returns calculation failed',
+            'traceback': traceback.format_exc()
+        }), 500
+
+
+# ============================================
+# LUNATIONS & ECLIPSES (global event table)
+# New/full moons, quarters and eclipses are the same for every user, so
+# they are computed once for EVENT_TABLE_FROM_YEAR..EVENT_TABLE_TO_YEAR,
+# persisted to EVENT_TABLE_PATH and answered by bisecting on time.
+# ============================================
+EVENT_TABLE_FROM_YEAR = int(os.environ.get('EVENT_TABLE_FROM_YEAR', 1900))
+EVENT_TABLE_TO_YEAR = int(os.environ.get('EVENT_TABLE_TO_YEAR', 2100))
+EVENT_TABLE_PATH = os.environ.get(
+    'EVENT_TABLE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'event_table.json')
+)
+EVENT_TABLE_VERSION = 1
+
+LUNATION_PHASES = ['new_moon', 'first_quarter', 'full_moon', 'last_quarter']
+SYNODIC_MONTH = 29.530588853
+REFERENCE_NEW_MOON_JD = 2451550.09766
+
+SOLAR_ECLIPSE_TYPES = [
+    (swe.ECL_TOTAL, 'total'),
+    (swe.ECL_ANNULAR_TOTAL, 'hybrid'),
+    (swe.ECL_ANNULAR, 'annular'),
+    (swe.ECL_PARTIAL, 'partial')
+]
+LUNAR_ECLIPSE_TYPES = [
+    (swe.ECL_TOTAL, 'total'),
+    (swe.ECL_PARTIAL, 'partial'),
+    (swe.ECL_PENUMBRAL, 'penumbral')
+]
+
+# 'rejected': (mtime,) of an EVENT_TABLE_PATH that was stale, or (None,)
+# if it was missing, on the last load-only attempt; an unchanged file is
+# not parsed again on every request
+EVENT_TABLE = {'table': None, 'rejected': None}
+EVENT_TABLE_LOCK = threading.Lock()
+
+
+def eclipse_type_name(flags, types):
+    for flag, name in types:
+        if flags & flag:
+            return name
+    return 'unknown'
+
+
+def find_lunation(seed_jd, target_elongation):
+    jd = seed_jd
+    for _ in range(RETURN_MAX_ITERATIONS):
+        sun = calc_position_exact(jd, swe.SUN)[0]
+        moon = calc_position_exact(jd, swe.MOON)[0]
+        elongation = moon[0] - sun[0] - target_elongation
+        correction = ((elongation + 180) % 360 - 180) / (moon[3] - sun[3])
+        jd -= correction
+        if abs(correction) < RETURN_TOLERANCE_DAYS:
+            break
+    return jd
+
+
+def build_event_table(from_year=EVENT_TABLE_FROM_YEAR, to_year=EVENT_TABLE_TO_YEAR):
+    start_jd = swe.julday(from_year, 1, 1, 0.0)
+    end_jd = swe.julday(to_year + 1, 1, 1, 0.0)
+
+    lunations = []
+    quarter = SYNODIC_MONTH / 4
+    n = math.floor((start_jd - REFERENCE_NEW_MOON_JD) / quarter)
+    while REFERENCE_NEW_MOON_JD + n * quarter < end_jd + quarter:
+        phase = n % 4
+        jd = find_lunation(REFERENCE_NEW_MOON_JD + n * quarter, phase * 90.0)
+        if start_jd <= jd < end_jd:
+            lunations.append([jd, phase])
+        n += 1
+
+    solar = []
+    jd = start_jd
+    while True:
+        flags, tret = swe.sol_eclipse_when_glob(jd, DEFAULT_CALC_FLAGS, 0, False)
+        if tret[0] >= end_jd:
+            break
+        # maximum, type, first contact, last contact
+        solar.append([tret[0], eclipse_type_name(flags, SOLAR_ECLIPSE_TYPES), tret[2], tret[3]])
+        jd = tret[0] + 1
+
+    lunar = []
+    jd = start_jd
+    while True:
+        flags, tret = swe.lun_eclipse_when(jd, DEFAULT_CALC_FLAGS, 0, False)
+        if tret[0] >= end_jd:
+            break
+        # maximum, type, penumbral begin, penumbral end
+        lunar.append([tret[0], eclipse_type_name(flags, LUNAR_ECLIPSE_TYPES), tret[6], tret[7]])
+        jd = tret[0] + 1
+
+    return {
+        'version': EVENT_TABLE_VERSION,
+        'fromYear': from_year,
+        'toYear': to_year,
+        'startJulianDay': start_jd,
+        'endJulianDay': end_jd,
+        'lunations': lunations,
+        'solarEclipses': solar,
+        'lunarEclipses': lunar
+    }
+
+
+class EventTable:
+    # Each event list is sorted by time, with a parallel list of Julian
+    # Days for bisect
+    __slots__ = ('from_year', 'to_year', 'start_jd', 'end_jd', 'events', 'times')
+
+    def __init__(self, data):
+        self.from_year = data['fromYear']
+        self.to_year = data['toYear']
+        self.start_jd = data['startJulianDay']
+        self.end_jd = data['endJulianDay']
+        self.events = {kind: data[kind] for kind in ('lunations', 'solarEclipses', 'lunarEclipses')}
+        self.times = {kind: [event[0] for event in events] for kind, events in self.events.items()}
+
+    def covers(self, start_jd, end_jd):
+        return self.start_jd <= start_jd and end_jd <= self.end_jd
+
+    def between(self, kind, start_jd, end_jd):
+        times = self.times[kind]
+        return self.events[kind][bisect.bisect_left(times, start_jd):bisect.bisect_left(times, end_jd)]
+
+
+def load_event_table(path=EVENT_TABLE_PATH, build=True):
+    # build=False only reads a current table from disk and returns None
+    # otherwise; building is left to the gunicorn master (when_ready), the
+    # image build or `python app.py`, so workers and requests never do it
+    if path and os.path.exists(path):
+        with open(path) as f:
+            data = json.load(f)
+        if (data.get('version') == EVENT_TABLE_VERSION and data['fromYear'] == EVENT_TABLE_FROM_YEAR
+                and data['toYear'] == EVENT_TABLE_TO_YEAR):
+            return data
+    if not build:
+        return None
+    started = time.perf_counter()
+    data = build_event_table()
+    print(f"EVENT TABLE: built {EVENT_TABLE_FROM_YEAR}-{EVENT_TABLE_TO_YEAR} in "
+          f"{time.perf_counter() - started:.1f}s")
+    if path:
+        try:
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"EVENT TABLE: could not persist to {path}: {e}")
+    return data
+
+
+def get_event_table(build=True):
+    if EVENT_TABLE['table'] is None:
+        mtime = os.path.getmtime(EVENT_TABLE_PATH) if os.path.exists(EVENT_TABLE_PATH) else None
+        if not build and EVENT_TABLE['rejected'] == (mtime,):
+            return None
+        with EVENT_TABLE_LOCK:
+            if EVENT_TABLE['table'] is None:
+                data = load_event_table(build=build)
+                if data is None:
+                    EVENT_TABLE['rejected'] = (mtime,)
+                    return None
+                EVENT_TABLE['table'] = EventTable(data)
+    return EVENT_TABLE['table']
+
+
+def parse_event_window(args, default_days=366):
+    start_jd = parse_julian_day(args['from']) if args.get('from') else UNIX_EPOCH_JD + time.time() / 86400.0
+    end_jd = parse_julian_day(args['to']) if args.get('to') else start_jd + default_days
+    return start_jd, end_jd
+
+
+def event_table_unavailable():
+    # Requests never build the table: that takes seconds under
+    # EVENT_TABLE_LOCK and would stall every other request behind it
+    return jsonify({
+        'error': 'event table not built',
+        'message': f'Build {EVENT_TABLE_PATH} first (gunicorn master or image build)'
+    }), 503
+
+
+def event_window_error(table):
+    return jsonify({
+        'error': f'Event table covers {table.from_year}-{table.to_year}',
+        'message': 'Requested range is outside the event table'
+    }), 400
+
+
+@app.route('/lunations', methods=['GET'])
+def lunations():
+    try:
+        table = get_event_table(build=False)
+        if table is None:
+            return event_table_unavailable()
+        start_jd, end_jd = parse_event_window(request.args, default_days=SYNODIC_MONTH * 3)
+        if not table.covers(start_jd, end_jd):
+            return event_window_error(table)
+        phases = request.args.get('phases')
+        wanted = {LUNATION_PHASES.index(p) for p in phases.split(',') if p in LUNATION_PHASES} \
+            if phases else set(range(4))
+
+        events = []
+        for jd, phase in table.between('lunations', start_jd, end_jd):
+            if phase not in wanted:
+                continue
+            longitude = normalize_degree(calc_position(jd, swe.MOON)[0][0])
+            events.append({
+                'phase': LUNATION_PHASES[phase],
+                'julianDay': jd,
+                'date': jd_to_iso(jd),
+                'moonLongitude': longitude,
+                'sign': get_zodiac_sign(longitude)
+            })
+
+        return jsonify({
+            'from': jd_to_iso(start_jd),
+            'to': jd_to_iso(end_jd),
+            'lunations': events
+        })
+
+    except Exception as e:
+        import traceback
+        print(f"LUNATIONS ERROR: {e}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': str(e),
+            'message': 'Lunation lookup failed',
+            'traceback': traceback.format_exc()
+        }), 500
+
+
+@app.route('/eclipses', methods=['GET'])
+def eclipses():
+    try:
+        table = get_event_table(build=False)
+        if table is None:
+            return event_table_unavailable()
+        start_jd, end_jd = parse_event_window(request.args, default_days=366 * 2)
+        if not table.covers(start_jd, end_jd):
+            return event_window_error(table)
+        kinds = request.args.get('kind', 'solar,lunar').split(',')
+
+        result = {'from': jd_to_iso(start_jd), 'to': jd_to_iso(end_jd)}
+        for kind, key in (('solar', 'solarEclipses'), ('lunar', 'lunarEclipses')):
+            if kind not in kinds:
+                continue
+            events = []
+            for jd, eclipse_type, begin_jd, end_contact_jd in table.between(key, start_jd, end_jd):
+                sun_longitude = normalize_degree(calc_position(jd, swe.SUN)[0][0])
+                longitude = sun_longitude if kind == 'solar' else normalize_degree(sun_longitude + 180)
+                events.append({
+                    'type': eclipse_type,
+                    'julianDay': jd,
+                    'maximum': jd_to_iso(jd),
+                    'begin': jd_to_iso(begin_jd) if begin_jd else None,
+                    'end': jd_to_iso(end_contact_jd) if end_contact_jd else None,
+                    'longitude': longitude,
+                    'sign': get_zodiac_sign(longitude)
+                })
+            result[key] = events
+
+        return jsonify(result)
+
+    except Exception as e:
+        import traceback
+        print(f"ECLIPSES ERROR: {e}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': str(e),
+            'message': 'Eclipse lookup failed',
+            'traceback': traceback.format_exc()
+        }), 500
+
+
+# ============================================
+# RISE / SET / TRANSIT & PLANETARY HOURS
+# Results depend only on the local day and the place, so they are cached
+# by (date, lat/lon tile): everyone within RISE_SET_TILE_DEGREES of the
+# same tile centre shares one computation.
+# ============================================
+RISE_SET_TILE_DEGREES = float(os.environ.get('RISE_SET_TILE_DEGREES', 0.1))
+RISE_SET_CACHE_SIZE = int(os.environ.get('RISE_SET_CACHE_SIZE', 4096))
+
+RISE_SET_EVENTS = [
+    ('rise', swe.CALC_RISE),
+    ('set', swe.CALC_SET),
+    ('transit', swe.CALC_MTRANSIT),
+    ('antiTransit', swe.CALC_ITRANSIT)
+]
+CHALDEAN_ORDER = ['Saturn', 'Jupiter', 'Mars', 'Sun', 'Venus', 'Mercury', 'Moon']
+# swe.day_of_week: 0 = Monday ... 6 = Sunday
+WEEKDAY_RULERS = ['Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn', 'Sun']
+
+
+def location_tile(latitude, longitude):
+    if RISE_SET_TILE_DEGREES <= 0:
+        return latitude, longitude
+    return (round(round(latitude / RISE_SET_TILE_DEGREES) * RISE_SET_TILE_DEGREES, 6),
+            round(round(longitude / RISE_SET_TILE_DEGREES) * RISE_SET_TILE_DEGREES, 6))
+
+
+def next_rise_trans(jd, body_id, event, geopos):
+    status, tret = swe.rise_trans(jd, body_id, event, geopos, 0.0, 0.0, DEFAULT_CALC_FLAGS)
+    return tret[0] if status == 0 else None
+
+
+def calculate_planetary_hours(date_str, sunrise, sunset, next_sunrise):
+    year, month, day = map(int, date_str.split('-'))
+    day_ruler = WEEKDAY_RULERS[swe.day_of_week(swe.julday(year, month, day, 12.0))]
+    first = CHALDEAN_ORDER.index(day_ruler)
+    hours = []
+    for is_day, start, end in ((True, sunrise, sunset), (False, sunset, next_sunrise)):
+        length = (end - start) / 12
+        for i in range(12):
+            number = len(hours)
+            hours.append({
+                'hour': number + 1,
+                'isDay': is_day,
+                'ruler': CHALDEAN_ORDER[(first + number) % 7],
+                'start': jd_to_iso(start + i * length),
+                'end': jd_to_iso(start + (i + 1) * length),
+                'minutes': length * 1440
+            })
+    return day_ruler, hours
+
+
+@functools.lru_cache(maxsize=RISE_SET_CACHE_SIZE)
+def calculate_rise_set(date_str, latitude, longitude):
+    geopos = (longitude, latitude, 0.0)
+    # Search from local mean midnight so events fall on the local day
+    start_jd = parse_julian_day(date_str) - longitude / 360.0
+
+    bodies = {}
+    for name, body_id in PLANETS.items():
+        try:
+            times = {key: next_rise_trans(start_jd, body_id, event, geopos) for key, event in RISE_SET_EVENTS}
+            bodies[name] = {key: jd_to_iso(event_jd) if event_jd else None for key, event_jd in times.items()}
+        except Exception as e:
+            print(f"Could not calculate rise/set for {name}: {e}")
+
+    sunrise = next_rise_trans(start_jd, swe.SUN, swe.CALC_RISE, geopos)
+    sunset = next_rise_trans(sunrise, swe.SUN, swe.CALC_SET, geopos) if sunrise else None
+    next_sunrise = next_rise_trans(sunset, swe.SUN, swe.CALC_RISE, geopos) if sunset else None
+
+    result = {
+        'date': date_str,
+        'latitude': latitude,
+        'longitude': longitude,
+        'bodies': bodies,
+        'dayLengthMinutes': (sunset - sunrise) * 1440 if sunset else None,
+        'dayRuler': None,
+        'planetaryHours': None
+    }
+    # No planetary hours where the Sun does not rise and set (polar day/night)
+    if next_sunrise:
+        result['dayRuler'], result['planetaryHours'] = calculate_planetary_hours(
+            date_str, sunrise, sunset, next_sunrise)
+    return result
+
+
+@app.route('/rise-set', methods=['GET'])
+def rise_set():
+    try:
+        args = request.args
+        date_str = args.get('date') or datetime.utcnow().strftime('%Y-%m-%d')
+        tile_lat, tile_lon = location_tile(float(args['latitude']), float(args['longitude']))
+        result = dict(calculate_rise_set(date_str, tile_lat, tile_lon))
+        result['tileDegrees'] = RISE_SET_TILE_DEGREES
+        return jsonify(result)
+
+    except Exception as e:
+        import traceback
+        print(f"RISE/SET ERROR: {e}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': str(e),
+            'message': 'Rise/set calculation failed',
+            'traceback': traceback.format_exc()
+        }), 500
+
+
+# ============================================
+# POSITIONS (daily-store backed)
+# Sign- and arcminute-level lookups for calendars and daily horoscopes.
+# precision=daily (default) reads the mmapped daily store; precision=full
+# or an instant outside the store goes to live calc_ut. An explicit
+# 'ephemeris' tier overrides both.
+# ============================================
+@app.route('/positions', methods=['GET'])
+def positions():
+    try:
+        args = request.args
+        date_str = args.get('date') or datetime.utcnow().strftime('%Y-%m-%d')
+        jd = parse_julian_day(date_str, args.get('time', '00:00'))
+        full_precision = args.get('precision', 'daily') == 'full'
+        tier = resolve_ephemeris_tier(args.get('ephemeris') or (None if full_precision else 'daily'),
+                                      exact=full_precision)
+
+        planets = []
+        tiers_used = set()
+        for name, body_id in PLANETS.items():
+            try:
+                position, used = tier_position(jd, body_id, tier)
+            except Exception as e:
+                print(f"Could not calculate {name}: {e}")
+                continue
+            longitude, latitude, distance, speed = position
+            planets.append(Body(name, normalize_degree(longitude), latitude, distance, speed,
+                                with_sign_data=False).to_compact_dict())
+            tiers_used.add(used)
+
+        return jsonify({
+            'date': date_str,
+            'time': args.get('time', '00:00'),
+            'julianDay': jd,
+            'precision': 'full' if full_precision else 'daily',
+            'ephemeris': tier_report(tier, tiers_used),
+            'planets': planets
+        })
+
+    except Exception as e:
+        import traceback
+        print(f"POSITIONS ERROR: {e}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': str(e),
+            'message': 'Position lookup failed',
+            'traceback': traceback.format_exc()
+        }), 500
+
+
+# ============================================
+# ASTROCARTOGRAPHY
+# Body positions and sidereal time are computed once for the birth
+# moment; the MC/IC lines are meridians and the ASC/DSC lines are traced
+# over a latitude vector for all bodies at once, from the semi-diurnal
+# arc cos H0 = -tan(lat) tan(dec). Lines are returned as polylines of
+# [longitude, latitude] pairs (GeoJSON order), split at the antimeridian.
+# ============================================
+ACG_BODIES = ['Sun', 'Moon', 'Mercury', 'Venus', 'Mars', 'Jupiter', 'Saturn',
+              'Uranus', 'Neptune', 'Pluto', 'Chiron', 'True North Node']
+ACG_ANGLES = ['MC', 'IC', 'ASC', 'DSC']
+ACG_MAX_LATITUDE = float(os.environ.get('ACG_MAX_LATITUDE', 80))
+ACG_DEFAULT_STEP = 1.0
+ACG_MIN_STEP = 0.1
+
+
+def wrap_longitude(lon):
+    return (lon + 180.0) % 360.0 - 180.0
+
+
+def split_polyline(lons, lats):
+    # Breaks a traced line where it crosses the antimeridian or leaves the
+    # valid range (NaN), so map clients do not draw it across the globe
+    polylines = []
+    current = []
+    previous = None
+    for lon, lat in zip(lons.tolist(), lats.tolist()):
+        if math.isnan(lon):
+            if len(current) > 1:
+                polylines.append(current)
+            current, previous = [], None
+            continue
+        if previous is not None and abs(lon - previous) > 180:
+            if len(current) > 1:
+                polylines.append(current)
+            current = []
+        current.append([round(lon, 4), round(lat, 4)])
+        previous = lon
+    if len(current) > 1:
+        polylines.append(current)
+    return polylines
+
+
+def calculate_astrocartography(jd, body_names=None, lat_step=ACG_DEFAULT_STEP, angles=None):
+    body_names = [name for name in (body_names or ACG_BODIES) if name in PLANETS]
+    angles = [angle for angle in (angles or ACG_ANGLES) if angle in ACG_ANGLES]
+
+    bodies = []
+    for name in body_names:
+        try:
+            position, _ = tier_position(jd, PLANETS[name], EXACT_EPHEMERIS_TIER)
+            bodies.append((name, position))
+        except Exception as e:
+            print(f"Could not calculate {name}: {e}")
+
+    obliquity = true_obliquity(jd)
+    gst = swe.sidtime(jd) * 15.0
+    ra, dec = ecliptic_to_equatorial([p[0] for _, p in bodies], [p[1] for _, p in bodies], obliquity)
+
+    latitudes = np.arange(-ACG_MAX_LATITUDE, ACG_MAX_LATITUDE + lat_step / 2, lat_step)
+    mc_lons = wrap_longitude(ra - gst)
+
+    # Semi-diurnal arcs for every (body, latitude); NaN where circumpolar
+    cos_h0 = -np.tan(np.radians(latitudes))[None, :] * np.tan(np.radians(dec))[:, None]
+    with np.errstate(invalid='ignore'):
+        h0 = np.degrees(np.arccos(np.where(np.abs(cos_h0) <= 1.0, cos_h0, np.nan)))
+    asc_lons = wrap_longitude(mc_lons[:, None] - h0)
+    dsc_lons = wrap_longitude(mc_lons[:, None] + h0)
+
+    lines = []
+    for i, (name, position) in enumerate(bodies):
+        meridian_lats = np.array([-ACG_MAX_LATITUDE, ACG_MAX_LATITUDE])
+        traced = {
+            'MC': np.full(2, mc_lons[i]),
+            'IC': np.full(2, wrap_longitude(mc_lons[i] + 180.0)),
+            'ASC': asc_lons[i],
+            'DSC': dsc_lons[i]
+        }
+        for angle in angles:
+            lats = meridian_lats if angle in ('MC', 'IC') else latitudes
+            lines.append({
+                'body': name,
+                'angle': angle,
+                'polylines': split_polyline(traced[angle], lats)
+            })
+
+    return {
+        'obliquity': obliquity,
+        'siderealTime': gst,
+        'bodies': [
+            {'name': name, 'longitude': normalize_degree(position[0]), 'latitude': position[1],
+             'rightAscension': float(ra[i]), 'declination': float(dec[i])}
+            for i, (name, position) in enumerate(bodies)
+        ],
+        'latitudeStep': lat_step,
+        'maxLatitude': ACG_MAX_LATITUDE,
+        'lines': lines
+    }
+
+
+@app.route('/astrocartography', methods=['POST'])
+def astrocartography():
+    try:
+        data = request.json
+        jd = parse_julian_day(data['birthDate'], data['time'])
+        lat_step = max(float(data.get('latitudeStep', ACG_DEFAULT_STEP)), ACG_MIN_STEP)
+
+        result = calculate_astrocartography(jd, data.get('bodies'), lat_step, data.get('angles'))
+        result['birthDate'] = data['birthDate']
+        result['birthTime'] = data['time']
+        result['julianDay'] = jd
+        result['calculatedAt'] = datetime.utcnow().isoformat() + 'Z'
+        return jsonify(result)
+
+    except Exception as e:
+        import traceback
+        print(f"ASTROCARTOGRAPHY ERROR: {e}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': str(e),
+            'message': 'Astrocartography calculation failed',
+            'traceback': traceback.format_exc()
+        }), 500
+
+
+# ============================================
+# RECTIFICATION SWEEP
+# Planets barely move across a birth day, so their positions are taken at
+# a few anchor instants and Hermite-interpolated for every step; only the
+# location-dependent pieces (houses, angles, Vertex, Parts, angle aspects)
+# are recomputed per step. Steps are streamed as NDJSON, one compact
+# object per line after a header line.
+# ============================================
+RECTIFICATION_ANCHOR_HOURS = float(os.environ.get('RECTIFICATION_ANCHOR_HOURS', 6))
+RECTIFICATION_MAX_STEPS = int(os.environ.get('RECTIFICATION_MAX_STEPS', 2880))
+
+
+class AnchorInterpolator:
+    # Positions of a set of bodies at evenly spaced anchor instants,
+    # interpolated to any instant inside [start_jd, end_jd]
+    __slots__ = ('start_jd', 'span', 'names', 'anchors')
+
+    def __init__(self, bodies, start_jd, end_jd, anchor_days, tier=None):
+        count = max(1, math.ceil((end_jd - start_jd) / anchor_days))
+        self.start_jd = start_jd
+        self.span = (end_jd - start_jd) / count or anchor_days
+        self.names = [name for name, _ in bodies]
+        jds = [start_jd + i * self.span for i in range(count + 1)]
+        positions = calculate_positions_batch(jds, bodies, tier=tier or resolve_ephemeris_tier(exact=True))
+        self.anchors = [positions[name] for name in self.names]
+
+    def longitudes(self, jd):
+        offset = (jd - self.start_jd) / self.span
+        i = min(max(int(offset), 0), len(self.anchors[0]) - 2) if len(self.anchors[0]) > 1 else 0
+        t = offset - i
+        result = {}
+        for name, anchors in zip(self.names, self.anchors):
+            if len(anchors) == 1:
+                result[name] = (anchors[0][0], anchors[0][3])
+                continue
+            before, after = anchors[i], anchors[i + 1]
+            speed = before[3] + (after[3] - before[3]) * t
+            result[name] = (hermite_longitude(before[0], before[3], after[0], after[3], t, self.span), speed)
+        return result
+
+
+def rectification_steps(birth_date, latitude, longitude, start_jd, end_jd, step_days, house_system='P',
+                        node_type='true', profile=DEFAULT_ASPECT_PROFILE):
+    bodies = progression_body_ids(node_type)
+    interpolator = AnchorInterpolator(bodies, start_jd, end_jd, RECTIFICATION_ANCHOR_HOURS / 24.0)
+    hsys = house_system.encode()
+    # Julian Days near 2.4e6 carry ~1e-10 day of rounding; the slack keeps
+    # an end time that is a whole number of steps away in the sweep
+    steps = int(math.floor((end_jd - start_jd) / step_days + 1e-6)) + 1
+
+    for n in range(steps):
+        jd = start_jd + n * step_days
+        cusps, ascmc = swe.houses_ex(jd, latitude, longitude, hsys)[:2]
+        asc_deg = normalize_degree(ascmc[0])
+        mc_deg = normalize_degree(ascmc[1])
+        positions = interpolator.longitudes(jd)
+        sun_lon = positions['Sun'][0]
+        moon_lon = positions['Moon'][0]
+        is_day_chart = normalize_degree(sun_lon - asc_deg) >= 180
+        pof_deg, pos_deg = calculate_lots(asc_deg, sun_lon, moon_lon, is_day_chart)
+
+        angles = (Body('Ascendant', asc_deg, with_sign_data=False),
+                  Body('Midheaven', mc_deg, with_sign_data=False))
+        angle_aspects = []
+        for name, (lon, speed) in positions.items():
+            body = Body(name, lon, speed=speed, with_sign_data=False)
+            for angle in angles:
+                aspect = calculate_aspect(body, angle, profile)
+                if aspect:
+                    angle_aspects.append([name, angle.name, aspect['aspect'], aspect['orb']])
+
+        seconds = int(round((jd - parse_julian_day(birth_date)) * 86400))
+        yield {
+            'time': f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}",
+            'julianDay': round(jd, 8),
+            'asc': round(asc_deg, 4),
+            'ascSign': get_zodiac_sign(asc_deg),
+            'mc': round(mc_deg, 4),
+            'mcSign': get_zodiac_sign(mc_deg),
+            'vertex': round(normalize_degree(ascmc[3]), 4),
+            'cusps': [round(normalize_degree(cusp), 4) for cusp in cusps[:12]],
+            'moon': round(moon_lon, 4),
+            'isDayChart': is_day_chart,
+            'partOfFortune': round(pof_deg, 4),
+            'partOfSpirit': round(pos_deg, 4),
+            'angleAspects': angle_aspects
+        }
+
+
+@app.route('/rectification', methods=['POST'])
+def rectification():
+    try:
+        data = request.json
+        birth_date = data['birthDate']
+        latitude = float(data['latitude'])
+        longitude = float(data['longitude'])
+        house_system = data.get('houseSystem', 'P')
+        if house_system not in HOUSE_SYSTEMS:
+            house_system = 'P'
+        profile = get_aspect_profile(data.get('orbProfile', 'default'))
+        start_jd = parse_julian_day(birth_date, data.get('fromTime', '00:00'))
+        end_jd = parse_julian_day(birth_date, data.get('toTime', '23:59'))
+        step_days = float(data.get('stepMinutes', 1)) / 1440.0
+
+        if step_days <= 0 or end_jd < start_jd:
+            raise ValueError("stepMinutes must be positive and toTime must not precede fromTime")
+        count = int(math.floor((end_jd - start_jd) / step_days + 1e-6)) + 1
+        if count > RECTIFICATION_MAX_STEPS:
+            raise ValueError(f"Too many steps ({count}), maximum is {RECTIFICATION_MAX_STEPS}")
+
+        header = {
+            'birthDate': birth_date,
+            'latitude': latitude,
+            'longitude': longitude,
+            'houseSystem': house_system,
+            'orbProfile': profile.name,
+            'steps': count,
+            'stepMinutes': step_days * 1440.0,
+            'anchorHours': RECTIFICATION_ANCHOR_HOURS
+        }
+        steps = rectification_steps(birth_date, latitude, longitude, start_jd, end_jd, step_days,
+                                    house_system, data.get('nodeType', 'true'), profile)
+
+        def generate():
+            yield json.dumps(header) + '\n'
+            for step in steps:
+                yield json.dumps(step, separators=(',', ':')) + '\n'
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+    except Exception as e:
+        import traceback
+        print(f"RECTIFICATION ERROR: {e}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': str(e),
+            'message': 'Rectification sweep failed',
+            'traceback': traceback.format_exc()
+        }), 500
+
+
+# ============================================
+# BULK TRANSITS (one sky, many natal charts)
+# The transit sky is computed once; natal longitudes for the whole user
+# base come from a local file under NATAL_STORE_DIR and are matched in
+# chunks of BULK_TRANSIT_CHUNK users with numpy. Hits stream as NDJSON,
+# one line per user with at least one aspect.
+#
+# Natal files are .npz (user_ids: (n,), points: (p,), longitudes: (n, p))
+# or .csv (user_id column followed by one column per point).
+# ============================================
+NATAL_STORE_DIR = os.environ.get(
+    'NATAL_STORE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'natal')
+)
+BULK_TRANSIT_CHUNK = int(os.environ.get('BULK_TRANSIT_CHUNK', 20000))
+
+
+@functools.lru_cache(maxsize=4)
+def _load_natal_store(path, mtime):
+    if path.endswith('.npz'):
+        with np.load(path, allow_pickle=False) as store:
+            user_ids = [str(user_id) for user_id in store['user_ids'].tolist()]
+            points = [str(point) for point in store['points'].tolist()]
+            longitudes = np.asarray(store['longitudes'], dtype=float)
+    else:
+        with open(path) as f:
+            points = f.readline().strip().split(',')[1:]
+        user_ids = np.loadtxt(path, delimiter=',', skiprows=1, usecols=0, dtype=str, ndmin=1).tolist()
+        longitudes = np.loadtxt(path, delimiter=',', skiprows=1, usecols=range(1, len(points) + 1), ndmin=2)
+    if longitudes.shape != (len(user_ids), len(points)):
+        raise ValueError(f"{path}: expected {len(user_ids)} x {len(points)} longitudes, got {longitudes.shape}")
+    return user_ids, points, longitudes % 360.0
+
+
+def load_natal_store(name):
+    if not name or os.path.basename(name) != name or not name.endswith(('.npz', '.csv')):
+        raise ValueError("file must be a .npz or .csv file name inside NATAL_STORE_DIR")
+    path = os.path.join(NATAL_STORE_DIR, name)
+    return _load_natal_store(path, os.path.getmtime(path))
+
+
+def bulk_transit_lines(sky_names, sky_longitudes, user_ids, points, longitudes, profile):
+    # Yields ready-encoded NDJSON lines; the per-hit work is vectorized and
+    # the JSON prefix of every (transit, natal, aspect) triple is built once
+    sky = np.asarray(sky_longitudes, dtype=float)
+    aspect_names = None
+    prefixes = None
+    for start in range(0, len(user_ids), BULK_TRANSIT_CHUNK):
+        chunk = longitudes[start:start + BULK_TRANSIT_CHUNK]
+        # (users, transit bodies, natal points)
+        separation = angular_separation(sky[None, :, None], chunk[:, None, :])
+        forward = (chunk[:, None, :] - sky[None, :, None]) % 360.0 if profile.directional else None
+        index, orb, aspect_names = profile.match_array(separation, sky_names, points, forward)
+        if prefixes is None:
+            prefixes = [json.dumps([t, p, a], separators=(',', ':'))[:-1] + ','
+                        for t in sky_names for p in points for a in aspect_names]
+
+        users, transits, natals = np.nonzero(index >= 0)
+        if not len(users):
+            continue
+        keys = ((transits * len(points) + natals) * len(aspect_names) + index[users, transits, natals]).tolist()
+        orbs = np.round(np.abs(orb[users, transits, natals]), 2).tolist()
+        bounds = np.flatnonzero(np.diff(users)) + 1
+        starts = [0] + bounds.tolist()
+        ends = bounds.tolist() + [len(users)]
+        for user, first, last in zip(users[starts].tolist(), starts, ends):
+            hits = ','.join(prefixes[keys[i]] + repr(orbs[i]) + ']' for i in range(first, last))
+            yield '{"user":' + json.dumps(user_ids[start + user]) + ',"hits":[' + hits + ']}\n'
+
+
+@app.route('/transits/bulk', methods=['POST'])
+def bulk_transits():
+    try:
+        data = request.json
+        jd = round_jd(parse_julian_day(data['date'], data.get('time', '00:00')))
+        profile = get_aspect_profile(data.get('orbProfile', 'default'))
+        user_ids, points, longitudes = load_natal_store(data.get('file'))
+
+        tier = resolve_ephemeris_tier(data.get('ephemeris'))
+        sky_names = []
+        sky_longitudes = []
+        tiers_used = set()
+        for name, body_id in progression_body_ids(data.get('nodeType', 'true')):
+            position, used = tier_position(jd, body_id, tier)
+            sky_names.append(name)
+            sky_longitudes.append(normalize_degree(position[0]))
+            tiers_used.add(used)
+
+        header = {
+            'date': data['date'],
+            'time': data.get('time', '00:00'),
+            'julianDay': jd,
+            'file': data['file'],
+            'users': len(user_ids),
+            'points': points,
+            'orbProfile': profile.name,
+            'ephemeris': tier_report(tier, tiers_used),
+            'sky': [{'name': name, 'fullDegree': lon, 'sign': get_zodiac_sign(lon)}
+                    for name, lon in zip(sky_names, sky_longitudes)]
+        }
+        lines = bulk_transit_lines(sky_names, sky_longitudes, user_ids, points, longitudes, profile)
+
+        def generate():
+            yield json.dumps(header) + '\n'
+            yield from lines
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+    except Exception as e:
+        import traceback
+        print(f"BULK TRANSITS ERROR: {e}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': str(e),
+            'message': 'Bulk transit calculation failed',
+            'traceback': traceback.format_exc()
+        }), 500
+
+
+# ============================================
+# TRANSIT HEATMAP
+# Transit longitudes for every step of a date range come from one batch
+# (T bodies x D steps); the separation to every natal point and the aspect
+# matching are array operations over the whole time axis. Each (transit,
+# natal, aspect) triple that occurs is returned as signed orb-to-exact
+# values: dense (one value or null per step) or sparse (step indices).
+# ============================================
+HEATMAP_MAX_STEPS = int(os.environ.get('HEATMAP_MAX_STEPS', 3660))
+
+
+def calculate_transit_heatmap(jd, start_jd, end_jd, step_days, latitude=None, longitude=None,
+                              node_type='true', profile=DEFAULT_ASPECT_PROFILE, dense=False, tier=None,
+                              house_system='P'):
+    bodies = progression_body_ids(node_type)
+    names = [name for name, _ in bodies]
+    tiers_used = set()
+
+    natal_positions = calculate_positions_batch([jd], bodies, tier=resolve_ephemeris_tier(exact=True),
+                                                tiers_used=tiers_used)
+    natal_names = list(names)
+    natal_longitudes = [normalize_degree(natal_positions[name][0][0]) for name in names]
+    if latitude is not None and longitude is not None:
+        ascmc = swe.houses_ex(jd, latitude, longitude, house_system.encode())[1]
+        natal_names += ['Ascendant', 'Midheaven']
+        natal_longitudes += [normalize_degree(ascmc[0]), normalize_degree(ascmc[1])]
+
+    count = int(math.floor((end_jd - start_jd) / step_days + 1e-6)) + 1
+    if count > HEATMAP_MAX_STEPS:
+        raise ValueError(f"Too many steps ({count}), maximum is {HEATMAP_MAX_STEPS}")
+    jds = [start_jd + i * step_days for i in range(count)]
+    tier = tier or resolve_ephemeris_tier(batch=True)
+    transit_positions = calculate_positions_batch(jds, bodies, tier=tier, tiers_used=tiers_used)
+    transits = np.array([[row[0] for row in transit_positions[name]] for name in names])
+
+    # (steps, transit bodies, natal points)
+    natal_array = np.array(natal_longitudes)[None, None, :]
+    separation = angular_separation(transits.T[:, :, None], natal_array)
+    forward = (natal_array - transits.T[:, :, None]) % 360.0 if profile.directional else None
+    index, orb, aspect_names = profile.match_array(separation, names, natal_names, forward)
+    orb = np.round(orb, 3)
+
+    hit_steps, hit_transits, hit_natals = np.nonzero(index >= 0)
+    triples = np.unique(np.stack([hit_transits, hit_natals, index[hit_steps, hit_transits, hit_natals]], axis=1),
+                        axis=0)
+
+    series = []
+    for t, p, a in triples.tolist():
+        hits = index[:, t, p] == a
+        entry = {
+            'transit': names[t],
+            'natal': natal_names[p],
+            'aspect': aspect_names[a],
+            'exactOrb': float(np.abs(orb[hits, t, p]).min())
+        }
+        if dense:
+            entry['orbs'] = np.where(hits, orb[:, t, p], np.nan).tolist()
+            entry['orbs'] = [None if math.isnan(value) else value for value in entry['orbs']]
+        else:
+            steps = np.flatnonzero(hits)
+            entry['steps'] = steps.tolist()
+            entry['orbs'] = orb[steps, t, p].tolist()
+        series.append(entry)
+
+    return {
+        'natal': [{'name': name, 'fullDegree': lon, 'sign': get_zodiac_sign(lon)}
+                  for name, lon in zip(natal_names, natal_longitudes)],
+        'dates': [jd_to_iso(step_jd) for step_jd in jds],
+        'stepDays': step_days,
+        'format': 'dense' if dense else 'sparse',
+        'series': series,
+        'ephemeris': tier_report(tier, tiers_used)
+    }
+
+
+@app.route('/transits/heatmap', methods=['POST'])
+def transit_heatmap():
+    try:
+        data = request.json
+        jd = parse_julian_day(data['birthDate'], data['time'])
+        start_jd = parse_julian_day(data['fromDate'])
+        end_jd = parse_julian_day(data['toDate'])
+        step_days = float(data.get('stepDays', 1))
+        if step_days <= 0 or end_jd < start_jd:
+            raise ValueError("stepDays must be positive and toDate must not precede fromDate")
+        latitude = float(data['latitude']) if data.get('latitude') is not None else None
+        longitude = float(data['longitude']) if data.get('longitude') is not None else None
+        house_system = data.get('houseSystem', 'P')
+        if house_system not in HOUSE_SYSTEMS:
+            house_system = 'P'
+        profile = get_aspect_profile(data.get('orbProfile', 'default'))
+        tier = resolve_ephemeris_tier(data.get('ephemeris'), bool(data.get('exact', False)), batch=True)
+
+        result = calculate_transit_heatmap(jd, start_jd, end_jd, step_days, latitude, longitude,
+                                           data.get('nodeType', 'true'), profile,
+                                           data.get('format', 'sparse') == 'dense', tier, house_system)
+        result['houseSystem'] = house_system
+        result['birthDate'] = data['birthDate']
+        result['birthTime'] = data['time']
+        result['orbProfile'] = profile.name
+        result['calculatedAt'] = datetime.utcnow().isoformat() + 'Z'
+        return jsonify(result)
+
+    except Exception as e:
+        import traceback
+        print(f"HEATMAP ERROR: {e}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': str(e),
+            'message': 'Transit heatmap calculation failed',
+            'traceback': traceback.format_exc()
+        }), 500
+
+
+# ============================================
+# ELECTIONAL SEARCH
+# Constraints are evaluated along the range with adaptive steps: each
+# one reports, next to its truth value, how long it is guaranteed to keep
+# that value given the bodies' maximum speeds (and accelerations for
+# stations). The search skips ahead by that horizon, so it moves in large
+# strides far from any boundary and slows down only near one; every
+# state change is then bisected down to the requested resolution. While a
+# body involved in a constraint is near a station (|speed| below
+# ELECTION_STATION_FRACTION of its maximum) the horizon is also capped at
+# ELECTION_STATION_HORIZON_DAYS, so a station cannot be stepped over.
+#
+# Constraint types:
+#   {"type": "retrograde", "body": "Mercury", "value": false}
+#   {"type": "sign", "body": "Moon", "signs": ["Taurus", "Cancer"]}
+#   {"type": "aspect", "body1": "Venus", "body2": "Jupiter", "aspect": "trine", "orb": 3}
+#   {"type": "voidOfCourse", "value": false}
+# ============================================
+ELECTION_MAX_SPEED = {
+    'Sun': 1.1, 'Moon': 16.0, 'Mercury': 2.4, 'Venus': 1.4, 'Mars': 0.9, 'Jupiter': 0.27,
+    'Saturn': 0.15, 'Uranus': 0.08, 'Neptune': 0.05, 'Pluto': 0.05, 'Chiron': 0.16, 'North Node': 0.3
+}
+ELECTION_MAX_ACCELERATION = {
+    'Sun': 0.001, 'Moon': 0.6, 'Mercury': 0.22, 'Venus': 0.05, 'Mars': 0.02, 'Jupiter': 0.005,
+    'Saturn': 0.003, 'Uranus': 0.012, 'Neptune': 0.015, 'Pluto': 0.001, 'Chiron': 0.003, 'North Node': 0.07
+}
+ELECTION_STATION_FRACTION = 0.1
+ELECTION_STATION_HORIZON_DAYS = 0.25
+VOC_PLANETS = ['Sun', 'Mercury', 'Venus', 'Mars', 'Jupiter', 'Saturn']
+ELECTION_MAX_DAYS = int(os.environ.get('ELECTION_MAX_DAYS', 366))
+ELECTION_MAX_EVALUATIONS = int(os.environ.get('ELECTION_MAX_EVALUATIONS', 200000))
+ELECTION_DEFAULT_RESOLUTION_MINUTES = 5
+
+
+class ElectionSearch:
+    def __init__(self, constraints, node_type='true', profile=DEFAULT_ASPECT_PROFILE, tier=None):
+        self.bodies = dict(progression_body_ids(node_type))
+        self.profile = profile
+        self.tier = tier or resolve_ephemeris_tier(batch=True)
+        self.tiers_used = set()
+        self.evaluations = 0
+        self.stationary = False
+        self.checks = [self._compile(constraint) for constraint in constraints]
+        self.voc_orbs = [
+            (data['angle'], float(orbs[0, k]))
+            for _, data, orbs, allowed in profile.orb_matrices(['Moon'], VOC_PLANETS)
+            for k in range(len(VOC_PLANETS)) if allowed[0, k] and not data.get('forward')
+        ]
+
+    def _body(self, name):
+        if name not in self.bodies:
+            raise ValueError(f"Unknown body '{name}', expected one of {list(self.bodies)}")
+        return name
+
+    def _compile(self, constraint):
+        kind = constraint.get('type')
+        if kind == 'retrograde':
+            return functools.partial(self._retrograde, self._body(constraint['body']),
+                                     bool(constraint.get('value', True)))
+        if kind == 'sign':
+            signs = constraint.get('signs') or [constraint['sign']]
+            if any(sign not in SIGN_INDEX for sign in signs):
+                raise ValueError(f"Unknown sign in {signs}")
+            return functools.partial(self._sign, self._body(constraint['body']), frozenset(signs))
+        if kind == 'aspect':
+            body1 = self._body(constraint['body1'])
+            body2 = self._body(constraint['body2'])
+            aspect_name = constraint['aspect']
+            if aspect_name not in ASPECTS:
+                raise ValueError(f"Unknown aspect '{aspect_name}'")
+            data = ASPECTS[aspect_name]
+            default_orb = data['orb_lights'] if body1 in LIGHTS or body2 in LIGHTS else data['orb_planets']
+            return functools.partial(self._aspect, body1, body2, data['angle'],
+                                     float(constraint.get('orb', default_orb)))
+        if kind == 'voidOfCourse':
+            return functools.partial(self._void_of_course, bool(constraint.get('value', True)))
+        raise ValueError(f"Unknown constraint type '{kind}'")
+
+    def _position(self, positions, jd, name):
+        if name not in positions:
+            position, used = tier_position(jd, self.bodies[name], self.tier)
+            positions[name] = (normalize_degree(position[0]), position[3])
+            self.tiers_used.add(used)
+            if abs(position[3]) < ELECTION_STATION_FRACTION * ELECTION_MAX_SPEED[name]:
+                self.stationary = True
+        return positions[name]
+
+    # Each check returns (satisfied, days its value is guaranteed to hold)
+    def _retrograde(self, name, value, jd, positions):
+        speed = self._position(positions, jd, name)[1]
+        return (speed < 0) == value, abs(speed) / ELECTION_MAX_ACCELERATION[name]
+
+    def _sign(self, name, signs, jd, positions):
+        lon = self._position(positions, jd, name)[0]
+        to_boundary = min(lon % 30.0, 30.0 - lon % 30.0)
+        return SIGNS[int(lon // 30) % 12] in signs, to_boundary / ELECTION_MAX_SPEED[name]
+
+    def _aspect(self, name1, name2, angle, orb, jd, positions):
+        separation = angular_separation(self._position(positions, jd, name1)[0],
+                                        self._position(positions, jd, name2)[0])
+        distance = abs(separation - angle)
+        return distance <= orb, abs(distance - orb) / (ELECTION_MAX_SPEED[name1] + ELECTION_MAX_SPEED[name2])
+
+    def _void_of_course(self, value, jd, positions):
+        moon_lon, moon_speed = self._position(positions, jd, 'Moon')
+        moon = Body('Moon', moon_lon, speed=moon_speed, with_sign_data=False)
+        aspects = []
+        horizon = (30.0 - moon_lon % 30.0) / ELECTION_MAX_SPEED['Moon']
+        for name in VOC_PLANETS:
+            lon, speed = self._position(positions, jd, name)
+            aspect = calculate_aspect(moon, Body(name, lon, speed=speed, with_sign_data=False), self.profile)
+            if aspect:
+                aspects.append({'planet1': 'Moon', 'planet2': name, **aspect})
+            separation = angular_separation(moon_lon, lon)
+            rate = ELECTION_MAX_SPEED['Moon'] + ELECTION_MAX_SPEED[name]
+            for angle, orb in self.voc_orbs:
+                distance = abs(separation - angle)
+                horizon = min(horizon, distance / rate, abs(distance - orb) / rate)
+        void = calculate_void_of_course_moon(moon, [], aspects)
+        # The orb-versus-distance-to-ingress comparison can also flip
+        for aspect in aspects:
+            if aspect['is_applying']:
+                rate = 2 * ELECTION_MAX_SPEED['Moon'] + ELECTION_MAX_SPEED[aspect['planet2']]
+                horizon = min(horizon, abs(aspect['orb'] - void['degrees_to_sign_change']) / rate)
+        return void['is_void_of_course'] == value, horizon
+
+    def state(self, jd):
+        self.evaluations += 1
+        if self.evaluations > ELECTION_MAX_EVALUATIONS:
+            raise ValueError(f"Search exceeded {ELECTION_MAX_EVALUATIONS} evaluations; narrow the range")
+        positions = {}
+        self.stationary = False
+        results = [check(jd, positions) for check in self.checks]
+        if all(ok for ok, _ in results):
+            satisfied, horizon = True, min(horizon for _, horizon in results)
+        else:
+            # Stays unsatisfied as long as any failing constraint keeps failing
+            satisfied, horizon = False, max(horizon for ok, horizon in results if not ok)
+        if self.stationary:
+            horizon = min(horizon, ELECTION_STATION_HORIZON_DAYS)
+        return satisfied, horizon
+
+    def refine(self, low, high, low_state, resolution):
+        while high - low > resolution:
+            middle = (low + high) / 2
+            if self.state(middle)[0] == low_state:
+                low = middle
+            else:
+                high = middle
+        return high
+
+    def windows(self, start_jd, end_jd, resolution):
+        windows = []
+        jd = start_jd
+        satisfied, horizon = self.state(jd)
+        window_start = jd if satisfied else None
+        while jd < end_jd:
+            next_jd = min(jd + max(horizon, resolution), end_jd)
+            next_satisfied, next_horizon = self.state(next_jd)
+            if next_satisfied != satisfied:
+                change = self.refine(jd, next_jd, satisfied, resolution)
+                if next_satisfied:
+                    window_start = change
+                else:
+                    windows.append((window_start, change))
+                    window_start = None
+            jd, satisfied, horizon = next_jd, next_satisfied, next_horizon
+        if window_start is not None:
+            windows.append((window_start, end_jd))
+        return windows
+
+
+@app.route('/election', methods=['POST'])
+def election():
+    try:
+        data = request.json
+        start_jd = parse_julian_day(data['fromDate'], data.get('fromTime', '00:00'))
+        end_jd = parse_julian_day(data['toDate'], data.get('toTime', '00:00'))
+        if end_jd <= start_jd or end_jd - start_jd > ELECTION_MAX_DAYS:
+            raise ValueError(f"toDate must follow fromDate by at most {ELECTION_MAX_DAYS} days")
+        if not data.get('constraints'):
+            raise ValueError("At least one constraint is required")
+        resolution = float(data.get('resolutionMinutes', ELECTION_DEFAULT_RESOLUTION_MINUTES)) / 1440.0
+        if resolution <= 0:
+            raise ValueError("resolutionMinutes must be positive")
+        profile = get_aspect_profile(data.get('orbProfile', 'default'))
+        tier = resolve_ephemeris_tier(data.get('ephemeris'), bool(data.get('exact', False)), batch=True)
+
+        search = ElectionSearch(data['constraints'], data.get('nodeType', 'true'), profile, tier)
+        windows = search.windows(start_jd, end_jd, resolution)
+
+        return jsonify({
+            'from': jd_to_iso(start_jd),
+            'to': jd_to_iso(end_jd),
+            'constraints': data['constraints'],
+            'resolutionMinutes': resolution * 1440.0,
+            'windows': [
+                {'start': jd_to_iso(window_start), 'end': jd_to_iso(window_end),
+                 'startJulianDay': window_start, 'endJulianDay': window_end,
+                 'durationHours': round((window_end - window_start) * 24, 3)}
+                for window_start, window_end in windows
+            ],
+            'evaluations': search.evaluations,
+            'ephemeris': tier_report(tier, search.tiers_used),
+            'calculatedAt': datetime.utcnow().isoformat() + 'Z'
+        })
+
+    except Exception as e:
+        import traceback
+        print(f"ELECTION ERROR: {e}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': str(e),
+            'message': 'Electional search failed',
+            'traceback': traceback.format_exc()
+        }), 500
+
+
+# ============================================
+# MIDPOINTS & HARMONICS
+# All near midpoints of the aspect bodies (and the angles when a location
+# is given) are folded onto a dial (90 degrees for the hard aspects, 45 or
+# 22.5 for the finer Uranian series) and sorted once; planetary pictures
+# A = B/C are then found by a binary-search sweep of each point's orb
+# window over the sorted dial, with the array extended by one dial width
+# on each side so windows wrap around 0. Harmonic-N charts multiply every
+# longitude by N and reuse the profile's vectorized aspect matching.
+# ============================================
+MIDPOINT_DIALS = (360.0, 180.0, 90.0, 45.0, 22.5)
+MIDPOINT_DEFAULT_DIAL = 90.0
+MIDPOINT_DEFAULT_ORB = 1.5
+HARMONIC_MAX = int(os.environ.get('HARMONIC_MAX', 360))
+
+
+def near_midpoints(longitudes):
+    # Upper-triangle pairs (i, j) and the midpoint on the shorter arc
+    first, second = np.triu_indices(len(longitudes), k=1)
+    a = longitudes[first]
+    b = longitudes[second]
+    delta = (b - a + 180.0) % 360.0 - 180.0
+    return first, second, (a + delta / 2.0) % 360.0
+
+
+def dial_window_sweep(sorted_positions, centers, orb, dial):
+    # Index ranges into sorted_positions (extended by one dial on each
+    # side) of the values within orb of each center, so a window that
+    # crosses 0 or the dial width keeps its wrapped neighbours
+    extended = np.concatenate([sorted_positions - dial, sorted_positions, sorted_positions + dial])
+    lows = np.searchsorted(extended, centers - orb, side='left')
+    highs = np.searchsorted(extended, centers + orb, side='right')
+    return extended, lows, highs
+
+
+def midpoint_body_ids(node_type='true'):
+    # The chart's aspect bodies (ASPECT_PLANETS) as ephemeris ids; Black
+    # Moon Lilith is the mean lunar apogee
+    node_name = 'Mean North Node' if node_type == 'mean' else 'True North Node'
+    ids = dict(PLANETS, **{'North Node': PLANETS[node_name], 'Black Moon Lilith': PLANETS['Mean Lilith']})
+    return [(name, ids[name]) for name in ASPECT_PLANETS]
+
+
+def calculate_midpoints(names, longitudes, dial=MIDPOINT_DEFAULT_DIAL, orb=MIDPOINT_DEFAULT_ORB,
+                        include_midpoint_pairs=False):
+    longitudes = np.asarray(longitudes, dtype=float)
+    count = len(names)
+    first, second, midpoints = near_midpoints(longitudes)
+    folded = midpoints % dial
+    order = np.argsort(folded, kind='stable')
+    sorted_folded = folded[order]
+    pairs = len(order)
+
+    pictures = []
+    extended, lows, highs = dial_window_sweep(sorted_folded, longitudes % dial, orb, dial)
+    for point, (low, high) in enumerate(zip(lows.tolist(), highs.tolist())):
+        for position in range(low, high):
+            k = order[position % pairs]
+            if first[k] == point or second[k] == point:
+                continue
+            pictures.append({
+                'point': names[point],
+                'midpoint': [names[first[k]], names[second[k]]],
+                'midpointDegree': round(float(midpoints[k]), 4),
+                'orb': round(float(longitudes[point] % dial - extended[position]), 4)
+            })
+    pictures.sort(key=lambda x: (x['point'], abs(x['orb'])))
+
+    result = {
+        'dial': dial,
+        'orb': orb,
+        'midpoints': [
+            {'pair': [names[first[k]], names[second[k]]], 'fullDegree': round(float(midpoints[k]), 4),
+             'sign': get_zodiac_sign(float(midpoints[k])), 'dialDegree': round(float(folded[k]), 4)}
+            for k in order.tolist()
+        ],
+        'pictures': pictures,
+        'trees': {
+            name: ['/'.join(picture['midpoint']) for picture in pictures if picture['point'] == name]
+            for name in names
+        }
+    }
+
+    if include_midpoint_pairs:
+        # A/B = C/D: each midpoint only looks ahead within one dial width,
+        # so every pair is reported once
+        midpoint_pairs = []
+        extended, lows, highs = dial_window_sweep(sorted_folded, sorted_folded, orb, dial)
+        for i, high in enumerate(highs.tolist()):
+            k = order[i]
+            for position in range(pairs + i + 1, min(high, 2 * pairs + i)):
+                other = order[position % pairs]
+                if {first[k], second[k]} & {first[other], second[other]}:
+                    continue
+                midpoint_pairs.append({
+                    'midpoint1': [names[first[k]], names[second[k]]],
+                    'midpoint2': [names[first[other]], names[second[other]]],
+                    'orb': round(float(extended[position] - sorted_folded[i]), 4)
+                })
+        midpoint_pairs.sort(key=lambda x: abs(x['orb']))
+        result['midpointPairs'] = midpoint_pairs
+
+    return result
+
+
+def calculate_harmonic_chart(names, longitudes, harmonic, profile=DEFAULT_ASPECT_PROFILE):
+    harmonic_longitudes = (np.asarray(longitudes, dtype=float) * harmonic) % 360.0
+    separation = angular_separation(harmonic_longitudes[:, None], harmonic_longitudes[None, :])
+    forward = (harmonic_longitudes[None, :] - harmonic_longitudes[:, None]) % 360.0 if profile.directional else None
+    index, orb, aspect_names = profile.match_array(separation, names, names, forward)
+    # Symmetric aspects once per pair; directional ones (row casts onto
+    # column) in both directions
+    directional = np.isin(index, [k for k, name in enumerate(aspect_names)
+                                  if name in {entry[3] for entry in profile.directional}])
+    hits = (np.triu(index >= 0, k=1) & ~directional) | (directional & ~np.eye(len(names), dtype=bool))
+    first, second = np.nonzero(hits)
+
+    aspects = []
+    for i, j in zip(first.tolist(), second.tolist()):
+        aspect = {'planet1': names[i], 'planet2': names[j], 'aspect': aspect_names[index[i, j]],
+                  'orb': round(abs(float(orb[i, j])), 2)}
+        if directional[i, j]:
+            aspect['aspecting'] = names[i]
+        aspects.append(aspect)
+    aspects.sort(key=lambda x: x['orb'])
+    return {
+        'harmonic': harmonic,
+        'positions': [{'name': name, 'fullDegree': round(lon, 4), 'degreeInSign': round(lon % 30.0, 4),
+                       'sign': get_zodiac_sign(lon)}
+                      for name, lon in zip(names, harmonic_longitudes.tolist())],
+        'aspects': aspects
+    }
+
+
+@app.route('/midpoints', methods=['POST'])
+def midpoints():
+    try:
+        data = request.json
+        jd = parse_julian_day(data['birthDate'], data['time'])
+        dial = float(data.get('dial', MIDPOINT_DEFAULT_DIAL))
+        if dial not in MIDPOINT_DIALS:
+            dial = MIDPOINT_DEFAULT_DIAL
+        orb = float(data.get('orb', MIDPOINT_DEFAULT_ORB))
+        if orb <= 0 or orb >= dial / 2:
+            raise ValueError(f"orb must be positive and less than half the dial ({dial / 2})")
+        harmonics = [int(n) for n in data.get('harmonics', [])]
+        if any(n < 1 or n > HARMONIC_MAX for n in harmonics):
+            raise ValueError(f"harmonics must be between 1 and {HARMONIC_MAX}")
+        house_system = data.get('houseSystem', 'P')
+        if house_system not in HOUSE_SYSTEMS:
+            house_system = 'P'
+        profile = get_aspect_profile(data.get('orbProfile', 'default'))
+        tier = resolve_ephemeris_tier(data.get('ephemeris'), bool(data.get('exact', False)))
+
+        tiers_used = set()
+        bodies = midpoint_body_ids(data.get('nodeType', 'true'))
+        positions = calculate_positions_batch([jd], bodies, tier=tier, tiers_used=tiers_used)
+        names = [name for name, _ in bodies]
+        longitudes = [normalize_degree(positions[name][0][0]) for name in names]
+        if data.get('latitude') is not None and data.get('longitude') is not None:
+            ascmc = swe.houses_ex(jd, float(data['latitude']), float(data['longitude']), house_system.encode())[1]
+            names += ['Ascendant', 'Midheaven']
+            longitudes += [normalize_degree(ascmc[0]), normalize_degree(ascmc[1])]
+        if data.get('ariesPoint', False):
+            names.append('Aries Point')
+            longitudes.append(0.0)
+
+        result = calculate_midpoints(names, longitudes, dial, orb, bool(data.get('includeMidpointPairs', False)))
+        result['points'] = [{'name': name, 'fullDegree': lon, 'sign': get_zodiac_sign(lon),
+                             'dialDegree': round(lon % dial, 4)}
+                            for name, lon in zip(names, longitudes)]
+        result['harmonics'] = [calculate_harmonic_chart(names, longitudes, n, profile) for n in harmonics]
+        result['birthDate'] = data['birthDate']
+        result['birthTime'] = data['time']
+        result['julianDay'] = jd
+        result['houseSystem'] = house_system
+        result['orbProfile'] = profile.name
+        result['ephemeris'] = tier_report(tier, tiers_used)
+        result['calculatedAt'] = datetime.utcnow().isoformat() + 'Z'
+        return jsonify(result)
+
+    except Exception as e:
+        import traceback
+        print(f"MIDPOINTS ERROR: {e}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': str(e),
+            'message': 'Midpoint calculation failed',
+            'traceback': traceback.format_exc()
+        }), 500
+
+
+if __name__ == '__main__':
+    port = int(os.environ.get('PORT', 8080))
+    init_worker()
+    get_event_table()
+    app.run(host='0.0.0.0', port=port, debug=True)
@@ -0,0 +1,89 @@
+"""Measure latency and positional error of each ephemeris tier.
+
+Usage: python bench_tiers.py [samples] [from_year] [to_year]
+
+For every tier in app.EPHEMERIS_TIERS, computes all PLANETS at random
+instants across the range (default: the daily store span, 1800-2200)
+one at a time and as one batch, and compares longitudes against the
+'swiss' tier. Prints per-position latency and the worst longitude
+error per tier, with the body it occurred for, and exits non-zero when a
+tier exceeds its documented bound (app.CHEBYSHEV_MAX_ERROR for the
+Chebyshev tier).
+"""
+import random
+import sys
+import time
+
+import app
+
+ERROR_BOUNDS = {'chebyshev': app.CHEBYSHEV_MAX_ERROR}
+
+
+def reference_positions(jds):
+    return {
+        name: [app.tier_position(jd, body, 'swiss')[0] for jd in jds]
+        for name, body in app.PLANETS.items()
+    }
+
+
+def single_latency(tier, jds):
+    app._cached_calc_ut.cache_clear()
+    started = time.perf_counter()
+    count = 0
+    for jd in jds:
+        for body in app.PLANETS.values():
+            app.tier_position(jd, body, tier)
+            count += 1
+    return (time.perf_counter() - started) / count * 1e6
+
+
+def batch_latency(tier, jds):
+    app._cached_calc_ut.cache_clear()
+    started = time.perf_counter()
+    positions = app.calculate_positions_batch(jds, list(app.PLANETS.items()), tier=tier)
+    return (time.perf_counter() - started) / (len(jds) * len(app.PLANETS)) * 1e6, positions
+
+
+def max_error(positions, reference):
+    worst = (0.0, None)
+    for name, rows in positions.items():
+        for row, ref in zip(rows, reference[name]):
+            error = abs((row[0] - ref[0] + 180.0) % 360.0 - 180.0)
+            if error > worst[0]:
+                worst = (error, name)
+    return worst
+
+
+def main():
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    from_year = int(sys.argv[2]) if len(sys.argv) > 2 else app.DAILY_STORE_FROM_YEAR
+    to_year = int(sys.argv[3]) if len(sys.argv) > 3 else app.DAILY_STORE_TO_YEAR
+    start_jd = app.swe.julday(from_year, 1, 1, 0.0)
+    end_jd = app.swe.julday(to_year, 12, 31, 0.0)
+
+    rng = random.Random(42)
+    jds = sorted(rng.uniform(start_jd, end_jd) for _ in range(samples))
+    reference = reference_positions(jds)
+    store = app.get_daily_store()
+    print(f"{samples} instants x {len(app.PLANETS)} bodies, {from_year}-{to_year}; "
+          f"daily store: {store.path if store else 'not built (daily falls back to live)'}")
+    print(f"{'tier':<10} {'single us':>10} {'batch us':>10} {'max err deg':>12}  worst body")
+
+    failures = []
+    for tier in app.EPHEMERIS_TIERS:
+        # First pass builds lazy state (Chebyshev segments, page cache)
+        batch_latency(tier, jds)
+        single = single_latency(tier, jds)
+        batch, positions = batch_latency(tier, jds)
+        error, body = max_error(positions, reference)
+        print(f"{tier:<10} {single:>10.2f} {batch:>10.2f} {error:>12.2e}  {body or '-'}")
+        if tier in ERROR_BOUNDS and error > ERROR_BOUNDS[tier]:
+            failures.append(f"{tier}: {error:.2e} deg for {body} exceeds {ERROR_BOUNDS[tier]:.2e}")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""Measure per-worker memory and first-request latency across a gunicorn fleet.
+
+Usage: python bench_workers.py [workers] [requests]
+
+Runs the fleet twice, with and without PRELOAD_EPHEMERIS, and prints the
+RSS/PSS of every worker plus the latency of the first /calculate it served.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+PORT = int(os.environ.get('BENCH_PORT', 18080))
+CHART = {'birthDate': '1990-05-15', 'time': '14:30', 'latitude': 40.7128, 'longitude': -74.006}
+
+
+def wait_for_port(timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{PORT}/worker-stats', timeout=1)
+            return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def post_chart():
+    req = urllib.request.Request(
+        f'http://127.0.0.1:{PORT}/calculate',
+        data=json.dumps(CHART).encode(),
+        headers={'Content-Type': 'application/json'}
+    )
+    urllib.request.urlopen(req, timeout=30).read()
+
+
+def worker_stats():
+    with urllib.request.urlopen(f'http://127.0.0.1:{PORT}/worker-stats', timeout=5) as resp:
+        return json.load(resp)
+
+
+def run_fleet(workers, requests, preload):
+    env = dict(os.environ, PORT=str(PORT), WEB_CONCURRENCY=str(workers),
+               PRELOAD_EPHEMERIS='1' if preload else '0')
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        if not wait_for_port():
+            raise RuntimeError('gunicorn did not come up')
+        stats = {}
+        for _ in range(requests):
+            post_chart()
+            data = worker_stats()
+            stats[data['pid']] = data
+        return stats
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def summarize(label, stats):
+    print(f"\n{label}: {len(stats)} worker(s) observed")
+    print(f"{'pid':>8} {'rss_kb':>8} {'pss_kb':>8} {'first_ms':>9}")
+    for pid, data in sorted(stats.items()):
+        memory = data['memory']
+        print(f"{pid:>8} {memory.get('rss_kb', '-'):>8} {memory.get('pss_kb', '-'):>8} "
+              f"{data['first_request_ms'] or 0:>9.2f}")
+    if stats:
+        pss = [d['memory'].get('pss_kb', 0) for d in stats.values()]
+        first = [d['first_request_ms'] or 0 for d in stats.values()]
+        print(f"mean pss_kb={sum(pss) / len(pss):.0f} mean first_request_ms={sum(first) / len(first):.2f}")
+
+
+if __name__ == '__main__':
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else workers * 10
+    for preload in (False, True):
+        summarize('preload' if preload else 'no preload', run_fleet(workers, requests, preload))
@@ -0,0 +1,27 @@
+"""Build the memory-mapped daily ephemeris store read by /positions.
+
+Usage: python build_ephemeris_store.py [from_year] [to_year] [path]
+
+Defaults come from DAILY_STORE_FROM_YEAR, DAILY_STORE_TO_YEAR and
+DAILY_STORE_PATH (1800-2200, ephemeris_daily.bin next to app.py). Workers
+pick the file up on start; without it they fall back to live calc_ut.
+"""
+import sys
+import time
+
+import app
+
+
+def main():
+    from_year = int(sys.argv[1]) if len(sys.argv) > 1 else app.DAILY_STORE_FROM_YEAR
+    to_year = int(sys.argv[2]) if len(sys.argv) > 2 else app.DAILY_STORE_TO_YEAR
+    path = sys.argv[3] if len(sys.argv) > 3 else app.DAILY_STORE_PATH
+
+    started = time.perf_counter()
+    info = app.build_daily_store(path, from_year, to_year)
+    print(f"wrote {info['path']}: {info['bodies']} bodies x {info['days']} days, "
+          f"{info['bytes'] / 1e6:.1f} MB in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
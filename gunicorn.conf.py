@@ -0,0 +1,22 @@
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+# Load app.py once in the master; it reads the ephemeris files into the OS
+# page cache so workers opening their own swisseph handles start warm.
+preload_app = os.environ.get('PRELOAD_EPHEMERIS', '1') == '1'
+
+
+def when_ready(server):
+    # Build (or load) the lunation/eclipse table once, before any worker
+    # is forked; workers only load it during warm-up
+    from app import get_event_table
+    get_event_table()
+
+
+def post_fork(server, worker):
+    from app import init_worker
+    init_worker()
@@ -0,0 +1,29 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# app reads its configuration at import time
+_TMP = tempfile.mkdtemp(prefix='ephemeris-tests-')
+os.environ.setdefault('WARMUP_ENABLED', '0')
+os.environ.setdefault('EVENT_TABLE_FROM_YEAR', '2020')
+os.environ.setdefault('EVENT_TABLE_TO_YEAR', '2026')
+os.environ.setdefault('EVENT_TABLE_PATH', os.path.join(_TMP, 'event_table.json'))
+os.environ.setdefault('NATAL_STORE_DIR', _TMP)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module  # noqa: E402
+
+BIRTH = {'birthDate': '1990-05-15', 'time': '14:30', 'latitude': 40.7, 'longitude': -74.0}
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def natal_store_dir():
+    return app_module.NATAL_STORE_DIR
@@ -0,0 +1,31 @@
+import pytest
+
+import app
+from conftest import BIRTH
+
+
+@pytest.fixture
+def sun_map(client):
+    return client.post('/astrocartography', json=dict(BIRTH, bodies=['Sun'])).get_json()
+
+
+def lines(body, angle):
+    return next(line['polylines'] for line in body['lines'] if line['angle'] == angle)
+
+
+def test_meridian_lines(sun_map):
+    sun = sun_map['bodies'][0]
+    mc_longitude = (sun['rightAscension'] - sun_map['siderealTime'] + 180) % 360 - 180
+    assert lines(sun_map, 'MC')[0][0][0] == pytest.approx(mc_longitude, abs=1e-4)
+    assert lines(sun_map, 'IC')[0][0][0] == pytest.approx(mc_longitude + 180, abs=1e-4)
+
+
+@pytest.mark.parametrize('angle', ['ASC', 'DSC'])
+def test_sun_is_on_the_horizon_along_rising_and_setting_lines(sun_map, angle):
+    jd = sun_map['julianDay']
+    sun = app.swe.calc_ut(jd, app.swe.SUN, app.DEFAULT_CALC_FLAGS)[0]
+    for polyline in lines(sun_map, angle):
+        assert all(-180 <= longitude <= 180 for longitude, _ in polyline)
+        for longitude, latitude in polyline[::10]:
+            altitude = app.swe.azalt(jd, app.swe.ECL2HOR, (longitude, latitude, 0), 0, 0, sun[:3])[1]
+            assert altitude == pytest.approx(0, abs=1e-3)
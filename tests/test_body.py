@@ -0,0 +1,15 @@
+import app
+
+
+def test_optional_fields_omitted_while_unset():
+    body = app.Body('Mars', 123.5, speed=-0.2)
+    data = body.to_dict()
+    assert data['sign'] == 'Leo'
+    assert data['isRetro'] is True
+    assert 'dignity' not in data and 'declination' not in data
+    body.declination = 12.0
+    assert body.to_dict()['declination'] == 12.0
+
+
+def test_compact_dict():
+    assert app.Body('Sun', 359.5).to_compact_dict()['sign'] == 'Pisces'
@@ -0,0 +1,55 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+import app
+
+USERS = ['u1', 'u2', 'u3']
+POINTS = ['Sun', 'Moon', 'Ascendant']
+LONGITUDES = np.array([[280.0, 200.0, 15.5], [100.0, 300.0, 359.9], [190.25, 33.0, 120.0]])
+
+
+@pytest.fixture
+def natal_files(natal_store_dir):
+    with open(os.path.join(natal_store_dir, 'users.csv'), 'w') as f:
+        f.write(','.join(['user_id'] + POINTS) + '\n')
+        for user_id, row in zip(USERS, LONGITUDES.tolist()):
+            f.write(','.join([user_id] + [repr(lon) for lon in row]) + '\n')
+    np.savez(os.path.join(natal_store_dir, 'users.npz'), user_ids=np.array(USERS), points=np.array(POINTS),
+             longitudes=LONGITUDES)
+    return ['users.csv', 'users.npz']
+
+
+def bulk(client, file):
+    response = client.post('/transits/bulk', json={'date': '2024-01-01', 'file': file})
+    assert response.mimetype == 'application/x-ndjson'
+    header, *lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    return header, {line['user']: line['hits'] for line in lines}
+
+
+def test_hits_match_pairwise_aspects(client, natal_files):
+    header, hits = bulk(client, 'users.csv')
+    assert header['users'] == len(USERS)
+    assert header['points'] == POINTS
+    profile = app.DEFAULT_ASPECT_PROFILE
+    for user_id, row in zip(USERS, LONGITUDES.tolist()):
+        expected = []
+        for sky in header['sky']:
+            for point, lon in zip(POINTS, row):
+                separation = float(app.angular_separation(sky['fullDegree'], lon))
+                match = profile.match(separation, sky['name'], point, (lon - sky['fullDegree']) % 360)
+                if match:
+                    expected.append([sky['name'], point, match[0], round(match[3], 2)])
+        assert hits.get(user_id, []) == expected
+
+
+def test_npz_and_csv_agree(client, natal_files):
+    assert bulk(client, 'users.csv')[1] == bulk(client, 'users.npz')[1]
+
+
+def test_file_must_stay_inside_the_store(client):
+    response = client.post('/transits/bulk', json={'date': '2024-01-01', 'file': '../users.csv'})
+    assert response.status_code == 500
+    assert 'NATAL_STORE_DIR' in response.get_json()['error']
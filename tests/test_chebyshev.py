@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+import app
+
+START = app.swe.julday(2024, 1, 1, 0.0)
+
+
+@pytest.mark.parametrize('body', [app.swe.SUN, app.swe.MOON, app.swe.MERCURY, app.swe.PLUTO])
+def test_error_within_documented_bound(body):
+    error = app.chebyshev_max_error(body, START, START + 60, samples=400)
+    assert error['longitude'] < app.CHEBYSHEV_MAX_ERROR
+
+
+def test_scalar_and_vector_paths_agree():
+    jds = START + np.linspace(0, 40, 17)
+    vector = app.fast_positions(jds, app.swe.MOON)
+    for jd, row in zip(jds, vector):
+        assert app.fast_position(jd, app.swe.MOON) == pytest.approx(tuple(row), abs=1e-9)
+
+
+def test_segment_cache_is_bounded():
+    assert app._cached_chebyshev_segment.cache_info().maxsize == app.CHEBYSHEV_SEGMENT_CACHE_SIZE
@@ -0,0 +1,55 @@
+import pytest
+
+import app
+from conftest import BIRTH
+
+
+def chart(client):
+    body = client.post('/calculate', json=BIRTH).get_json()
+    return {planet['name']: planet for planet in body['planets']}
+
+
+def test_chart_classification(client):
+    planets = chart(client)
+    # Sun 24°29' Taurus, Moon 28°27' Capricorn
+    sun = planets['Sun']
+    assert sun['dignity']['type'] == 'peregrine'
+    assert sun['decan'] == {'decan': 3, 'ruler': 'Saturn', 'degree_range': '20°-30°'}
+    assert sun['term'] == {'ruler': 'Saturn', 'degree_range': '22°-27°'}
+    assert sun['signData'] == {'element': 'Earth', 'modality': 'Fixed', 'polarity': 'Negative'}
+    moon = planets['Moon']
+    assert moon['dignity']['type'] == 'detriment'
+    assert moon['term'] == {'ruler': 'Mars', 'degree_range': '26°-30°'}
+    assert moon['triplicity']['day_ruler'] == 'Venus'
+
+
+def test_classification_agrees_with_the_rules_on_every_degree():
+    classified = app.classify_longitudes([deg + 0.5 for deg in range(360)], True, ['Mars'] * 360)
+    for deg, entry in enumerate(classified):
+        sign_index, degree_in_sign = divmod(deg, 30)
+        sign = app.SIGNS[sign_index]
+        start, end, ruler = next(term for term in app.TERMS[sign_index] if term[0] <= degree_in_sign < term[1])
+        assert entry['term']['ruler'] == ruler
+        assert entry['decan']['ruler'] == app.DECAN_RULERS[sign_index][degree_in_sign // 10]
+        assert entry['triplicity']['element'] == app.ELEMENTS[sign]
+        expected = next((kind for kind in ('domicile', 'exaltation', 'detriment', 'fall')
+                         if sign in app.DIGNITIES['Mars'].get(kind, [])), 'peregrine')
+        assert entry['dignity']['type'] == expected
+
+
+def test_tables_are_read_only():
+    with pytest.raises(TypeError):
+        app.DECAN_TABLE[0]['ruler'] = 'Pluto'
+    with pytest.raises(TypeError):
+        app.SIGN_DATA['Aries']['element'] = 'Water'
+
+
+def test_responses_do_not_share_table_rows(client):
+    body = app.Body('Mars', 5.0)
+    body.decan = app.DECAN_TABLE[5]
+    data = body.to_dict()
+    data['decan']['ruler'] = 'Pluto'
+    data['signData']['element'] = 'Water'
+    assert app.DECAN_TABLE[5]['ruler'] == 'Mars'
+    assert chart(client)['Mars'] == chart(client)['Mars']
+    assert app.SIGN_DATA['Aries']['element'] == 'Fire'
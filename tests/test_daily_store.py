@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+import app
+
+BODIES = [app.swe.SUN, app.swe.MOON]
+
+
+@pytest.fixture(scope='module')
+def store(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('daily') / 'daily.bin')
+    info = app.build_daily_store(path, 2024, 2024, bodies=BODIES)
+    assert info['bodies'] == len(BODIES)
+    return app.DailyEphemerisStore(path)
+
+
+def test_coverage(store):
+    assert store.covers(app.swe.julday(2024, 6, 1, 12.0), app.swe.MOON)
+    assert not store.covers(app.swe.julday(2024, 6, 1, 12.0), app.swe.MARS)
+    assert not store.covers(app.swe.julday(2026, 1, 1, 0.0), app.swe.SUN)
+
+
+@pytest.mark.parametrize('body', BODIES)
+def test_interpolation_within_an_arcminute(store, body):
+    jds = app.swe.julday(2024, 3, 1, 0.0) + np.linspace(0, 30, 91)
+    interpolated = store.positions(jds, body)
+    for jd, row in zip(jds, interpolated):
+        exact = app.swe.calc_ut(jd, body, app.DEFAULT_CALC_FLAGS)[0][0]
+        assert abs((row[0] - exact + 180) % 360 - 180) < 1e-3
+        assert store.position(jd, body) == pytest.approx(tuple(row), abs=1e-9)
@@ -0,0 +1,37 @@
+import pytest
+
+import app
+from conftest import BIRTH
+
+
+def test_dasha_balance(client):
+    body = client.post('/dasha', json=BIRTH).get_json()
+    assert body['moon']['nakshatra'] == 'Uttara Ashadha'
+    assert body['moon']['lord'] == 'Sun'
+    # 60.4% of Uttara Ashadha already traversed leaves 39.6% of the Sun's 6 years
+    assert body['balance']['lord'] == 'Sun'
+    assert body['balance']['years_remaining'] == pytest.approx(2.374, abs=1e-3)
+    assert body['periods'][0]['start'] == '1986-09-29T05:43:29Z'
+    assert [period['lord'] for period in body['periods']][:3] == ['Sun', 'Moon', 'Mars']
+
+
+def test_dasha_covers_120_years(client):
+    periods = client.post('/dasha', json=BIRTH).get_json()['periods']
+    total = periods[-1]['endJulianDay'] - periods[0]['startJulianDay']
+    assert total == pytest.approx(120 * app.DASHA_DEFAULT_YEAR_DAYS)
+    for period in periods:
+        sub = period['subPeriods']
+        assert sub[0]['startJulianDay'] == pytest.approx(period['startJulianDay'])
+        assert sub[-1]['endJulianDay'] == pytest.approx(period['endJulianDay'])
+
+
+def test_deep_levels_need_a_window(client):
+    response = client.post('/dasha', json=dict(BIRTH, levels=4))
+    assert response.status_code == 400
+    assert 'fromDate' in response.get_json()['error']
+
+
+def test_deep_levels_with_a_window(client):
+    response = client.post('/dasha', json=dict(BIRTH, levels=5, fromDate='2024-01-01', toDate='2024-02-01'))
+    assert response.status_code == 200
+    assert len(response.get_json()['levels']) == 5
@@ -0,0 +1,39 @@
+import pytest
+
+import app
+from conftest import BIRTH
+
+BODIES = {'Sun': app.swe.SUN, 'Moon': app.swe.MOON, 'Mars': app.swe.MARS, 'Pluto': app.swe.PLUTO,
+          'North Node': app.swe.TRUE_NODE}
+
+
+def planets(body):
+    return {planet['name']: planet for planet in body['planets']}
+
+
+def test_declinations_match_flg_equatorial(client):
+    body = client.post('/calculate', json=BIRTH).get_json()
+    by_name = planets(body)
+    for name, body_id in BODIES.items():
+        ra, dec = app.swe.calc_ut(body['julianDay'], body_id, app.DEFAULT_CALC_FLAGS | app.swe.FLG_EQUATORIAL)[0][:2]
+        assert by_name[name]['rightAscension'] == pytest.approx(ra, abs=1e-9)
+        assert by_name[name]['declination'] == pytest.approx(dec, abs=1e-9)
+        assert by_name[name]['outOfBounds'] == (abs(dec) > body['obliquity'])
+
+
+def test_sidereal_charts_keep_true_declinations(client):
+    tropical = planets(client.post('/calculate', json=BIRTH).get_json())
+    sidereal = planets(client.post('/calculate', json=dict(BIRTH, zodiac='sidereal')).get_json())
+    for name in BODIES:
+        assert sidereal[name]['declination'] == pytest.approx(tropical[name]['declination'], abs=1e-9)
+
+
+def test_parallels_use_true_declinations(client):
+    body = client.post('/calculate', json=BIRTH).get_json()
+    by_name = planets(body)
+    assert body['declinationAspects']
+    for aspect in body['declinationAspects']:
+        dec1 = by_name[aspect['planet1']]['declination']
+        dec2 = by_name[aspect['planet2']]['declination']
+        orb = abs(dec1 - dec2) if aspect['aspect'] == 'parallel' else abs(dec1 + dec2)
+        assert aspect['orb'] == pytest.approx(orb, abs=0.005)
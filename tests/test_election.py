@@ -0,0 +1,53 @@
+import pytest
+
+import app
+
+
+def election(client, constraints, **overrides):
+    request = dict({'fromDate': '2024-01-01', 'toDate': '2024-01-31'}, constraints=constraints, **overrides)
+    return client.post('/election', json=request)
+
+
+def moon(jd):
+    return app.swe.calc_ut(jd, app.swe.MOON, app.DEFAULT_CALC_FLAGS)[0][0]
+
+
+def test_moon_in_aries(client):
+    body = election(client, [{'type': 'sign', 'body': 'Moon', 'sign': 'Aries'}]).get_json()
+    assert len(body['windows']) == 1
+    window = body['windows'][0]
+    assert window['start'][:10] == '2024-01-16'
+    # Window edges are found to within the requested resolution
+    tolerance = 13.5 * body['resolutionMinutes'] / 1440.0
+    assert (moon(window['startJulianDay']) + 180) % 360 - 180 == pytest.approx(0.0, abs=tolerance)
+    assert moon(window['endJulianDay']) == pytest.approx(30.0, abs=tolerance)
+
+
+def test_mercury_retrograde_spring_2024(client):
+    body = election(client, [{'type': 'retrograde', 'body': 'Mercury'}],
+                    fromDate='2024-03-01', toDate='2024-05-31').get_json()
+    windows = [(window['start'][:10], window['end'][:10]) for window in body['windows']]
+    assert windows == [('2024-04-01', '2024-04-25')]
+
+
+def test_constraints_combine(client):
+    both = election(client, [
+        {'type': 'sign', 'body': 'Moon', 'sign': 'Aries'},
+        {'type': 'aspect', 'body1': 'Moon', 'body2': 'Jupiter', 'aspect': 'conjunction'},
+    ]).get_json()
+    aries = election(client, [{'type': 'sign', 'body': 'Moon', 'sign': 'Aries'}]).get_json()
+    assert both['windows']
+    for window in both['windows']:
+        assert any(outer['startJulianDay'] <= window['startJulianDay']
+                   and window['endJulianDay'] <= outer['endJulianDay'] for outer in aries['windows'])
+
+
+@pytest.mark.parametrize('constraints, overrides, message', [
+    ([], {}, 'At least one constraint'),
+    ([{'type': 'phase'}], {}, "Unknown constraint type 'phase'"),
+    ([{'type': 'sign', 'body': 'Moon', 'sign': 'Aries'}], {'toDate': '2023-12-01'}, 'toDate must follow'),
+])
+def test_invalid_requests(client, constraints, overrides, message):
+    response = election(client, constraints, **overrides)
+    assert response.status_code == 500
+    assert message in response.get_json()['error']
@@ -0,0 +1,17 @@
+import os
+
+import app
+
+
+def test_load_only_does_not_build(tmp_path):
+    assert app.load_event_table(str(tmp_path / 'missing.json'), build=False) is None
+    assert not os.listdir(tmp_path)
+
+
+def test_build_writes_table_atomically():
+    table = app.get_event_table()
+    assert table is not None
+    directory = os.path.dirname(app.EVENT_TABLE_PATH)
+    assert os.path.exists(app.EVENT_TABLE_PATH)
+    assert not [name for name in os.listdir(directory) if name.endswith('.tmp')]
+    assert app.load_event_table(build=False)['fromYear'] == app.EVENT_TABLE_FROM_YEAR
@@ -0,0 +1,14 @@
+import app
+
+
+def test_within_wraps_around_aries():
+    index = app.FixedStarIndex([(359.5, 'a'), (0.5, 'b'), (180.0, 'c')])
+    assert sorted(star for _, star in index.within(0.0, 1.0)) == ['a', 'b']
+    assert [star for _, star in index.within(180.5, 1.0)] == ['c']
+
+
+def test_index_is_sorted_and_shared_per_epoch():
+    index = app.get_fixed_star_index(app.J2000_JD)
+    assert len(index) > 0
+    assert index.longitudes == sorted(index.longitudes)
+    assert app.get_fixed_star_index(app.J2000_JD + 1) is index
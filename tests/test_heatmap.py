@@ -0,0 +1,37 @@
+import pytest
+
+import app
+from conftest import BIRTH
+
+RANGE = dict(BIRTH, fromDate='2024-01-01', toDate='2024-01-10')
+
+
+def heatmap(client, **overrides):
+    return client.post('/transits/heatmap', json=dict(RANGE, **overrides)).get_json()
+
+
+@pytest.mark.parametrize('house_system', ['W', 'K'])
+def test_house_system_is_honoured(client, house_system):
+    body = heatmap(client, houseSystem=house_system)
+    assert body['houseSystem'] == house_system
+    jd = app.parse_julian_day(BIRTH['birthDate'], BIRTH['time'])
+    ascmc = app.swe.houses_ex(jd, BIRTH['latitude'], BIRTH['longitude'], house_system.encode())[1]
+    natal = {point['name']: point['fullDegree'] for point in body['natal']}
+    assert natal['Midheaven'] == pytest.approx(ascmc[1])
+    assert heatmap(client, houseSystem='?')['houseSystem'] == 'P'
+
+
+def test_dense_and_sparse_agree(client):
+    sparse = heatmap(client)
+    dense = heatmap(client, format='dense')
+    assert len(sparse['dates']) == 10
+    assert len(sparse['series']) == len(dense['series'])
+    for sparse_entry, dense_entry in zip(sparse['series'], dense['series']):
+        assert [dense_entry['orbs'][step] for step in sparse_entry['steps']] == sparse_entry['orbs']
+        assert sum(orb is not None for orb in dense_entry['orbs']) == len(sparse_entry['steps'])
+
+
+def test_sub_day_steps_include_the_end(client):
+    body = heatmap(client, fromDate='2024-01-01', toDate='2024-01-02', stepDays=1 / 24)
+    assert len(body['dates']) == 25
+    assert body['dates'][-1] == '2024-01-02T00:00:00Z'
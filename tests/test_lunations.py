@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+import app
+
+
+@pytest.fixture(autouse=True, scope='module')
+def event_table():
+    # Stands in for the gunicorn master, which builds the table before forking
+    return app.get_event_table()
+
+
+def test_january_2024_lunations(client):
+    body = client.get('/lunations?from=2024-01-01&to=2024-02-01').get_json()
+    assert [(entry['phase'], entry['date'][:16]) for entry in body['lunations']] == [
+        ('last_quarter', '2024-01-04T03:30'),
+        ('new_moon', '2024-01-11T11:57'),
+        ('first_quarter', '2024-01-18T03:52'),
+        ('full_moon', '2024-01-25T17:54'),
+    ]
+
+
+def test_phase_filter(client):
+    body = client.get('/lunations?from=2024-01-01&to=2024-02-01&phases=new_moon').get_json()
+    assert [entry['phase'] for entry in body['lunations']] == ['new_moon']
+
+
+def test_2024_eclipses(client):
+    body = client.get('/eclipses?from=2024-01-01&to=2025-01-01').get_json()
+    assert [(entry['type'], entry['maximum'][:16]) for entry in body['solarEclipses']] == [
+        ('total', '2024-04-08T18:17'),
+        ('annular', '2024-10-02T18:45'),
+    ]
+    assert body['lunarEclipses'][0]['type'] == 'penumbral'
+    assert body['lunarEclipses'][0]['maximum'][:16] == '2024-03-25T07:12'
+
+
+def test_eclipse_kind_filter(client):
+    body = client.get('/eclipses?from=2024-01-01&to=2025-01-01&kind=solar').get_json()
+    assert 'lunarEclipses' not in body
+
+
+def test_range_outside_the_table(client):
+    assert client.get('/lunations?from=1990-01-01&to=1990-02-01').status_code == 400
+    assert client.get('/eclipses?from=1990-01-01&to=1991-01-01').status_code == 400
+
+
+@pytest.mark.parametrize('url', ['/lunations', '/eclipses'])
+def test_requests_never_build_the_table(client, monkeypatch, url):
+    # A stale file (other year range) is neither used nor rebuilt
+    monkeypatch.setattr(app, 'EVENT_TABLE', {'table': None, 'rejected': None})
+    monkeypatch.setattr(app, 'EVENT_TABLE_FROM_YEAR', 1900)
+    mtime = os.path.getmtime(app.EVENT_TABLE_PATH)
+    for _ in range(2):
+        response = client.get(url)
+        assert response.status_code == 503
+        assert response.get_json()['error'] == 'event table not built'
+    assert app.EVENT_TABLE['rejected'] == (mtime,)
+    assert os.path.getmtime(app.EVENT_TABLE_PATH) == mtime
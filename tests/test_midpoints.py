@@ -0,0 +1,50 @@
+import itertools
+
+import pytest
+
+import app
+from conftest import BIRTH
+
+
+def midpoints(client, **overrides):
+    return client.post('/midpoints', json=dict(BIRTH, **overrides)).get_json()
+
+
+def test_each_pair_once(client):
+    body = midpoints(client)
+    names = [point['name'] for point in body['points']]
+    assert len(names) == len(set(names)) == len(app.ASPECT_PLANETS) + 2
+    assert 'North Node' in names and 'South Node' not in names
+    pairs = [tuple(entry['pair']) for entry in body['midpoints']]
+    assert len(pairs) == len(names) * (len(names) - 1) // 2
+    assert {frozenset(pair) for pair in pairs} == {frozenset(pair) for pair in itertools.combinations(names, 2)}
+
+
+def test_pictures_match_brute_force(client):
+    body = midpoints(client, dial=45, orb=1.5)
+    dial = body['dial']
+    points = {point['name']: point['fullDegree'] for point in body['points']}
+    expected = set()
+    for (name1, lon1), (name2, lon2) in itertools.combinations(points.items(), 2):
+        midpoint = (lon1 + ((lon2 - lon1 + 180) % 360 - 180) / 2) % 360
+        for name, lon in points.items():
+            distance = (lon - midpoint) % dial
+            if name not in (name1, name2) and min(distance, dial - distance) <= body['orb']:
+                expected.add((name, name1, name2))
+    assert {(picture['point'], *picture['midpoint']) for picture in body['pictures']} == expected
+
+
+def test_house_system_is_honoured(client):
+    placidus = midpoints(client)
+    koch = midpoints(client, houseSystem='K')
+    assert (placidus['houseSystem'], koch['houseSystem']) == ('P', 'K')
+    assert midpoints(client, houseSystem='?')['houseSystem'] == 'P'
+    jd = app.parse_julian_day(BIRTH['birthDate'], BIRTH['time'])
+    ascendant = app.swe.houses_ex(jd, BIRTH['latitude'], BIRTH['longitude'], b'K')[1][0]
+    assert {point['name']: point['fullDegree'] for point in koch['points']}['Ascendant'] == pytest.approx(ascendant)
+
+
+def test_harmonic_out_of_range(client):
+    response = client.post('/midpoints', json=dict(BIRTH, harmonics=[app.HARMONIC_MAX + 1]))
+    assert response.status_code == 500
+    assert 'harmonics' in response.get_json()['error']
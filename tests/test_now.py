@@ -0,0 +1,18 @@
+import app
+
+
+def test_now_is_cached_per_bucket(client):
+    response = client.get('/now')
+    assert response.status_code == 200
+    body = response.get_json()
+    max_age = int(response.headers['Cache-Control'].rsplit('=', 1)[1])
+    assert 0 <= max_age <= app.NOW_CACHE_SECONDS
+    assert {planet['name'] for planet in body['planets']} >= {'Sun', 'Moon'}
+
+
+def test_current_sky_bucket():
+    bucket = 1700000000 // app.NOW_CACHE_SECONDS * app.NOW_CACHE_SECONDS
+    sky, remaining = app.get_current_sky(bucket + 1)
+    assert sky is app.get_current_sky(bucket + app.NOW_CACHE_SECONDS - 1)[0]
+    assert remaining == app.NOW_CACHE_SECONDS - 1
+    assert sky['julianDay'] == app.round_jd(app.UNIX_EPOCH_JD + bucket / 86400.0)
@@ -0,0 +1,47 @@
+import pytest
+
+import app
+
+
+def drishti(lon1, name1, lon2, name2):
+    profile = app.get_aspect_profile('vedic_drishti')
+    planet1 = app.Body(name1, lon1)
+    planet2 = app.Body(name2, lon2)
+    return {(aspect['planet1'], aspect['aspect']) for aspect in app.pair_aspects(planet1, planet2, profile)}
+
+
+def test_drishti_is_directional():
+    assert drishti(0.0, 'Mars', 90.0, 'Saturn') == {('Mars', 'drishti_4th'), ('Saturn', 'drishti_10th')}
+    assert drishti(0.0, 'Saturn', 90.0, 'Mars') == set()
+    assert drishti(0.0, 'Mars', 150.0, 'Venus') == set()
+    assert drishti(0.0, 'Mars', 210.0, 'Venus') == {('Mars', 'drishti_8th')}
+
+
+def test_drishti_seventh_is_mutual():
+    assert drishti(10.0, 'Venus', 190.0, 'Moon') == {('Venus', 'opposition')}
+
+
+def test_match_array_agrees_with_match():
+    profile = app.get_aspect_profile('vedic_drishti')
+    names = ['Mars', 'Jupiter', 'Saturn', 'Venus']
+    lons = app.np.array([0.0, 120.0, 240.0, 300.0])
+    separation = app.angular_separation(lons[:, None], lons[None, :])
+    forward = (lons[None, :] - lons[:, None]) % 360.0
+    index, _, aspect_names = profile.match_array(separation, names, names, forward)
+    for i, name1 in enumerate(names):
+        for j, name2 in enumerate(names):
+            if i == j:
+                continue
+            match = profile.match(separation[i, j], name1, name2, forward[i, j])
+            assert (aspect_names[index[i, j]] if index[i, j] >= 0 else None) == (match[0] if match else None)
+
+
+@pytest.mark.parametrize('profiles, message', [
+    ([], 'expected an object'),
+    ({'bad': {'aspects': {}}}, "profile 'bad'"),
+    ({'bad': {'aspects': {'custom': {'orb_planets': 2}}}}, "aspect 'custom' is missing or has an invalid 'angle'"),
+    ({'bad': {'aspects': {'trine': {'orb_planets': 'wide'}}}}, "'orb_planets'"),
+])
+def test_invalid_profiles_are_rejected(profiles, message):
+    with pytest.raises(ValueError, match=message):
+        app.validate_orb_profiles(profiles, 'test')
@@ -0,0 +1,21 @@
+import pytest
+
+import app
+from conftest import BIRTH
+
+
+def test_calculate_uses_exact_julian_day(client):
+    body = client.post('/calculate', json=BIRTH).get_json()
+    jd = app.parse_julian_day(BIRTH['birthDate'], BIRTH['time'])
+    expected = app.swe.calc_ut(jd, app.swe.MOON, app.DEFAULT_CALC_FLAGS)[0][0]
+    moon = next(planet for planet in body['planets'] if planet['name'] == 'Moon')
+    assert body['julianDay'] == jd
+    assert moon['fullDegree'] == pytest.approx(expected, abs=1e-9)
+
+
+def test_cache_is_shared_across_calls():
+    jd = app.parse_julian_day(BIRTH['birthDate'], BIRTH['time'])
+    first = app.calc_position(jd, app.swe.SUN)
+    hits = app._cached_calc_ut.cache_info().hits
+    assert app.calc_position(jd, app.swe.SUN) == first
+    assert app._cached_calc_ut.cache_info().hits == hits + 1
@@ -0,0 +1,13 @@
+import app
+
+
+def test_prefetch_reads_every_ephemeris_file():
+    prefetched = app.prefetch_ephemeris()
+    assert set(prefetched) == set(app.EPHEMERIS_FILES)
+    assert all(size > 0 for size in prefetched.values())
+
+
+def test_worker_stats_reports_prefetch(client):
+    body = client.get('/worker-stats').get_json()
+    assert set(body['prefetchedFiles']) <= set(app.EPHEMERIS_FILES)
+    assert 'chebyshevSegments' in body
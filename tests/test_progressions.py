@@ -0,0 +1,32 @@
+import pytest
+
+import app
+from conftest import BIRTH
+
+
+def by_name(bodies):
+    return {body['name']: body['fullDegree'] for body in bodies}
+
+
+def test_day_for_a_year(client):
+    body = client.post('/progressions', json=dict(BIRTH, fromAge=30, toAge=31)).get_json()
+    assert [entry['age'] for entry in body['progressions']] == [30.0, 31.0]
+    entry = body['progressions'][0]
+    assert entry['progressedJulianDay'] == pytest.approx(body['julianDay'] + 30)
+    sun = app.swe.calc_ut(entry['progressedJulianDay'], app.swe.SUN, app.DEFAULT_CALC_FLAGS)[0][0]
+    assert by_name(entry['progressed'])['Sun'] == pytest.approx(sun, abs=1e-6)
+
+
+def test_solar_arc_directs_every_natal_point(client):
+    body = client.post('/progressions', json=dict(BIRTH, fromAge=30, toAge=30)).get_json()
+    natal = by_name(body['natal'])
+    entry = body['progressions'][0]
+    assert entry['solarArc'] == pytest.approx((by_name(entry['progressed'])['Sun'] - natal['Sun']) % 360)
+    for name, lon in by_name(entry['solarArcDirected']).items():
+        assert lon == pytest.approx((natal[name] + entry['solarArc']) % 360)
+
+
+def test_reversed_ages_fail(client):
+    response = client.post('/progressions', json=dict(BIRTH, fromAge=30, toAge=20))
+    assert response.status_code == 500
+    assert 'toAge' in response.get_json()['error']
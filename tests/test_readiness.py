@@ -0,0 +1,39 @@
+import pytest
+
+import app
+
+EPHE_PATH = app.EPHE_PATH
+
+
+def test_healthz(client):
+    response = client.get('/healthz')
+    assert response.status_code == 200
+    assert response.get_json() == {'status': 'ok'}
+
+
+def test_readyz_reports_backend(client):
+    response = client.get('/readyz')
+    body = response.get_json()
+    assert body['ephemerisBackend'] in ('swiss', 'moshier')
+    assert body['ephemerisLoaded'] is True
+    assert response.status_code == (200 if body['ready'] else 503)
+
+
+@pytest.fixture
+def reinit_without_ephemeris_files(monkeypatch, tmp_path):
+    # init_worker() runs again on the next request, against an empty
+    # ephemeris directory; every global it touches is patched, and the
+    # swisseph path (C state) is reset in teardown even if the test fails
+    monkeypatch.setattr(app, 'EPHE_PATH', str(tmp_path))
+    monkeypatch.setattr(app, 'WORKER_STATE', dict(app.WORKER_STATE, pid=None))
+    monkeypatch.setattr(app, 'READINESS', dict(app.READINESS))
+    monkeypatch.setattr(app, 'SIDEREAL_STATE', dict(app.SIDEREAL_STATE))
+    yield
+    app.swe.set_ephe_path(EPHE_PATH)
+
+
+def test_readyz_without_ephemeris_files(client, reinit_without_ephemeris_files):
+    # Moshier still answers when no .se1 file is on the path
+    body = client.get('/readyz').get_json()
+    assert body['ephemerisBackend'] == 'moshier'
+    assert body['ephemerisLoaded'] is True
@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+import app
+from conftest import BIRTH
+
+SWEEP = dict(BIRTH, fromTime='14:00', toTime='15:00', stepMinutes=10)
+
+
+def sweep(client, **overrides):
+    response = client.post('/rectification', json=dict(SWEEP, **overrides))
+    assert response.mimetype == 'application/x-ndjson'
+    header, *steps = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    return header, steps
+
+
+def test_one_line_per_step(client):
+    header, steps = sweep(client)
+    assert header['steps'] == len(steps) == 7
+    assert [step['time'] for step in steps][:2] == ['14:00:00', '14:10:00']
+    assert steps[-1]['time'] == '15:00:00'
+
+
+def test_angles_match_a_direct_house_calculation(client):
+    _, steps = sweep(client, houseSystem='K')
+    for step in steps:
+        cusps, ascmc = app.swe.houses_ex(step['julianDay'], BIRTH['latitude'], BIRTH['longitude'], b'K')
+        assert step['asc'] == pytest.approx(ascmc[0], abs=1e-3)
+        assert step['mc'] == pytest.approx(ascmc[1], abs=1e-3)
+        assert step['cusps'] == pytest.approx(list(cusps), abs=1e-3)
+
+
+def test_too_many_steps(client):
+    response = client.post('/rectification', json=dict(SWEEP, fromTime='00:00', toTime='23:59',
+                                                        stepMinutes=1440.0 / app.RECTIFICATION_MAX_STEPS / 2))
+    assert response.status_code == 500
+    assert 'Too many steps' in response.get_json()['error']
@@ -0,0 +1,34 @@
+import pytest
+
+import app
+from conftest import BIRTH
+
+
+def longitude(jd, body):
+    return app.swe.calc_ut(jd, body, app.DEFAULT_CALC_FLAGS)[0][0]
+
+
+def test_solar_return(client):
+    body = client.post('/returns', json=dict(BIRTH, fromYear=2024, includeCharts=False)).get_json()
+    solar = body['solar']
+    assert [entry['date'][:16] for entry in solar['returns']] == ['2024-05-14T19:52']
+    jd = solar['returns'][0]['julianDay']
+    assert longitude(jd, app.swe.SUN) == pytest.approx(solar['natalLongitude'], abs=1e-5)
+
+
+def test_lunar_returns(client):
+    body = client.post('/returns', json=dict(BIRTH, fromYear=2024, types=['lunar'], includeCharts=False)).get_json()
+    lunar = body['lunar']
+    assert 'solar' not in body
+    assert len(lunar['returns']) == 13
+    assert lunar['returns'][0]['date'][:16] == '2024-01-12T00:30'
+    for entry in lunar['returns']:
+        assert longitude(entry['julianDay'], app.swe.MOON) == pytest.approx(lunar['natalLongitude'], abs=1e-5)
+
+
+def test_return_chart_is_cast_for_the_return_place(client):
+    body = client.post('/returns', json=dict(BIRTH, fromYear=2024, returnLatitude=51.5,
+                                             returnLongitude=0.0)).get_json()
+    entry = body['solar']['returns'][0]
+    ascendant = app.swe.houses_ex(entry['julianDay'], 51.5, 0.0, b'P')[1][0]
+    assert entry['houses']['ascendant']['degree'] == pytest.approx(ascendant)
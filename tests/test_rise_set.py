@@ -0,0 +1,28 @@
+import app
+
+
+def test_london_midsummer(client):
+    body = client.get('/rise-set?date=2024-06-21&latitude=51.5&longitude=0').get_json()
+    sun = body['bodies']['Sun']
+    assert sun['rise'][:16] == '2024-06-21T03:42'
+    assert sun['set'][:16] == '2024-06-21T20:21'
+    assert sun['transit'][:16] == '2024-06-21T12:01'
+    # Friday: the first planetary hour belongs to Venus
+    assert body['dayRuler'] == 'Venus'
+    hours = body['planetaryHours']
+    assert len(hours) == 24
+    assert hours[0]['start'] == sun['rise']
+    assert [hour['ruler'] for hour in hours[:3]] == ['Venus', 'Mercury', 'Moon']
+
+
+def test_nearby_locations_share_a_tile(client):
+    first = client.get('/rise-set?date=2024-06-21&latitude=51.51&longitude=0.01').get_json()
+    second = client.get('/rise-set?date=2024-06-21&latitude=51.52&longitude=0.02').get_json()
+    assert first['latitude'] == second['latitude'] == app.location_tile(51.51, 0.01)[0]
+    assert first['bodies'] == second['bodies']
+
+
+def test_midnight_sun(client):
+    body = client.get('/rise-set?date=2024-06-21&latitude=78.2&longitude=15.6').get_json()
+    assert body['bodies']['Sun']['rise'] is None
+    assert body['bodies']['Sun']['set'] is None
@@ -0,0 +1,33 @@
+import pytest
+
+import app
+from conftest import BIRTH
+
+
+def planet_names(body):
+    return {planet['name'] for planet in body['planets']}
+
+
+@pytest.mark.parametrize('ayanamsa', ['true_citra', 'true_revati'])
+def test_star_based_ayanamsas_keep_every_body(client, ayanamsa):
+    tropical = client.post('/calculate', json=BIRTH).get_json()
+    sidereal = client.post('/calculate', json=dict(BIRTH, zodiac='sidereal', ayanamsa=ayanamsa)).get_json()
+    assert {'North Node', 'True Lilith'} <= planet_names(sidereal)
+    assert planet_names(sidereal) == planet_names(tropical)
+
+
+def test_tropical_fallback_matches_direct_sidereal():
+    jd = app.parse_julian_day(BIRTH['birthDate'], BIRTH['time'])
+    sid_mode = app.AYANAMSA_MODES['lahiri']
+    app.swe.set_sid_mode(sid_mode)
+    app.SIDEREAL_STATE['mode'] = None
+    flags = app.DEFAULT_CALC_FLAGS | app.swe.FLG_SIDEREAL
+    for body in (app.swe.TRUE_NODE, app.swe.OSCU_APOG, app.swe.MARS):
+        direct = app.swe.calc_ut(jd, body, flags)[0][0]
+        derived = app.sidereal_from_tropical(jd, body, None, flags, sid_mode)[0][0]
+        assert derived == pytest.approx(direct, abs=1e-9)
+
+
+def test_navamsa():
+    chart = app.calculate_vargas([('a', 1.0), ('b', 31.0), ('c', 61.0)], ['D9'])['D9']
+    assert [chart[name]['sign'] for name in 'abc'] == ['Aries', 'Capricorn', 'Libra']
@@ -0,0 +1,30 @@
+import pytest
+
+import app
+
+
+def test_resolve_ephemeris_tier(monkeypatch):
+    assert app.resolve_ephemeris_tier('moshier') == 'moshier'
+    assert app.resolve_ephemeris_tier('bogus') == app.DEFAULT_EPHEMERIS_TIER
+    assert app.resolve_ephemeris_tier(None, exact=True) == app.EXACT_EPHEMERIS_TIER
+    monkeypatch.setattr(app, 'FAST_EPHEMERIS', True)
+    assert app.resolve_ephemeris_tier(None, batch=True) == 'chebyshev'
+
+
+@pytest.mark.parametrize('tier', ['moshier', 'chebyshev'])
+def test_positions_report_the_tier_used(client, tier):
+    body = client.get(f'/positions?date=2024-01-01&ephemeris={tier}').get_json()
+    assert body['ephemeris']['requested'] == tier
+    assert tier in body['ephemeris']['used']
+    full = client.get('/positions?date=2024-01-01&precision=full').get_json()
+    lons = {planet['name']: planet['fullDegree'] for planet in full['planets']}
+    for planet in body['planets']:
+        assert abs((planet['fullDegree'] - lons[planet['name']] + 180) % 360 - 180) < 0.01
+
+
+def test_full_precision_is_live(client):
+    body = client.get('/positions?date=2024-01-01&precision=full').get_json()
+    assert body['precision'] == 'full'
+    assert set(body['ephemeris']['used']) <= {'swiss', 'moshier'}
+    sun = app.swe.calc_ut(body['julianDay'], app.swe.SUN, app.DEFAULT_CALC_FLAGS)[0][0]
+    assert body['planets'][0]['fullDegree'] == pytest.approx(sun)